@@ -40,17 +40,66 @@ from .utils import (
     create_rectangle_maze_from_dimensions,
 )
 from .structs import Code, Symbols
+from .grid import CompiledMaze, compile_maze
+from .corridor import JunctionGraph
+from .instrument import Instrumentation
+from .metrics import REGISTRY, MetricsRegistry, SolverMetrics
+from .budget import CancellationToken, SearchBudget
+from .verify import PathVerifier, verify_many, verify_path
+from .shared import SharedMaze, solve_shared
+from .landmarks import LandmarkIndex
+from .pairs import solve_pairs
+from .tiles import TiledGrid, write_tiled
+from .serialize import ResultWriter, iter_results, result_from_bytes, result_to_bytes
+from .fingerprint import MazeFingerprint
+from .result_cache import ResultCache
+from .generators import (
+    generate_maze,
+    generate_backtracker,
+    generate_kruskal,
+    generate_prim,
+    generate_random,
+)
 
 # 定义包的公共API
 __all__ = [
     "MazeSolver",
     "Code",
     "Symbols",
+    "CompiledMaze",
+    "compile_maze",
+    "JunctionGraph",
+    "Instrumentation",
+    "MetricsRegistry",
+    "SolverMetrics",
+    "REGISTRY",
+    "CancellationToken",
+    "SearchBudget",
+    "PathVerifier",
+    "verify_path",
+    "verify_many",
+    "SharedMaze",
+    "solve_shared",
+    "LandmarkIndex",
+    "solve_pairs",
+    "TiledGrid",
+    "write_tiled",
+    "result_to_bytes",
+    "result_from_bytes",
+    "ResultWriter",
+    "iter_results",
+    "MazeFingerprint",
+    "ResultCache",
     "print_maze_with_path",
     "showMaze",
     "create_square_maze_from_string",
     "create_rectangle_maze_from_string",
     "create_rectangle_maze_from_dimensions",
+    "generate_maze",
+    "generate_backtracker",
+    "generate_kruskal",
+    "generate_prim",
+    "generate_random",
 ]
 
 # 版本信息
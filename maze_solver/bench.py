@@ -0,0 +1,393 @@
+"""
+基准测试模块
+
+生成带随机种子的迷宫语料（完美迷宫、开放房间、随机密度、无解迷宫），
+对 bfs_solve、encode_path 和渲染函数计时，记录耗时、每秒格子数和峰值内存，
+并可与保存的基线结果比较，超过阈值时以非零状态退出。
+
+命令行用法:
+    python -m maze_solver.bench run --sizes 100,10000 --out result.json
+    python -m maze_solver.bench compare baseline.json result.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .core import MazeSolver
+from .generators import backtracker_cells, random_cells, render_cells
+from .utils import print_maze_with_path, showMaze
+
+CORPUS_KINDS = ("perfect", "rooms", "random", "unsolvable")
+DEFAULT_SIZES = (10**2, 10**3, 10**4, 10**5)
+FULL_SIZES = tuple(10**k for k in range(2, 8))
+DEFAULT_TARGETS = ("bfs_solve", "encode_path", "showMaze", "print_maze_with_path")
+
+
+def _dimensions(cells: int) -> Tuple[int, int]:
+    """
+    根据格子总数计算接近正方形的奇数边长
+    """
+    side = max(3, int(math.sqrt(cells)))
+    if side % 2 == 0:
+        side += 1
+    return side, side
+
+
+def _to_maze(grid: bytearray, rows: int, cols: int) -> List[List[str]]:
+    """
+    将 0/1 字节网格（1 为道路）转换为默认符号的二维迷宫
+    """
+    return render_cells(grid, rows, cols, (1, 1), (rows - 2, cols - 2))
+
+
+def _open_rooms(rows: int, cols: int, rnd: random.Random) -> bytearray:
+    """
+    生成带隔墙和门洞的开放房间
+    """
+    grid = bytearray(rows * cols)
+    for row in range(1, rows - 1):
+        grid[row * cols + 1 : row * cols + cols - 1] = b"\x01" * (cols - 2)
+    room = max(4, min(rows, cols) // 4)
+    for row in range(room, rows - 1, room):
+        grid[row * cols + 1 : row * cols + cols - 1] = b"\x00" * (cols - 2)
+        for _ in range(max(1, cols // room)):
+            grid[row * cols + rnd.randrange(1, cols - 1)] = 1
+    for col in range(room, cols - 1, room):
+        for row in range(1, rows - 1):
+            grid[row * cols + col] = 0
+        for _ in range(max(1, rows // room)):
+            grid[rnd.randrange(1, rows - 1) * cols + col] = 1
+    return grid
+
+
+def _unsolvable(rows: int, cols: int, rnd: random.Random) -> bytearray:
+    """
+    生成中间被整行墙壁隔断的无解迷宫
+    """
+    grid = backtracker_cells(rows, cols, rnd)
+    middle = (rows // 2) | 1
+    grid[middle * cols : (middle + 1) * cols] = b"\x00" * cols
+    return grid
+
+
+_GENERATORS: Dict[str, Callable[[int, int, random.Random], bytearray]] = {
+    "perfect": backtracker_cells,
+    "rooms": _open_rooms,
+    "random": random_cells,
+    "unsolvable": _unsolvable,
+}
+
+
+def generate_corpus(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    kinds: Sequence[str] = CORPUS_KINDS,
+    seed: int = 0,
+) -> Iterator[Dict]:
+    """
+    逐个生成基准测试用的迷宫
+
+    参数:
+    sizes (Sequence[int]): 目标格子数列表
+    kinds (Sequence[str]): 迷宫类型列表，取值见 CORPUS_KINDS
+    seed (int): 随机种子，同样的种子生成同样的语料
+
+    返回:
+    Iterator[Dict]: 每项包含 case、kind、cells、maze
+
+    异常:
+    ValueError: 如果迷宫类型未知
+    """
+    for kind in kinds:
+        if kind not in _GENERATORS:
+            raise ValueError(
+                f"未知的迷宫类型 '{kind}'，可选: {', '.join(CORPUS_KINDS)}"
+            )
+
+    for size in sizes:
+        rows, cols = _dimensions(size)
+        for kind in kinds:
+            rnd = random.Random(f"{seed}-{kind}-{size}")
+            grid = _GENERATORS[kind](rows, cols, rnd)
+            yield {
+                "case": f"{kind}-{size}",
+                "kind": kind,
+                "cells": rows * cols,
+                "maze": _to_maze(grid, rows, cols),
+            }
+
+
+def _targets(
+    solver: MazeSolver, maze: List[List[str]], engines: Sequence[str]
+) -> Dict[str, Callable[[], object]]:
+    """
+    构造需要计时的调用
+    """
+    calls: Dict[str, Callable[[], object]] = {}
+    for engine in engines:
+        name = "bfs_solve" if engine == "bfs" else f"bfs_solve[{engine}]"
+        calls[name] = lambda engine=engine: solver.bfs_solve(maze, engine=engine)
+    calls["encode_path"] = lambda: solver.encode_path(maze)
+
+    movement = solver.bfs_solve(maze)["movement"]
+
+    def render(function: Callable, *args) -> Callable[[], None]:
+        def call() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function(*args)
+
+        return call
+
+    calls["showMaze"] = render(showMaze, maze, movement)
+    calls["print_maze_with_path"] = render(print_maze_with_path, maze, movement)
+    return calls
+
+
+def measure(
+    function: Callable[[], object], repeat: int = 3, memory: bool = True
+) -> Dict[str, Optional[float]]:
+    """
+    测量一次调用的最短耗时和峰值内存
+
+    耗时取 repeat 次中的最小值；峰值内存在额外一次开启 tracemalloc 的调用中测得，
+    避免追踪开销影响计时。
+
+    参数:
+    function (Callable): 被测调用
+    repeat (int): 计时重复次数
+    memory (bool): 是否测量峰值内存
+
+    返回:
+    Dict: wall_time (秒) 和 peak_memory (字节，未测量时为None)
+    """
+    best = math.inf
+    for _ in range(max(1, repeat)):
+        begin = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - begin)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"wall_time": best, "peak_memory": peak}
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    kinds: Sequence[str] = CORPUS_KINDS,
+    targets: Sequence[str] = DEFAULT_TARGETS,
+    engines: Sequence[str] = ("bfs",),
+    seed: int = 0,
+    repeat: int = 3,
+    memory: bool = True,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    运行基准测试
+
+    参数:
+    sizes (Sequence[int]): 目标格子数列表
+    kinds (Sequence[str]): 迷宫类型列表
+    targets (Sequence[str]): 计时目标 (bfs_solve, encode_path, showMaze, print_maze_with_path)
+    engines (Sequence[str]): bfs_solve 使用的搜索引擎列表
+    seed (int): 随机种子
+    repeat (int): 每个目标的计时次数
+    memory (bool): 是否测量峰值内存
+    progress (Optional[Callable]): 每得到一条结果时的回调
+
+    返回:
+    Dict: 包含 meta 和 results 的报告，可直接写成JSON
+    """
+    solver = MazeSolver()
+    results = []
+    for case in generate_corpus(sizes, kinds, seed):
+        calls = _targets(solver, case["maze"], engines)
+        for name, function in calls.items():
+            if name.split("[")[0] not in targets:
+                continue
+            measured = measure(function, repeat, memory)
+            wall_time = measured["wall_time"]
+            record = {
+                "case": case["case"],
+                "kind": case["kind"],
+                "cells": case["cells"],
+                "target": name,
+                "wall_time": wall_time,
+                "cells_per_sec": case["cells"] / wall_time if wall_time else None,
+                "peak_memory": measured["peak_memory"],
+            }
+            results.append(record)
+            if progress is not None:
+                progress(record)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = 0.25
+) -> List[Dict]:
+    """
+    与基线比较，找出退化的结果
+
+    当耗时或峰值内存超过基线的 (1 + threshold) 倍时视为退化。
+    只比较两份报告中都存在的 (case, target) 组合。
+
+    参数:
+    baseline (Dict): 基线报告
+    current (Dict): 当前报告
+    threshold (float): 允许的相对退化比例
+
+    返回:
+    List[Dict]: 退化项列表，每项包含 case、target、metric、baseline、current、ratio
+    """
+    reference = {(r["case"], r["target"]): r for r in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        base = reference.get((record["case"], record["target"]))
+        if base is None:
+            continue
+        for metric in ("wall_time", "peak_memory"):
+            old, new = base.get(metric), record.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append(
+                    {
+                        "case": record["case"],
+                        "target": record["target"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "ratio": ratio,
+                    }
+                )
+    return regressions
+
+
+def _split(text: str) -> List[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def _format_record(record: Dict) -> str:
+    memory = record["peak_memory"]
+    memory_text = f"{memory / 1024:10.1f} KiB" if memory is not None else " " * 14
+    return (
+        f"{record['case']:>18} {record['target']:<24} "
+        f"{record['wall_time'] * 1000:10.2f} ms "
+        f"{record['cells_per_sec'] or 0:14.0f} cells/s {memory_text}"
+    )
+
+
+def _print_regressions(regressions: List[Dict]) -> None:
+    for item in regressions:
+        print(
+            f"退化: {item['case']} {item['target']} {item['metric']} "
+            f"{item['baseline']:.6g} -> {item['current']:.6g} (x{item['ratio']:.2f})",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    命令行入口
+
+    参数:
+    argv (Optional[Sequence[str]]): 命令行参数，默认读取 sys.argv
+
+    返回:
+    int: 退出状态，存在退化时为1
+    """
+    parser = argparse.ArgumentParser(
+        prog="maze-solver-bench", description="MazeSolver 基准测试"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", help="生成语料并计时")
+    run.add_argument("--sizes", help="逗号分隔的目标格子数 (默认 100..100000)")
+    run.add_argument(
+        "--full", action="store_true", help="使用从 10^2 到 10^7 的完整尺寸"
+    )
+    run.add_argument("--kinds", default=",".join(CORPUS_KINDS), help="迷宫类型")
+    run.add_argument("--targets", default=",".join(DEFAULT_TARGETS), help="计时目标")
+    run.add_argument("--engines", default="bfs", help="bfs_solve 使用的引擎")
+    run.add_argument("--seed", type=int, default=0, help="随机种子")
+    run.add_argument("--repeat", type=int, default=3, help="计时重复次数")
+    run.add_argument("--no-memory", action="store_true", help="不测量峰值内存")
+    run.add_argument("--out", help="结果JSON输出路径")
+    run.add_argument("--baseline", help="运行后与该基线比较")
+    run.add_argument("--threshold", type=float, default=0.25, help="退化阈值")
+
+    compare = commands.add_parser("compare", help="比较两份结果")
+    compare.add_argument("baseline", help="基线JSON")
+    compare.add_argument("current", help="当前JSON")
+    compare.add_argument("--threshold", type=float, default=0.25, help="退化阈值")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.sizes:
+            sizes = [int(float(size)) for size in _split(args.sizes)]
+        else:
+            sizes = list(FULL_SIZES if args.full else DEFAULT_SIZES)
+        report = run_benchmarks(
+            sizes=sizes,
+            kinds=_split(args.kinds),
+            targets=_split(args.targets),
+            engines=_split(args.engines),
+            seed=args.seed,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            progress=lambda record: print(_format_record(record), flush=True),
+        )
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare_results(json.load(f), report, args.threshold)
+            _print_regressions(regressions)
+            return 1 if regressions else 0
+        return 0
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        _print_regressions(regressions)
+        if not regressions:
+            print("未发现退化")
+        return 1 if regressions else 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
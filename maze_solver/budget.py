@@ -0,0 +1,200 @@
+"""
+搜索预算模块
+
+为一次求解设置扩展节点数上限、截止时间和协作式取消。
+搜索引擎每扩展一批格子 (默认 1024 个) 才检查一次预算，
+未设置预算时搜索循环没有任何额外开销。
+
+超出预算时引擎抛出 BudgetExceeded，bfs_solve 会捕获它并返回
+statistics["error"] 说明原因的结果，而不是把异常抛给调用者。
+"""
+
+import copy
+import time
+from typing import Iterator, List, Optional, Sequence
+
+# 两次预算检查之间最多扩展的格子数
+DEFAULT_CHECK_INTERVAL = 1024
+
+# 预算名称
+BUDGET_NAMES = ("max_expansions", "deadline", "timeout", "cancelled")
+
+
+class CancellationToken:
+    """
+    协作式取消标记
+
+    可以在其他线程中调用 cancel()，正在进行的搜索会在下一次预算检查时停止。
+    """
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        请求取消
+        """
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        return f"CancellationToken(cancelled={self.cancelled})"
+
+
+class BudgetExceeded(Exception):
+    """
+    搜索超出预算
+    """
+
+    def __init__(self, reason: str, visited: int, expanded: int):
+        """
+        参数:
+        reason (str): 超出的预算名称 (见 BUDGET_NAMES)
+        visited (int): 停止时已访问的格子数
+        expanded (int): 停止时已扩展的格子数
+        """
+        super().__init__(f"超出搜索预算 {reason}，已访问 {visited} 个格子")
+        self.reason = reason
+        self.visited = visited
+        self.expanded = expanded
+
+
+class SearchBudget:
+    """
+    一次求解的搜索预算
+    """
+
+    def __init__(
+        self,
+        max_expansions: Optional[int] = None,
+        deadline: Optional[float] = None,
+        timeout: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+        check_interval: int = DEFAULT_CHECK_INTERVAL,
+    ):
+        """
+        初始化搜索预算，timeout 从创建时开始计时
+
+        参数:
+        max_expansions (Optional[int]): 最多扩展的格子数
+        deadline (Optional[float]): 截止时间 (time.monotonic() 的时刻)
+        timeout (Optional[float]): 超时秒数
+        cancel (Optional[CancellationToken]): 取消标记
+        check_interval (int): 两次检查之间最多扩展的格子数
+
+        异常:
+        ValueError: 如果参数无效
+        """
+        if max_expansions is not None and (
+            not isinstance(max_expansions, int)
+            or isinstance(max_expansions, bool)
+            or max_expansions < 0
+        ):
+            raise ValueError("max_expansions 必须是非负整数")
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout 不能为负数")
+        if not isinstance(check_interval, int) or check_interval <= 0:
+            raise ValueError("check_interval 必须是正整数")
+
+        self.max_expansions = max_expansions
+        self.cancel = cancel
+        self.check_interval = check_interval
+        self.deadline = deadline
+        self.deadline_reason = "deadline"
+        if timeout is not None:
+            expires = time.monotonic() + timeout
+            if deadline is None or expires < deadline:
+                self.deadline = expires
+                self.deadline_reason = "timeout"
+
+    def allowance(self, expanded: int, visited: int) -> int:
+        """
+        检查预算，返回在下一次检查之前还可以扩展的格子数
+
+        参数:
+        expanded (int): 已扩展的格子数
+        visited (int): 已访问的格子数
+
+        返回:
+        int: 可以继续扩展的格子数 (至少为 1)
+
+        异常:
+        BudgetExceeded: 如果已取消、已过截止时间或扩展数已达上限
+        """
+        if self.cancel is not None and self.cancel.cancelled:
+            raise BudgetExceeded("cancelled", visited, expanded)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise BudgetExceeded(self.deadline_reason, visited, expanded)
+        step = self.check_interval
+        if self.max_expansions is not None:
+            remaining = self.max_expansions - expanded
+            if remaining <= 0:
+                raise BudgetExceeded("max_expansions", visited, expanded)
+            if remaining < step:
+                step = remaining
+        return step
+
+    def after(self, expanded: int) -> "SearchBudget":
+        """
+        返回扣除已扩展格子数后的预算，截止时间和取消标记不变
+
+        分阶段执行的引擎 (例如先预处理再搜索) 用它让后一阶段从 0 开始计数，
+        同时把前一阶段的工作量计入 max_expansions。
+
+        参数:
+        expanded (int): 前一阶段已扩展的格子数
+
+        返回:
+        SearchBudget: 剩余的预算 (没有扩展数上限时返回自身)
+        """
+        if self.max_expansions is None or expanded <= 0:
+            return self
+        remaining = copy.copy(self)
+        remaining.max_expansions = max(0, self.max_expansions - expanded)
+        return remaining
+
+    def chunks(
+        self,
+        frontier: Sequence[int],
+        expanded: int,
+        visited: int,
+        pending: List[int],
+    ) -> Iterator[Sequence[int]]:
+        """
+        把一层格子切成若干批，每批之前检查一次预算
+
+        参数:
+        frontier (Sequence[int]): 本层要扩展的格子
+        expanded (int): 本层之前已扩展的格子数
+        visited (int): 本层之前已访问的格子数
+        pending (List[int]): 本层正在收集的下一层格子 (计入已访问数)
+
+        返回:
+        Iterator[Sequence[int]]: 依次扩展的格子批次
+        """
+        position = 0
+        total = len(frontier)
+        while position < total:
+            step = self.allowance(expanded + position, visited + len(pending))
+            yield frontier[position : position + step]
+            position += step
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchBudget(max_expansions={self.max_expansions}, "
+            f"deadline={self.deadline}, cancel={self.cancel!r})"
+        )
+
+
+def make_budget(
+    max_expansions: Optional[int] = None,
+    deadline: Optional[float] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancellationToken] = None,
+) -> Optional[SearchBudget]:
+    """
+    根据求解参数创建预算，全部为 None 时返回 None (不做任何检查)
+    """
+    if max_expansions is None and deadline is None and timeout is None:
+        if cancel is None:
+            return None
+    return SearchBudget(max_expansions, deadline, timeout, cancel)
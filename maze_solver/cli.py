@@ -0,0 +1,495 @@
+"""
+命令行求解模块
+
+从文件、目录、标准输入或 JSONL 读取迷宫，使用多进程并行求解，
+每个结果输出为一行 JSON。同时处理中的迷宫数量有上限，因此内存占用与输入总量无关。
+
+JSONL 每行一个对象:
+    {"id": "a", "maze": "*0110#", "width": 3,
+     "symbols": ["0", "1", "*", "#"], "code": ["U", "D", "L", "R"]}
+
+    - maze: 字符串（含换行时按行切分，否则按 width/height 切分，都未给出时视为正方形）
+      或行字符串列表
+    - symbols / code: 依次为 (道路, 墙壁, 起点, 终点) / (上, 下, 左, 右)，
+      可以是四元素列表或字典，省略时使用命令行参数
+    - costs: 地形符号 -> 进入代价，例如 {"~": 3}
+    - engine: 搜索引擎名称，省略时使用命令行参数
+
+其他文件按文本迷宫读取，每行是迷宫的一行。
+
+命令行用法:
+    maze-solver solve mazes.jsonl
+    maze-solver solve maze_dir/ --workers 8 --symbols " " "█" S E
+    maze-solver solve mazes.jsonl --timeout 0.5 --max-expansions 1000000
+    cat mazes.jsonl | maze-solver solve - --code w s a d
+    maze-solver serve --port 8765 --workers 4
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from .core import MazeSolver
+from .encoding import FORMAT_KEYS
+from .structs import Code, Symbols
+from .utils import create_rectangle_maze_from_string, create_square_maze_from_string
+
+DEFAULT_SYMBOLS = Symbols("0", "1", "*", "#")
+DEFAULT_CODE = Code("U", "D", "L", "R")
+
+# 任务: (来源描述, 类型 "json"/"text"/"file", 内容)
+Task = Tuple[str, str, str]
+
+
+def _symbols_from(value: Any) -> Symbols:
+    """
+    将列表或字典转换为 Symbols 结构体
+    """
+    if isinstance(value, Symbols):
+        return value
+    if isinstance(value, dict):
+        return Symbols(
+            value["road"],
+            value["wall"],
+            value["start"],
+            value["end"],
+            value.get("costs"),
+        )
+    if isinstance(value, (list, tuple)) and len(value) == 4:
+        return Symbols(*value)
+    raise ValueError("symbols 必须是四元素列表或包含 road/wall/start/end 的字典")
+
+
+def _code_from(value: Any) -> Code:
+    """
+    将列表或字典转换为 Code 结构体
+    """
+    if isinstance(value, Code):
+        return value
+    if isinstance(value, dict):
+        return Code(value["up"], value["down"], value["left"], value["right"])
+    if isinstance(value, (list, tuple)) and len(value) == 4:
+        return Code(*value)
+    raise ValueError("code 必须是四元素列表或包含 up/down/left/right 的字典")
+
+
+def build_maze(
+    maze: Any, width: Optional[int] = None, height: Optional[int] = None
+) -> List[List[str]]:
+    """
+    将记录中的迷宫转换为二维数组
+
+    参数:
+    maze (Any): 迷宫字符串或行字符串列表
+    width (Optional[int]): 单行字符串的宽度
+    height (Optional[int]): 单行字符串的高度
+
+    返回:
+    List[List[str]]: 二维迷宫数组
+
+    异常:
+    ValueError: 如果迷宫格式无效
+    """
+    if isinstance(maze, list):
+        return [list(row) for row in maze]
+    if not isinstance(maze, str):
+        raise ValueError("maze 必须是字符串或行列表")
+    lines = [line for line in maze.splitlines() if line]
+    if len(lines) > 1:
+        return [list(line) for line in lines]
+    text = lines[0] if lines else ""
+    if width is not None:
+        return create_rectangle_maze_from_string(text, width, height)
+    return create_square_maze_from_string(text)
+
+
+def parse_record(
+    record: Dict,
+    symbols: Symbols = DEFAULT_SYMBOLS,
+    code: Code = DEFAULT_CODE,
+    engine: str = "bfs",
+) -> Tuple[List[List[str]], Symbols, Code, str]:
+    """
+    解析一条 JSON 记录
+
+    参数:
+    record (Dict): JSON 对象
+    symbols (Symbols): 记录未指定时使用的符号
+    code (Code): 记录未指定时使用的编码
+    engine (str): 记录未指定时使用的引擎
+
+    返回:
+    Tuple[List[List[str]], Symbols, Code, str]: (迷宫, 符号, 编码, 引擎)
+
+    异常:
+    ValueError: 如果记录格式无效
+    """
+    if not isinstance(record, dict) or "maze" not in record:
+        raise ValueError("记录必须是包含 maze 字段的 JSON 对象")
+    maze = build_maze(record["maze"], record.get("width"), record.get("height"))
+    if "symbols" in record:
+        symbols = _symbols_from(record["symbols"])
+    if "costs" in record:
+        symbols = Symbols(*symbols, costs=record["costs"])
+    if "code" in record:
+        code = _code_from(record["code"])
+    return maze, symbols, code, record.get("engine", engine)
+
+
+def solve_maze(
+    maze: List[List[str]],
+    symbols: Symbols = DEFAULT_SYMBOLS,
+    code: Code = DEFAULT_CODE,
+    engine: str = "bfs",
+    movement: bool = False,
+    max_expansions: Optional[int] = None,
+    timeout: Optional[float] = None,
+    weight: Optional[float] = None,
+    output: Optional[Sequence[str]] = None,
+) -> Dict:
+    """
+    求解一个迷宫并返回可序列化为 JSON 的结果
+
+    参数:
+    maze (List[List[str]]): 二维迷宫数组
+    symbols (Symbols): 迷宫符号
+    code (Code): 方向编码
+    engine (str): 搜索引擎名称
+    movement (bool): 是否包含完整坐标路径
+    max_expansions (Optional[int]): 最多扩展的格子数
+    timeout (Optional[float]): 搜索超时秒数
+    weight (Optional[float]): "astar" / "anytime" 引擎的启发函数权重
+    output (Optional[Sequence[str]]): 路径输出格式 (见 MazeSolver.bfs_solve)
+
+    返回:
+    Dict: found、steps、length、encoded_path、statistics
+        (以及可选的 total_cost、movement 和紧凑编码字段)
+    """
+    solver = MazeSolver()
+    solver.set_symbols(symbols)
+    solver.set_code(code)
+    result = solver.bfs_solve(
+        maze,
+        engine=engine,
+        max_expansions=max_expansions,
+        timeout=timeout,
+        weight=weight,
+        output=output,
+    )
+    return summarize_result(result, movement)
+
+
+def summarize_result(result: Dict, movement: bool = False) -> Dict:
+    """
+    从 bfs_solve 结果中取出需要输出的字段
+
+    参数:
+    result (Dict): bfs_solve 格式的结果
+    movement (bool): 是否包含完整坐标路径
+
+    返回:
+    Dict: found、steps、length、encoded_path、statistics
+        (以及可选的 total_cost、movement 和紧凑编码字段:
+        rle_path 为字符串，packed_path 为 base64 字符串，movement_array 为整数列表)
+    """
+    output = {
+        "found": result["found"],
+        "steps": result["steps"],
+        "length": result["length"],
+        "encoded_path": result["encoded_path"],
+        "statistics": result["statistics"],
+    }
+    if "total_cost" in result:
+        output["total_cost"] = result["total_cost"]
+    if movement:
+        output["movement"] = result["movement"]
+    for key in FORMAT_KEYS.values():
+        if key in result:
+            value = result[key]
+            if isinstance(value, bytes):
+                value = base64.b64encode(value).decode("ascii")
+            elif not isinstance(value, str):
+                value = value.tolist()
+            output[key] = value
+    return output
+
+
+def _solve_task(task: Task, options: Dict) -> Tuple[str, bool]:
+    """
+    在工作进程中解析并求解一个任务，返回 (一行 JSON, 输入是否有效)
+    """
+    source, kind, payload = task
+    record_id: Any = source
+    try:
+        if kind == "json":
+            record = json.loads(payload)
+            if isinstance(record, dict):
+                record_id = record.get("id", source)
+            maze, symbols, code, engine = parse_record(
+                record, options["symbols"], options["code"], options["engine"]
+            )
+        else:
+            if kind == "file":
+                with open(payload, encoding="utf-8") as f:
+                    payload = f.read()
+            maze = build_maze(payload, options["width"], options["height"])
+            symbols, code, engine = (
+                options["symbols"],
+                options["code"],
+                options["engine"],
+            )
+        output = {"id": record_id}
+        output.update(
+            solve_maze(
+                maze,
+                symbols,
+                code,
+                engine,
+                movement=options["movement"],
+                max_expansions=options.get("max_expansions"),
+                timeout=options.get("timeout"),
+                weight=options.get("weight"),
+                output=options.get("output"),
+            )
+        )
+    except (ValueError, TypeError, KeyError, OSError) as e:
+        output = {"id": record_id, "found": False, "error": f"{type(e).__name__}: {e}"}
+        return json.dumps(output, ensure_ascii=False), False
+    return json.dumps(output, ensure_ascii=False), True
+
+
+def _jsonl_tasks(name: str, stream: TextIO) -> Iterator[Task]:
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            yield f"{name}:{number}", "json", line
+
+
+def iter_tasks(paths: Sequence[str], input_format: str = "auto") -> Iterator[Task]:
+    """
+    按顺序惰性地枚举输入中的任务
+
+    参数:
+    paths (Sequence[str]): 文件、目录或 "-" (标准输入)
+    input_format (str): "auto" (按扩展名判断，标准输入视为 JSONL)、"jsonl" 或 "text"
+
+    返回:
+    Iterator[Task]: (来源描述, 类型, 内容) 三元组
+    """
+    for path in paths:
+        if path == "-":
+            if input_format == "text":
+                yield "-", "text", sys.stdin.read()
+            else:
+                yield from _jsonl_tasks("-", sys.stdin)
+        elif os.path.isdir(path):
+            names = sorted(
+                entry.name
+                for entry in os.scandir(path)
+                if entry.is_file() and not entry.name.startswith(".")
+            )
+            yield from iter_tasks(
+                [os.path.join(path, name) for name in names], input_format
+            )
+        elif input_format == "jsonl" or (
+            input_format == "auto" and path.endswith((".jsonl", ".ndjson"))
+        ):
+            with open(path, encoding="utf-8") as f:
+                yield from _jsonl_tasks(path, f)
+        else:
+            yield path, "file", path
+
+
+def run_tasks(
+    tasks: Iterable[Task],
+    options: Dict,
+    workers: int = 1,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[str, bool]]:
+    """
+    求解任务并按输入顺序产出 JSON 行
+
+    参数:
+    tasks (Iterable[Task]): 任务序列
+    options (Dict): 求解选项 (symbols, code, engine, width, height, movement,
+        以及可选的 max_expansions、timeout、weight 和 output)
+    workers (int): 工作进程数，1 表示在当前进程中求解
+    max_pending (Optional[int]): 同时处理中的任务上限，默认 workers * 4
+
+    返回:
+    Iterator[Tuple[str, bool]]: 每个任务的 (一行 JSON, 输入是否有效)
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield _solve_task(task, options)
+        return
+
+    limit = max_pending if max_pending else workers * 4
+    executor: Executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future] = deque()
+    try:
+        for task in tasks:
+            pending.append(executor.submit(_solve_task, task, options))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _parse_costs(items: Sequence[str]) -> Dict[str, int]:
+    costs = {}
+    for item in items:
+        symbol, sep, cost = item.rpartition("=")
+        if not sep or not symbol:
+            raise SystemExit(f"无效的地形代价 '{item}'，格式为 SYMBOL=COST")
+        try:
+            costs[symbol] = int(cost)
+        except ValueError:
+            raise SystemExit(f"无效的地形代价 '{item}'，COST 必须是整数")
+        if costs[symbol] < 0:
+            raise SystemExit(f"无效的地形代价 '{item}'，COST 不能为负数")
+    return costs
+
+
+def _solve_command(args: argparse.Namespace) -> int:
+    symbols = Symbols(*args.symbols) if args.symbols else DEFAULT_SYMBOLS
+    if args.cost:
+        symbols = Symbols(*symbols, costs=_parse_costs(args.cost))
+    options = {
+        "symbols": symbols,
+        "code": Code(*args.code) if args.code else DEFAULT_CODE,
+        "engine": args.engine,
+        "width": args.width,
+        "height": args.height,
+        "movement": args.movement,
+        "max_expansions": args.max_expansions,
+        "timeout": args.timeout,
+        "weight": args.weight,
+        "output": args.output,
+    }
+    workers = args.workers if args.workers is not None else (os.cpu_count() or 1)
+    failed = 0
+    out = sys.stdout
+    for line, ok in run_tasks(
+        iter_tasks(args.inputs or ["-"], args.format),
+        options,
+        workers=workers,
+        max_pending=args.max_pending,
+    ):
+        out.write(line + "\n")
+        if args.flush:
+            out.flush()
+        if not ok:
+            failed += 1
+    return 1 if failed else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    命令行入口
+
+    参数:
+    argv (Optional[Sequence[str]]): 命令行参数，默认读取 sys.argv
+
+    返回:
+    int: 退出状态，存在无法解析的输入时为1
+    """
+    parser = argparse.ArgumentParser(
+        prog="maze-solver", description="MazeSolver 命令行"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    solve = commands.add_parser("solve", help="批量求解迷宫，每个结果输出一行 JSON")
+    solve.add_argument("inputs", nargs="*", help="文件、目录或 - (标准输入，默认)")
+    solve.add_argument(
+        "--format",
+        choices=("auto", "jsonl", "text"),
+        default="auto",
+        help="输入格式 (默认按扩展名判断，标准输入视为 JSONL)",
+    )
+    solve.add_argument("--width", type=int, help="单行迷宫字符串的宽度")
+    solve.add_argument("--height", type=int, help="单行迷宫字符串的高度")
+    solve.add_argument(
+        "--symbols", nargs=4, metavar=("ROAD", "WALL", "START", "END"), help="迷宫符号"
+    )
+    solve.add_argument(
+        "--cost",
+        action="append",
+        metavar="SYMBOL=COST",
+        help="地形代价，可重复，例如 --cost '~=3'",
+    )
+    solve.add_argument(
+        "--code", nargs=4, metavar=("UP", "DOWN", "LEFT", "RIGHT"), help="方向编码"
+    )
+    solve.add_argument(
+        "--engine", default="bfs", help="搜索引擎 (默认 bfs，auto 为自动选择)"
+    )
+    solve.add_argument(
+        "--weight", type=float, help="astar / anytime 引擎的启发函数权重 (≥ 1)"
+    )
+    solve.add_argument(
+        "--workers", type=int, help="工作进程数 (默认 CPU 核数，1 为单进程)"
+    )
+    solve.add_argument(
+        "--max-pending", type=int, help="同时处理中的迷宫上限 (默认 workers*4)"
+    )
+    solve.add_argument("--movement", action="store_true", help="输出完整坐标路径")
+    solve.add_argument(
+        "--output",
+        action="append",
+        choices=("full", "rle", "packed", "array"),
+        help="路径输出格式，可重复 (默认 full)；例如 --output rle 只输出游程编码",
+    )
+    solve.add_argument(
+        "--max-expansions", type=int, help="每个迷宫最多扩展的格子数，超出时输出错误"
+    )
+    solve.add_argument(
+        "--timeout", type=float, help="每个迷宫的求解超时秒数，超出时输出错误"
+    )
+    solve.add_argument("--flush", action="store_true", help="每行输出后立即刷新")
+
+    serve = commands.add_parser("serve", help="启动本地求解服务")
+    serve.add_argument("--host", default="127.0.0.1", help="监听地址 (默认 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="监听端口 (默认 8765)")
+    serve.add_argument("--unix", help="监听 Unix 套接字而不是 TCP 端口")
+    serve.add_argument("--workers", type=int, help="工作进程数 (默认 CPU 核数)")
+    serve.add_argument(
+        "--cache-size", type=int, default=128, help="缓存的迷宫数量上限 (默认 128)"
+    )
+    serve.add_argument("--verbose", action="store_true", help="输出访问日志")
+
+    args = parser.parse_args(argv)
+    if args.command == "solve":
+        return _solve_command(args)
+    if args.command == "serve":
+        from .server import serve as run_server
+
+        run_server(
+            args.host, args.port, args.unix, args.workers, args.cache_size, args.verbose
+        )
+        return 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
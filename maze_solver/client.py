@@ -0,0 +1,227 @@
+"""
+求解服务客户端模块
+
+通过持久连接调用本地求解服务（见 server 模块）。客户端在本地计算迷宫指纹，
+对最近发送过的迷宫只发送指纹；服务端缓存被淘汰时自动带上迷宫重试。
+调用者可以传入上次结果中的 fingerprint，省去每次调用在本地重新计算指纹。
+
+使用方法:
+    client = SolveClient()                               # http://127.0.0.1:8765
+    client = SolveClient(unix_socket="/tmp/maze.sock")
+    result = client.solve(maze, symbols=Symbols("0", "1", "*", "#"))
+"""
+
+import http.client
+import json
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from .server import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    _LRU,
+    maze_fingerprint,
+)
+from .structs import Code, Symbols
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    通过 Unix 套接字通信的 HTTP 连接
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.unix_path)
+        self.sock = sock
+
+
+class ServiceError(RuntimeError):
+    """
+    求解服务返回的错误
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class SolveClient:
+    """
+    求解服务客户端
+
+    每个客户端持有一个持久连接，调用是线程安全的（串行发送）。
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """
+        初始化客户端
+
+        参数:
+        host (str): 服务地址
+        port (int): 服务端口
+        unix_socket (Optional[str]): Unix 套接字路径，提供时忽略 host/port
+        timeout (Optional[float]): 套接字超时秒数
+        cache_size (int): 记住的已发送迷宫指纹数量上限 (最近最少使用的先被淘汰)
+        """
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.timeout = timeout
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._sent = _LRU(cache_size)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            if self.unix_socket is not None:
+                self._connection = _UnixHTTPConnection(self.unix_socket, self.timeout)
+            else:
+                self._connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+        return self._connection
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Any:
+        body = None
+        headers = {}
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        with self._lock:
+            for attempt in range(2):
+                connection = self._connect()
+                try:
+                    connection.request(method, path, body, headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError):
+                    # 服务端关闭了持久连接，重连一次
+                    self.close()
+                    if attempt:
+                        raise
+        content_type = response.getheader("Content-Type", "")
+        if content_type.startswith("application/json"):
+            result = json.loads(data)
+            if response.status != 200:
+                raise ServiceError(response.status, result.get("error", ""))
+            return result
+        if response.status != 200:
+            raise ServiceError(response.status, data.decode("utf-8", "replace"))
+        return data.decode("utf-8")
+
+    def solve(
+        self,
+        maze: Union[List[List[str]], List[str]],
+        symbols: Optional[Symbols] = None,
+        code: Optional[Code] = None,
+        engine: str = "bfs",
+        movement: bool = False,
+        max_expansions: Optional[int] = None,
+        search_timeout: Optional[float] = None,
+        weight: Optional[float] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Dict:
+        """
+        求解一个迷宫
+
+        参数:
+        maze (Union[List[List[str]], List[str]]): 二维迷宫数组或行字符串列表
+        symbols (Optional[Symbols]): 迷宫符号 (可带地形代价表)，默认 ("0", "1", "*", "#")
+        code (Optional[Code]): 方向编码，默认 ("U", "D", "L", "R")
+        engine (str): 搜索引擎名称
+        movement (bool): 是否返回完整坐标路径
+        max_expansions (Optional[int]): 最多扩展的格子数
+        search_timeout (Optional[float]): 服务端搜索超时秒数 (与套接字超时无关)
+        weight (Optional[float]): "astar" / "anytime" 引擎的启发函数权重
+        fingerprint (Optional[str]): 迷宫指纹 (例如同一迷宫上次结果中的 fingerprint)，
+            提供时不再在本地计算；调用者需保证它与 maze、symbols 对应
+
+        返回:
+        Dict: found、steps、length、encoded_path、statistics、fingerprint、cached
+            (以及可选的 total_cost 和 movement)
+
+        异常:
+        ServiceError: 如果服务返回错误
+        """
+        symbols = symbols if symbols is not None else Symbols("0", "1", "*", "#")
+        grid: Optional[List[List[str]]] = None
+        if fingerprint is None:
+            grid = [list(row) for row in maze]
+            fingerprint = maze_fingerprint(grid, symbols, symbols.costs)
+        request: Dict[str, Any] = {
+            "symbols": symbols.to_tuple(),
+            "costs": symbols.costs,
+            "engine": engine,
+            "movement": movement,
+        }
+        if code is not None:
+            request["code"] = code.to_tuple()
+        if max_expansions is not None:
+            request["max_expansions"] = max_expansions
+        if search_timeout is not None:
+            request["timeout"] = search_timeout
+        if weight is not None:
+            request["weight"] = weight
+
+        if self._sent.get(fingerprint) is not None:
+            request["fingerprint"] = fingerprint
+            try:
+                return self._request("POST", "/solve", request)
+            except ServiceError as e:
+                if e.status != 404:
+                    raise
+                del request["fingerprint"]
+
+        if grid is None:
+            grid = [list(row) for row in maze]
+        if all(len(cell) == 1 for row in grid for cell in row):
+            request["maze"] = ["".join(row) for row in grid]
+        else:
+            request["maze"] = grid
+        result = self._request("POST", "/solve", request)
+        self._sent.put(result.get("fingerprint", fingerprint), True)
+        return result
+
+    def health(self) -> Dict:
+        """
+        返回服务状态
+        """
+        return self._request("GET", "/health")
+
+    def metrics(self) -> str:
+        """
+        返回 Prometheus 文本格式的服务指标
+        """
+        return self._request("GET", "/metrics")
+
+    def close(self) -> None:
+        """
+        关闭连接
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "SolveClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -1,5 +1,31 @@
-from collections import deque
-from typing import List, Dict, Tuple, Optional, Union
+import time
+from array import array
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Tuple,
+    Optional,
+    Union,
+)
+
+from .budget import BudgetExceeded, CancellationToken, SearchBudget, make_budget
+from .encoding import add_encodings, check_output, expand_result
+from .engines import WEIGHTED_ENGINES, bfs_levels, get_engine
+from .tune import AUTO_ENGINE, select_engine
+from .landmarks import DEFAULT_LANDMARKS, LandmarkIndex
+from .pairs import cell_index, iter_pair_paths
+from .tiles import TiledGrid
+from .serialize import result_from_bytes, result_to_bytes
+from .fingerprint import MazeFingerprint
+from .grid import CompiledMaze, compile_maze, fill_path_result, trace_back
+from .instrument import ExpandHook, Instrumentation, PhaseHook
+from .metrics import MetricsRegistry, SolverMetrics, get_solver_metrics
+from .verify import PathVerifier
+from . import paths
 
 
 class MazeSolver:
@@ -20,15 +46,19 @@ class MazeSolver:
         """
 
         self.maze = None  # 保存当前迷宫
+        self._fingerprint: Optional[MazeFingerprint] = None  # 当前迷宫的指纹，按需计算
         self.last_result = None  # 保存最后一次求解结果
         self.codes = {"up": "U", "down": "D", "left": "L", "right": "R"}
         self.symbols = {"road": "0", "wall": "1", "start": "*", "end": "#"}
+        self.costs: Dict[str, int] = {}  # 地形符号 -> 进入代价
         self.decode = {
             (0, -1): "←",
             (0, 1): "→",
             (1, 0): "↓",
             (-1, 0): "↑",
         }
+        self.instrumentation: Optional[Instrumentation] = None  # 求解插桩，默认关闭
+        self.metrics: Optional[SolverMetrics] = None  # 求解指标，默认关闭
 
     def set_code(
         self,
@@ -88,6 +118,7 @@ class MazeSolver:
         wall: Optional[str] = None,
         start: Optional[str] = None,
         end: Optional[str] = None,
+        costs: Optional[Dict[str, int]] = None,
     ) -> None:
         """
         设置迷宫符号
@@ -97,14 +128,17 @@ class MazeSolver:
         wall (Optional[str]): 墙壁符号
         start (Optional[str]): 起点符号
         end (Optional[str]): 终点符号
+        costs (Optional[Dict[str, int]]): 额外地形符号 -> 进入代价 (非负整数)，
+            例如 {"~": 3}；未提供时使用Symbols结构体中的代价表，否则清空
 
         异常:
-        ValueError: 如果符号参数不是字符串或为空
+        ValueError: 如果符号参数不是字符串或为空，或代价表无效
 
         使用方式:
         1. solver.set_symbols(" ", "█", "S", "E")
         2. solver.set_symbols(symbols_struct)  # Symbols结构体
         3. (road, wall, start, end) = symbols_struct; solver.set_symbols(road, wall, start, end)
+        4. solver.set_symbols("0", "1", "*", "#", costs={"~": 3, "^": 5})
         """
         # 如果第一个参数是Symbols结构体，则解包使用
         if (
@@ -114,6 +148,8 @@ class MazeSolver:
         ):
             # 这是一个Symbols结构体
             road_val, wall_val, start_val, end_val = road
+            if costs is None:
+                costs = getattr(road, "costs", None)
         else:
             # 传统的四个参数方式
             if any(param is None for param in [wall, start, end]):
@@ -131,12 +167,26 @@ class MazeSolver:
         if len(set(symbols)) != len(symbols):
             raise ValueError("迷宫符号不能重复")
 
+        costs = dict(costs) if costs else {}
+        for symbol, cost in costs.items():
+            if not isinstance(symbol, str) or not symbol:
+                raise ValueError("地形符号必须是非空字符串")
+            if symbol in symbols:
+                raise ValueError(
+                    f"地形符号 '{symbol}' 不能与道路、墙壁、起点或终点相同"
+                )
+            if not isinstance(cost, int) or isinstance(cost, bool) or cost < 0:
+                raise ValueError(f"地形 '{symbol}' 的代价必须是非负整数")
+
         self.symbols = {
             "road": road_val,
             "wall": wall_val,
             "start": start_val,
             "end": end_val,
         }
+        self.costs = costs
+        if self._fingerprint is not None:
+            self._fingerprint.set_symbols(symbols, costs)
 
     def get_symbols(self) -> Dict[str, str]:
         """
@@ -147,6 +197,12 @@ class MazeSolver:
         """
         return self.symbols.copy()
 
+    def get_costs(self) -> Dict[str, int]:
+        """
+        返回当前地形代价表
+        """
+        return self.costs.copy()
+
     def set_maze(self, maze: List[List[str]]) -> None:
         """
         设置当前迷宫
@@ -159,6 +215,7 @@ class MazeSolver:
         """
         self.validate_maze(maze)
         self.maze = [row[:] for row in maze]  # 深拷贝迷宫
+        self._fingerprint = None
 
     def get_maze(self) -> Optional[List[List[str]]]:
         """
@@ -169,6 +226,52 @@ class MazeSolver:
         """
         return [row[:] for row in self.maze] if self.maze else None
 
+    def set_cell(self, row: int, col: int, symbol: str) -> None:
+        """
+        修改当前迷宫中的一个格子，指纹只重新计算该行
+
+        参数:
+        row (int): 行号
+        col (int): 列号
+        symbol (str): 新的格子符号
+
+        异常:
+        ValueError: 如果未设置迷宫、坐标越界或符号不是非空字符串
+        """
+        if self.maze is None:
+            raise ValueError("未设置迷宫，请先调用set_maze()")
+        if not isinstance(symbol, str) or not symbol:
+            raise ValueError("格子符号必须是非空字符串")
+        if not (0 <= row < len(self.maze) and 0 <= col < len(self.maze[0])):
+            raise ValueError(f"坐标 {(row, col)} 超出迷宫范围")
+        self.maze[row][col] = symbol
+        if self._fingerprint is not None:
+            self._fingerprint.update_row(row, self.maze[row])
+
+    def get_fingerprint(self) -> MazeFingerprint:
+        """
+        返回当前迷宫和符号的指纹
+
+        指纹在第一次调用时计算，之后随 set_cell 和 set_symbols 增量更新，
+        set_maze 后重新计算。可用 hexdigest() 作为缓存键。
+
+        返回:
+        MazeFingerprint: 当前迷宫的指纹 (随迷宫更新，不要修改)
+
+        异常:
+        ValueError: 如果未设置迷宫
+        """
+        if self.maze is None:
+            raise ValueError("未设置迷宫，请先调用set_maze()")
+        if self._fingerprint is None:
+            symbols = self.symbols
+            self._fingerprint = MazeFingerprint(
+                self.maze,
+                (symbols["road"], symbols["wall"], symbols["start"], symbols["end"]),
+                self.costs,
+            )
+        return self._fingerprint
+
     def get_codes(self) -> Dict[str, str]:
         """
         返回当前方向编码字典
@@ -261,6 +364,13 @@ class MazeSolver:
         wall_symbol: Optional[str] = None,
         start_symbol: Optional[str] = None,
         end_symbol: Optional[str] = None,
+        engine: str = "bfs",
+        max_expansions: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+        weight: Optional[float] = None,
+        output: Optional[Collection[str]] = None,
     ) -> Dict[str, Union[bool, List[Tuple[int, int]], int, str, Dict]]:
         """
         使用BFS算法寻找迷宫中的最短路径
@@ -271,6 +381,38 @@ class MazeSolver:
         wall_symbol (Optional[str]): 墙壁符号 (默认使用set_symbols设置的符号)
         start_symbol (Optional[str]): 入口符号 (默认使用set_symbols设置的符号)
         end_symbol (Optional[str]): 出口符号 (默认使用set_symbols设置的符号)
+        engine (str): 搜索引擎名称 (默认 "bfs")
+            - "bfs": 逐格广度优先搜索
+            - "corridor": 死胡同填充 + 走廊压缩后在路口图上执行Dijkstra
+            - "dijkstra": 按地形代价 (见 set_symbols 的 costs) 求最小代价路径
+            - "zero_one": 代价只有 0 和 1 时的 0-1 BFS
+            - "astar": 加权 A* (见 weight)，路径代价不超过最优的 ε 倍
+            - "greedy": 贪心最佳优先，最快找到一条可行路径，不保证最短
+            - "anytime": 逐轮减小 ε 的加权 A*，在预算内不断改进路径
+            - "alt": 以地标下界为启发函数的 A* (只能通过 solve_compiled 传入地标索引)
+            - "bitboard": 用大整数按位运算逐层扩展的 BFS，只用于墙壁很少的开阔网格
+              (快 1.2–3 倍)；墙壁超过 10% 时改用 "bfs" (见 bitboard.MAX_WALL_RATIO)
+            - "external": 外存 BFS，各层和到达方向写入临时文件，内存占用受预算限制
+            - "auto": 按迷宫特征和本机调优的阈值自动选择最短路径引擎 (见 tune 模块)，
+              statistics 中 engine 为实际使用的引擎，engine_features 为迷宫特征；
+              自动选择总是返回最短路径，忽略 weight
+        max_expansions (Optional[int]): 最多扩展的格子数
+        timeout (Optional[float]): 超时秒数，从调用开始计时 (包括验证和编译)
+        deadline (Optional[float]): 截止时间 (time.monotonic() 的时刻)
+        cancel (Optional[CancellationToken]): 取消标记，可在其他线程中调用 cancel()
+        weight (Optional[float]): "astar" / "anytime" 引擎的启发函数权重 ε (≥ 1)，
+            默认分别为 1 和 5；结果的 statistics 中 suboptimality_bound 为次优上界
+        output (Optional[Collection[str]]): 路径输出格式 (默认 ("full",))，可组合
+            - "full": movement、path 和 encoded_path
+            - "rle": 'rle_path'，游程编码的方向串，例如 "R12D3"
+            - "packed": 'packed_path'，每步 2 位的 bytes
+            - "array": 'movement_array'，array('i') 坐标 [row0, col0, row1, col1, ...]
+            不含 "full" 时这三个字段保持为空，可用 expand_result 还原
+
+        超出任一预算时不抛出异常，而是返回未找到路径的结果，
+        statistics 中 'error' 说明超出的预算和已访问的格子数，
+        'budget_exceeded' 为预算名称 ("max_expansions"、"timeout"、"deadline" 或 "cancelled")，
+        'visited_cells' 和 'nodes_expanded' 为停止时的部分统计。
 
         返回:
         Dict: 包含以下键值的字典
@@ -280,11 +422,21 @@ class MazeSolver:
             - 'length': int, 路径长度
             - 'steps': int, 移动步数 (路径长度-1)
             - 'encoded_path': str, 用编码表示的路径字符串
+            - 'total_cost': int, 路径总代价 (仅在设置了地形代价或使用带权引擎时)
             - 'statistics': Dict, 路径统计信息
 
         异常:
         各种验证相关的异常
         """
+        budget = make_budget(max_expansions, deadline, timeout, cancel)
+        if output is not None:
+            check_output(output)
+        instrument = self.instrumentation
+        if instrument is not None:
+            instrument.begin()
+        metrics = self.metrics
+        began = time.perf_counter() if metrics is not None else 0.0
+
         # 使用默认迷宫或提供的迷宫
         if maze is None:
             if self.maze is None:
@@ -308,12 +460,626 @@ class MazeSolver:
         ):
             raise TypeError("所有符号参数必须是字符串")
 
+        search = get_engine(engine) if engine != AUTO_ENGINE else None
+        if instrument is not None:
+            instrument.mark("validate")
+
         rows, cols = len(maze), len(maze[0])
 
         # 寻找起点和终点
         start_pos, end_pos = self.find_positions(maze, start_symbol, end_symbol)
+        if instrument is not None:
+            instrument.mark("positions")
 
         # 初始化返回结果
+        costs = self.costs or None
+        weighted = costs is not None or engine in WEIGHTED_ENGINES
+        result = self._new_result(rows, cols, start_pos, end_pos, engine, weighted)
+        stats = result["statistics"]
+
+        if start_pos is None:
+            stats["error"] = f"未找到起点符号 '{start_symbol}'"
+        elif end_pos is None:
+            stats["error"] = f"未找到终点符号 '{end_symbol}'"
+        if "error" in stats:
+            if instrument is not None:
+                stats.update(instrument.report())
+            if metrics is not None:
+                metrics.record_solve(result, time.perf_counter() - began)
+            return result
+
+        # 编译迷宫并执行搜索
+        compiled = compile_maze(
+            maze, road_symbol, start_symbol, end_symbol, start_pos, end_pos, costs
+        )
+        if instrument is not None:
+            instrument.mark("compile")
+        if search is None:
+            # 自动选择只使用最短路径引擎，忽略启发函数权重
+            search = self._select_engine(compiled, stats)
+            weight = None
+        index_path = self._search(search, compiled, stats, budget, weight)
+
+        if index_path is None:
+            # 没有找到路径 (超出预算时已记录原因)
+            stats.setdefault("error", "无法从起点到达终点")
+        else:
+            self._fill_result(result, compiled, index_path, output)
+
+        if instrument is not None:
+            instrument.mark("result")
+            stats.update(instrument.report())
+        if metrics is not None:
+            metrics.record_solve(result, time.perf_counter() - began)
+
+        self.last_result = result
+        return result
+
+    def iter_solve(
+        self,
+        maze: Optional[List[List[str]]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        逐层产出广度优先搜索的探索过程，用于渐进式可视化
+
+        每个 frontier 事件包含同一距离上新发现的格子及其父格子，
+        父格子由方向标记数组即时推出，求解器不保存逐节点路径或已产出的事件。
+        最后一个事件是与 bfs_solve 相同格式的结果。
+
+        参数:
+        maze (Optional[List[List[str]]]): 二维数组表示的迷宫 (默认使用set_maze设置的迷宫)
+        batch_size (Optional[int]): 每个事件最多包含的格子数，默认每层一个事件
+
+        返回:
+        Iterator[Dict]: 事件序列
+            - {"type": "frontier", "distance": int, "cells": array('i'),
+               "parents": array('i')}  格子编号为 row * cols + col，起点的父格子为 -1
+            - {"type": "result", "result": Dict}  与 bfs_solve 返回值相同
+
+        异常:
+        ValueError: 如果 batch_size 不是正整数或迷宫格式无效
+        """
+        if batch_size is not None and (
+            not isinstance(batch_size, int) or batch_size <= 0
+        ):
+            raise ValueError("batch_size 必须是正整数")
+        if maze is None:
+            if self.maze is None:
+                raise ValueError("未设置迷宫，请先调用set_maze()或传入maze参数")
+            maze = self.maze
+        else:
+            self.validate_maze(maze)
+        return self._iter_solve(maze, batch_size)
+
+    def _iter_solve(
+        self, maze: List[List[str]], batch_size: Optional[int]
+    ) -> Iterator[Dict]:
+        metrics = self.metrics
+        began = time.perf_counter() if metrics is not None else 0.0
+        symbols = self.symbols
+        rows, cols = len(maze), len(maze[0])
+        start_pos, end_pos = self.find_positions(maze, symbols["start"], symbols["end"])
+        costs = self.costs or None
+        result = self._new_result(
+            rows, cols, start_pos, end_pos, "bfs", costs is not None
+        )
+        stats = result["statistics"]
+
+        if start_pos is None:
+            stats["error"] = f"未找到起点符号 '{symbols['start']}'"
+        elif end_pos is None:
+            stats["error"] = f"未找到终点符号 '{symbols['end']}'"
+        else:
+            compiled = compile_maze(
+                maze,
+                symbols["road"],
+                symbols["start"],
+                symbols["end"],
+                start_pos,
+                end_pos,
+                costs,
+            )
+            came = bytearray(compiled.size)
+            offsets = (-cols, cols, -1, 1, 0)
+            step = batch_size
+            for distance, cells in bfs_levels(compiled, came, stats):
+                parents = array("i", [cell - offsets[came[cell] - 1] for cell in cells])
+                if distance == 0:
+                    parents[0] = -1
+                chunk = step if step else len(cells)
+                for offset in range(0, len(cells), chunk):
+                    yield {
+                        "type": "frontier",
+                        "distance": distance,
+                        "cells": array("i", cells[offset : offset + chunk]),
+                        "parents": parents[offset : offset + chunk],
+                    }
+            if came[compiled.end]:
+                index_path = trace_back(came, compiled.end, cols)
+                fill_path_result(result, compiled, index_path, self.codes)
+            else:
+                stats["error"] = "无法从起点到达终点"
+            self.last_result = result
+
+        if metrics is not None:
+            metrics.record_solve(result, time.perf_counter() - began)
+        yield {"type": "result", "result": result}
+
+    def solve_compiled(
+        self,
+        compiled: CompiledMaze,
+        engine: str = "bfs",
+        max_expansions: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+        weight: Optional[float] = None,
+        output: Optional[Collection[str]] = None,
+        landmarks: Optional[LandmarkIndex] = None,
+    ) -> Dict:
+        """
+        在已编译的迷宫上求解，跳过验证、定位和编译
+
+        适合反复求解同一个迷宫的场景（例如求解服务的缓存），
+        返回格式与 bfs_solve 相同。
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫 (见 compile_maze)
+        engine (str): 搜索引擎名称 (默认 "bfs"，"auto" 为自动选择，见 bfs_solve)
+        max_expansions (Optional[int]): 最多扩展的格子数
+        timeout (Optional[float]): 超时秒数
+        deadline (Optional[float]): 截止时间 (time.monotonic() 的时刻)
+        cancel (Optional[CancellationToken]): 取消标记
+        weight (Optional[float]): 启发函数权重 ε (见 bfs_solve，engine="auto" 时忽略)
+        output (Optional[Collection[str]]): 路径输出格式 (见 bfs_solve)
+        landmarks (Optional[LandmarkIndex]): "alt" 引擎使用的地标索引 (见 build_landmarks)
+
+        返回:
+        Dict: 与 bfs_solve 相同格式的结果字典
+        """
+        budget = make_budget(max_expansions, deadline, timeout, cancel)
+        if output is not None:
+            check_output(output)
+        instrument = self.instrumentation
+        if instrument is not None:
+            instrument.begin()
+        metrics = self.metrics
+        began = time.perf_counter() if metrics is not None else 0.0
+
+        search = get_engine(engine) if engine != AUTO_ENGINE else None
+        result = self._new_result(
+            compiled.rows,
+            compiled.cols,
+            compiled.position(compiled.start),
+            compiled.position(compiled.end),
+            engine,
+            compiled.costs is not None or engine in WEIGHTED_ENGINES,
+        )
+        stats = result["statistics"]
+        if search is None:
+            # 自动选择只使用最短路径引擎，忽略启发函数权重
+            search = self._select_engine(compiled, stats)
+            weight = None
+
+        index_path = self._search(
+            search, compiled, stats, budget, weight, landmarks=landmarks
+        )
+
+        if index_path is None:
+            stats.setdefault("error", "无法从起点到达终点")
+        else:
+            self._fill_result(result, compiled, index_path, output)
+
+        if instrument is not None:
+            instrument.mark("result")
+            stats.update(instrument.report())
+        if metrics is not None:
+            metrics.record_solve(result, time.perf_counter() - began)
+
+        self.last_result = result
+        return result
+
+    def _fill_result(
+        self,
+        result: Dict,
+        compiled: CompiledMaze,
+        index_path: List[int],
+        output: Optional[Collection[str]],
+    ) -> None:
+        """
+        按输出格式填充找到路径时的结果
+        """
+        if output is None:
+            fill_path_result(result, compiled, index_path, self.codes)
+            return
+        fill_path_result(result, compiled, index_path, self.codes, "full" in output)
+        add_encodings(result, compiled, index_path, self.codes, output)
+
+    def expand_result(self, result: Optional[Dict] = None) -> Dict:
+        """
+        根据紧凑编码补全结果中的 movement、path 和 encoded_path
+
+        参数:
+        result (Optional[Dict]): 使用 output 参数求解的结果 (默认使用上次求解结果)，
+            需要使用与求解时相同的方向编码
+
+        返回:
+        Dict: 补全后的结果字典 (原地修改)
+
+        异常:
+        ValueError: 如果没有可用的结果或路径表示
+        """
+        if result is None:
+            result = self.last_result
+            if result is None:
+                raise ValueError("还没有求解结果")
+        return expand_result(result, self.codes)
+
+    def result_to_bytes(self, result: Optional[Dict] = None) -> bytes:
+        """
+        使用当前方向编码把结果编码为二进制 (见 serialize 模块)
+
+        参数:
+        result (Optional[Dict]): 求解结果 (默认使用上次求解结果)
+
+        返回:
+        bytes: 二进制结果
+
+        异常:
+        ValueError: 如果没有可用的结果或路径表示
+        """
+        if result is None:
+            result = self.last_result
+            if result is None:
+                raise ValueError("还没有求解结果")
+        return result_to_bytes(result, self.codes)
+
+    def result_from_bytes(
+        self, data: bytes, output: Optional[Collection[str]] = None
+    ) -> Dict:
+        """
+        把二进制结果还原为结果字典，encoded_path 使用当前方向编码
+
+        参数:
+        data (bytes): result_to_bytes 的结果
+        output (Optional[Collection[str]]): 要还原的路径格式，默认与编码前相同
+
+        返回:
+        Dict: bfs_solve 格式的结果
+
+        异常:
+        ValueError: 如果数据无效
+        """
+        return result_from_bytes(data, self.codes, output)
+
+    def _select_engine(
+        self, compiled: CompiledMaze, stats: Dict
+    ) -> Callable[..., Optional[List[int]]]:
+        """
+        为 engine="auto" 选择引擎，并在统计信息中记录选择结果和迷宫特征
+        """
+        engine, features = select_engine(compiled)
+        stats["engine"] = engine
+        stats["engine_features"] = features
+        return get_engine(engine)
+
+    def _search(
+        self,
+        search: Callable[..., Optional[List[int]]],
+        compiled: CompiledMaze,
+        stats: Dict,
+        budget: Optional[SearchBudget],
+        weight: Optional[float] = None,
+        landmarks: Optional[LandmarkIndex] = None,
+    ) -> Optional[List[int]]:
+        """
+        执行搜索引擎，超出预算时在统计信息中记录原因并返回 None
+        """
+        instrument = self.instrumentation
+        options: Dict = {"budget": budget}
+        if landmarks is not None:
+            options["landmarks"] = landmarks
+        if instrument is not None:
+            options["on_expand"] = instrument.on_expand
+        if weight is not None:
+            options["weight"] = weight
+        tiles = compiled.passable if isinstance(compiled.passable, TiledGrid) else None
+        if tiles is not None:
+            loads, evictions = tiles.loads, tiles.evictions
+        try:
+            index_path = search(compiled, stats, **options)
+        except BudgetExceeded as e:
+            stats["visited_cells"] = e.visited
+            stats["nodes_expanded"] = e.expanded
+            stats["budget_exceeded"] = e.reason
+            stats["error"] = str(e)
+            index_path = None
+        if tiles is not None:
+            stats["tile_loads"] = tiles.loads - loads
+            stats["tile_evictions"] = tiles.evictions - evictions
+            stats["tiles_resident"] = tiles.resident
+        if instrument is not None:
+            instrument.mark("search")
+        return index_path
+
+    def compile(
+        self, maze: Optional[Union[List[List[str]], CompiledMaze]] = None
+    ) -> CompiledMaze:
+        """
+        使用当前符号和地形代价编译迷宫
+
+        编译结果可以传给 solve_compiled 以及各种多路径方法，避免重复编译。
+
+        参数:
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组
+            (默认使用set_maze设置的迷宫)；已编译的迷宫原样返回
+
+        返回:
+        CompiledMaze: 编译后的迷宫
+
+        异常:
+        ValueError: 如果未设置迷宫、迷宫格式无效或缺少起点/终点
+        """
+        if isinstance(maze, CompiledMaze):
+            return maze
+        if maze is None:
+            if self.maze is None:
+                raise ValueError("未设置迷宫，请先调用set_maze()或传入maze参数")
+            maze = self.maze
+        else:
+            self.validate_maze(maze)
+
+        symbols = self.symbols
+        start_pos, end_pos = self.find_positions(maze, symbols["start"], symbols["end"])
+        if start_pos is None:
+            raise ValueError(f"未找到起点符号 '{symbols['start']}'")
+        if end_pos is None:
+            raise ValueError(f"未找到终点符号 '{symbols['end']}'")
+        return compile_maze(
+            maze,
+            symbols["road"],
+            symbols["start"],
+            symbols["end"],
+            start_pos,
+            end_pos,
+            self.costs or None,
+        )
+
+    def build_landmarks(
+        self,
+        maze: Optional[Union[List[List[str]], CompiledMaze]] = None,
+        count: int = DEFAULT_LANDMARKS,
+    ) -> LandmarkIndex:
+        """
+        为迷宫构建地标索引，供 solve_compiled(engine="alt") 反复查询
+
+        参数:
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+        count (int): 地标数量
+
+        返回:
+        LandmarkIndex: 地标索引，可用 save / LandmarkIndex.load 保存到磁盘
+
+        异常:
+        ValueError: 如果迷宫无效或地标数量不是正整数
+        """
+        return LandmarkIndex.build(self.compile(maze), count)
+
+    def solve_pairs(
+        self,
+        pairs: Iterable[Tuple[Tuple[int, int], Tuple[int, int]]],
+        maze: Optional[Union[List[List[str]], CompiledMaze]] = None,
+        group: str = "auto",
+        output: Optional[Collection[str]] = None,
+    ) -> List[Dict]:
+        """
+        在同一个迷宫上批量求解多个 (起点, 终点) 对
+
+        直接使用坐标，迷宫中不需要起点和终点符号。每个不同的起点 (或终点)
+        只搜索一次，同组的各对沿最短路径树回溯 (见 pairs 模块)。
+
+        参数:
+        pairs (Iterable[Tuple[Tuple[int, int], Tuple[int, int]]]): ((起点行, 起点列), (终点行, 终点列)) 序列
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+        group (str): 分组方式
+            - "auto": 按不同端点较少的一侧分组 (默认)
+            - "source": 按起点分组，无地形代价时路径与 bfs_solve 相同
+            - "target": 按终点分组，使用反向搜索树
+        output (Optional[Collection[str]]): 路径输出格式 (见 bfs_solve)
+
+        返回:
+        List[Dict]: 按输入顺序排列、与 bfs_solve 相同格式的结果；statistics 中
+            group、tree_root 和 tree_pairs 说明所在的组，visited_cells 为该组共享的搜索访问数；
+            坐标无效或无法到达时 'error' 说明原因
+
+        异常:
+        ValueError: 如果迷宫无效或 group 未知
+        """
+        if output is not None:
+            check_output(output)
+        if isinstance(maze, CompiledMaze):
+            compiled = maze
+        else:
+            if maze is None:
+                if self.maze is None:
+                    raise ValueError("未设置迷宫，请先调用set_maze()或传入maze参数")
+                maze = self.maze
+            else:
+                self.validate_maze(maze)
+            symbols = self.symbols
+            compiled = compile_maze(
+                maze,
+                symbols["road"],
+                symbols["start"],
+                symbols["end"],
+                costs=self.costs or None,
+            )
+
+        weighted = compiled.costs is not None
+        engine = "dijkstra" if weighted else "bfs"
+        results = []
+        indices: List[Optional[Tuple[int, int]]] = []
+        for start, end in pairs:
+            result = self._new_result(
+                compiled.rows, compiled.cols, tuple(start), tuple(end), engine, weighted
+            )
+            try:
+                indices.append((cell_index(compiled, start), cell_index(compiled, end)))
+            except ValueError as e:
+                result["statistics"]["error"] = str(e)
+                indices.append(None)
+            results.append(result)
+
+        for position, index_path, shared in iter_pair_paths(compiled, indices, group):
+            result = results[position]
+            result["statistics"].update(shared)
+            if index_path is None:
+                result["statistics"]["error"] = "无法从起点到达终点"
+            else:
+                self._fill_result(result, compiled, index_path, output)
+        return results
+
+    def iter_shortest_paths(
+        self, maze: Optional[Union[List[List[str]], CompiledMaze]] = None
+    ) -> Iterator[str]:
+        """
+        惰性枚举所有最短路径 (按步数，忽略地形代价)
+
+        沿 BFS 分层有向图深度优先产出，不会重复求解，可以随时停止迭代。
+
+        参数:
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 迷宫或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+
+        返回:
+        Iterator[str]: 用当前编码表示的路径，无法到达时为空
+
+        使用方式:
+        for encoded in itertools.islice(solver.iter_shortest_paths(maze), 10):
+            print(encoded)
+        """
+        return paths.iter_shortest_paths(self.compile(maze), dict(self.codes))
+
+    def iter_k_shortest(
+        self, k: int, maze: Optional[Union[List[List[str]], CompiledMaze]] = None
+    ) -> Iterator[str]:
+        """
+        使用 Yen 算法按总代价从小到大惰性产出前 k 条无环路径
+
+        设置了地形代价时按总代价排序，否则按步数排序。
+
+        参数:
+        k (int): 最多产出的路径数
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 迷宫或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+
+        返回:
+        Iterator[str]: 用当前编码表示的路径
+
+        异常:
+        ValueError: 如果 k 不是正整数
+        """
+        if not isinstance(k, int) or k <= 0:
+            raise ValueError("k 必须是正整数")
+        return paths.iter_k_shortest(self.compile(maze), k, dict(self.codes))
+
+    def count_shortest_paths(
+        self,
+        maze: Optional[Union[List[List[str]], CompiledMaze]] = None,
+        modulus: Optional[int] = None,
+    ) -> int:
+        """
+        统计最短路径 (按步数) 的条数
+
+        在 BFS 距离层上动态规划，O(格子数) 时间和内存，不枚举路径。
+        开阔地图上的结果可能非常大，可以指定模数。
+
+        参数:
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 迷宫或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+        modulus (Optional[int]): 取模的模数，默认返回精确的大整数
+
+        返回:
+        int: 最短路径条数，无法到达时为 0
+
+        异常:
+        ValueError: 如果模数不是正整数
+        """
+        return paths.count_shortest_paths(self.compile(maze), modulus)
+
+    def verifier(
+        self, maze: Optional[Union[List[List[str]], CompiledMaze]] = None
+    ) -> PathVerifier:
+        """
+        创建使用当前符号和方向编码的路径校验器
+
+        校验器预先计算解码表和逐格允许方向，并缓存到终点的距离场，
+        反复校验同一个迷宫时应复用它。
+
+        参数:
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+
+        返回:
+        PathVerifier: 路径校验器
+
+        异常:
+        ValueError: 如果未设置迷宫、迷宫格式无效或缺少起点/终点
+        """
+        return PathVerifier(self.compile(maze), self.codes)
+
+    def verify_path(
+        self,
+        encoded_path: str,
+        maze: Optional[Union[List[List[str]], CompiledMaze]] = None,
+    ) -> Dict:
+        """
+        校验一条使用当前方向编码的路径，不需要重新求解
+
+        参数:
+        encoded_path (str): 编码路径
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+
+        返回:
+        Dict: valid、steps、failed_step、error、position、remaining、
+            shortest 和 shortest_steps (见 PathVerifier.verify)
+        """
+        return self.verifier(maze).verify(encoded_path)
+
+    def verify_many(
+        self,
+        encoded_paths: Iterable[str],
+        maze: Optional[Union[List[List[str]], CompiledMaze]] = None,
+    ) -> List[Dict]:
+        """
+        在同一个迷宫上批量校验路径，迷宫只编译一次
+
+        参数:
+        encoded_paths (Iterable[str]): 编码路径序列
+        maze (Optional[Union[List[List[str]], CompiledMaze]]): 二维迷宫数组或编译后的迷宫
+            (默认使用set_maze设置的迷宫)
+
+        返回:
+        List[Dict]: 每条路径的校验结果
+        """
+        return self.verifier(maze).verify_many(encoded_paths)
+
+    def _new_result(
+        self,
+        rows: int,
+        cols: int,
+        start_pos: Optional[Tuple[int, int]],
+        end_pos: Optional[Tuple[int, int]],
+        engine: str,
+        weighted: bool = False,
+    ) -> Dict:
+        """
+        创建未找到路径时的初始结果字典
+        """
         result = {
             "found": False,
             "movement": [],
@@ -328,90 +1094,11 @@ class MazeSolver:
                 "end_position": end_pos,
                 "visited_cells": 0,
                 "direction_counts": {"up": 0, "down": 0, "left": 0, "right": 0},
+                "engine": engine,
             },
         }
-
-        if start_pos is None:
-            result["statistics"]["error"] = f"未找到起点符号 '{start_symbol}'"
-            return result
-
-        if end_pos is None:
-            result["statistics"]["error"] = f"未找到终点符号 '{end_symbol}'"
-            return result
-
-        # BFS算法
-        queue = deque(
-            [(start_pos, [start_pos], [], [])]
-        )  # (当前位置, 移动坐标, 方向序列, 方向向量)
-        visited = set([start_pos])
-
-        # 四个方向：上下左右，对应的方向名称
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        direction_names = ["up", "down", "left", "right"]
-
-        while queue:
-            (x, y), movement, move_sequence, direction_vectors = queue.popleft()
-
-            # 如果到达终点
-            if (x, y) == end_pos:
-                # 生成编码路径
-                encoded_path = "".join([self.codes[move] for move in move_sequence])
-
-                # 统计方向使用次数
-                direction_counts = {
-                    direction: move_sequence.count(direction)
-                    for direction in direction_names
-                }
-
-                result.update(
-                    {
-                        "found": True,
-                        "movement": movement,
-                        "path": direction_vectors,
-                        "length": len(movement),
-                        "steps": len(movement) - 1,
-                        "encoded_path": encoded_path,
-                    }
-                )
-                result["statistics"].update(
-                    {
-                        "visited_cells": len(visited),
-                        "direction_counts": direction_counts,
-                    }
-                )
-
-                self.last_result = result
-                return result
-
-            # 探索四个方向
-            for i, (dx, dy) in enumerate(directions):
-                nx, ny = x + dx, y + dy
-
-                # 检查边界
-                if 0 <= nx < rows and 0 <= ny < cols:
-                    # 检查是否可以通行（道路、起点或终点，且未访问过）
-                    if (nx, ny) not in visited and maze[nx][ny] in [
-                        road_symbol,
-                        start_symbol,
-                        end_symbol,
-                    ]:
-                        visited.add((nx, ny))
-                        new_movement = movement + [(nx, ny)]
-                        new_move_sequence = move_sequence + [direction_names[i]]
-                        new_direction_vectors = direction_vectors + [(dx, dy)]
-                        queue.append(
-                            (
-                                (nx, ny),
-                                new_movement,
-                                new_move_sequence,
-                                new_direction_vectors,
-                            )
-                        )
-
-        # 没有找到路径
-        result["statistics"]["visited_cells"] = len(visited)
-        result["statistics"]["error"] = "无法从起点到达终点"
-        self.last_result = result
+        if weighted:
+            result["total_cost"] = 0
         return result
 
     def encode_path(
@@ -421,6 +1108,12 @@ class MazeSolver:
         wall_symbol: Optional[str] = None,
         start_symbol: Optional[str] = None,
         end_symbol: Optional[str] = None,
+        engine: str = "bfs",
+        max_expansions: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        cancel: Optional[CancellationToken] = None,
+        weight: Optional[float] = None,
     ) -> str:
         """
         使用当前编码方案寻找路径并返回编码结果
@@ -431,15 +1124,84 @@ class MazeSolver:
         wall_symbol (Optional[str]): 墙壁符号 (默认使用set_symbols设置的符号)
         start_symbol (Optional[str]): 入口符号 (默认使用set_symbols设置的符号)
         end_symbol (Optional[str]): 出口符号 (默认使用set_symbols设置的符号)
+        engine (str): 搜索引擎名称 (默认 "bfs"，"auto" 为自动选择，见 bfs_solve)
+        max_expansions, timeout, deadline, cancel: 搜索预算 (见 bfs_solve)
+        weight (Optional[float]): 启发函数权重 ε (见 bfs_solve)
 
         返回:
-        str: 编码后的路径字符串，如果没有路径则返回空字符串
+        str: 编码后的路径字符串，如果没有路径或超出预算则返回空字符串
         """
         result = self.bfs_solve(
-            maze, road_symbol, wall_symbol, start_symbol, end_symbol
+            maze,
+            road_symbol,
+            wall_symbol,
+            start_symbol,
+            end_symbol,
+            engine=engine,
+            max_expansions=max_expansions,
+            timeout=timeout,
+            deadline=deadline,
+            cancel=cancel,
+            weight=weight,
         )
         return result["encoded_path"]
 
+    def enable_instrumentation(
+        self,
+        on_expand: Optional[ExpandHook] = None,
+        on_phase: Optional[PhaseHook] = None,
+    ) -> Instrumentation:
+        """
+        启用求解插桩
+
+        启用后 bfs_solve 的 statistics 额外包含:
+            - 'timings': Dict[str, float], 各阶段耗时 (validate, positions,
+              compile, search, result)
+            - 'total_time': float, 总耗时
+        nodes_expanded、peak_frontier、peak_memory_estimate 和 engine
+        由搜索引擎始终记录。
+
+        参数:
+        on_expand (Optional[ExpandHook]): 格子被扩展前的回调 (格子编号, 距离)，
+            格子编号为 row * cols + col
+        on_phase (Optional[PhaseHook]): 每个阶段结束时的回调 (阶段名称, 耗时秒数)
+
+        返回:
+        Instrumentation: 插桩对象
+        """
+        self.instrumentation = Instrumentation(on_expand, on_phase)
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """
+        关闭求解插桩
+        """
+        self.instrumentation = None
+
+    def enable_metrics(
+        self, registry: Optional[MetricsRegistry] = None
+    ) -> SolverMetrics:
+        """
+        启用求解指标
+
+        每次 bfs_solve 会记录结果分类、每个引擎的耗时和访问格子数。
+        同一注册表上的多个求解器共享同一组指标。
+
+        参数:
+        registry (Optional[MetricsRegistry]): 指标注册表，默认使用全局 REGISTRY
+
+        返回:
+        SolverMetrics: 求解器指标，可用 registry.render() 输出 Prometheus 文本
+        """
+        self.metrics = get_solver_metrics(registry)
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        """
+        关闭求解指标
+        """
+        self.metrics = None
+
     def get_last_result(self) -> Optional[Dict]:
         """
         获取最后一次求解的详细结果
@@ -464,6 +1226,13 @@ class MazeSolver:
         print(f"起点位置: {stats['start_position']}")
         print(f"终点位置: {stats['end_position']}")
         print(f"访问格子数: {stats['visited_cells']}")
+        if "timings" in stats:
+            print(f"搜索引擎: {stats['engine']}")
+            print(f"扩展节点数: {stats.get('nodes_expanded', 0)}")
+            print(f"最大边界: {stats.get('peak_frontier', 0)}")
+            print("阶段耗时:")
+            for phase, seconds in stats["timings"].items():
+                print(f"  {phase}: {seconds * 1000:.3f} ms")
 
         if self.last_result["found"]:
             print(f"路径长度: {self.last_result['length']}")
@@ -0,0 +1,398 @@
+"""
+走廊压缩预处理模块
+
+迷宫中绝大多数格子是死胡同或宽度为1的走廊。本模块先反复填充死胡同，
+再把度数为2的格子链压缩成带权边，得到一个很小的路口图，
+在路口图上用Dijkstra搜索后再展开回完整的格子路径。
+
+死胡同先用大整数位运算逐轮剥离，路口节点也用位运算一次求出 (见 bitboard 模块)，
+只有剩下的长死胡同链和走廊需要逐格处理。即便如此，预处理仍要处理整个迷宫，
+而 BFS 找到终点就停止，所以求解不一定比 "bfs" 引擎快 (长死胡同链较多的迷宫更慢)。
+路口图不跨调用缓存，每次求解的耗时都包含预处理，与 bench/tune 的计时一致。
+填充后路口节点仍然很多 (开阔网格、随机墙壁) 时压缩不划算，直接在填充后的网格上执行 BFS。
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from .bitboard import pack_bits, popcount, unpack_bits
+from .budget import SearchBudget
+from .grid import CompiledMaze
+from .instrument import ExpandHook
+
+# 路口图内存估计: 每个节点的字典项与列表，每条有向边的三元组
+_NODE_BYTES = 200
+_EDGE_BYTES = 120
+
+# 位运算剥离死胡同时每隔多少轮统计剥离的格子数并检查预算
+_PEEL_ROUNDS = 8
+# 平均每轮剥离的格子少于格子总数的 1/_PEEL_RATIO 时改为逐格填充
+# (每轮位运算的开销约等于逐格填充 size / 2000 个格子)
+_PEEL_RATIO = 2048
+
+# 路口节点超过剩余可通行格子的该比例时不建路口图，改为在填充后的网格上执行 BFS
+MAX_NODE_RATIO = 0.25
+
+
+def _degree_masks(bits: int, width: int) -> Tuple[int, int]:
+    """
+    按位计算每个格子是否至少有两个、至少有三个可通行的相邻格子
+
+    参数:
+    bits (int): pack_bits 打包的可通行位图
+    width (int): 行宽 (含填充位)
+
+    返回:
+    Tuple[int, int]: (至少两个相邻格子的位图, 至少三个相邻格子的位图)，
+        不可通行格子的位没有意义，需要调用者与 bits 相与
+    """
+    up, down = bits << width, bits >> width
+    left, right = bits << 1, bits >> 1
+    vertical, horizontal = up & down, left & right
+    any_vertical, any_horizontal = up | down, left | right
+    two = vertical | horizontal | (any_vertical & any_horizontal)
+    three = (vertical & any_horizontal) | (horizontal & any_vertical)
+    return two, three
+
+
+def fill_dead_ends(
+    compiled: CompiledMaze, budget: Optional[SearchBudget] = None
+) -> Tuple[bytearray, int]:
+    """
+    反复填充死胡同
+
+    度数不超过1的格子（起点和终点除外）会被填成墙，
+    填充后相邻格子的度数随之减少，直到不再产生新的死胡同。
+    先用位运算逐轮同时剥离所有死胡同的末端，每轮剥离的格子太少时
+    (剩下的是少数很长的死胡同链) 改为沿每条链逐格填充。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    budget (Optional[SearchBudget]): 搜索预算，填充的格子计入扩展数；
+        位运算阶段每 _PEEL_ROUNDS 轮检查一次，max_expansions 最多超出这几轮剥离的格子数
+
+    返回:
+    Tuple[bytearray, int]: (剩余可通行标记, 填充的格子数)
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    rows, cols, size = compiled.rows, compiled.cols, compiled.size
+    start, end = compiled.start, compiled.end
+    bits, width = pack_bits(compiled.passable, rows, cols)
+    keep = 0
+    for cell in (start, end):
+        keep |= 1 << (cell // cols * width + cell % cols)
+    total = remaining = popcount(bits)
+    minimum = _PEEL_ROUNDS * max(1, size // _PEEL_RATIO)
+    dead = 1
+    while dead:
+        if budget is not None:
+            budget.allowance(total - remaining, total - remaining)
+        for _ in range(_PEEL_ROUNDS):
+            dead = bits & ~(_degree_masks(bits, width)[0] | keep)
+            if not dead:
+                break
+            bits ^= dead
+        count = popcount(bits)
+        if remaining - count < minimum:
+            remaining = count
+            break
+        remaining = count
+
+    opened = unpack_bits(bits, rows, cols)
+    tips = unpack_bits(bits & ~(_degree_masks(bits, width)[0] | keep), rows, cols)
+    filled = total - remaining
+    last_col = cols - 1
+    check_at = filled if budget is not None else size + 1
+
+    find = tips.find
+    tip = find(1)
+    while tip >= 0:
+        current = tip
+        # 之前的链可能已经填到这里
+        while opened[current]:
+            if filled >= check_at:
+                check_at = filled + budget.allowance(filled, filled)
+            opened[current] = 0
+            filled += 1
+            # 死胡同最多还有一个可通行的相邻格子
+            col = current % cols
+            if current >= cols and opened[current - cols]:
+                current -= cols
+            elif current + cols < size and opened[current + cols]:
+                current += cols
+            elif col and opened[current - 1]:
+                current -= 1
+            elif col != last_col and opened[current + 1]:
+                current += 1
+            else:
+                break
+            if current == start or current == end:
+                break
+            col = current % cols
+            degree = (current >= cols and opened[current - cols]) + (
+                current + cols < size and opened[current + cols]
+            )
+            degree += (col != 0 and opened[current - 1]) + (
+                col != last_col and opened[current + 1]
+            )
+            if degree > 1:
+                break
+        tip = find(1, tip + 1)
+
+    return opened, filled
+
+
+class JunctionGraph:
+    """
+    路口图
+
+    节点为度数不等于2的格子以及起点和终点，
+    边为连接两个节点的走廊，权重为走廊长度（步数）。
+    work 为构建时填充和沿走廊行走的格子数，计入搜索预算的扩展数。
+    路口节点超过剩余可通行格子的 MAX_NODE_RATIO 时 compressed 为 False，
+    不建立邻接表 (nodes 和 edges 为空)。
+    """
+
+    def __init__(self, compiled: CompiledMaze, budget: Optional[SearchBudget] = None):
+        """
+        对编译迷宫进行死胡同填充和走廊压缩
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫
+        budget (Optional[SearchBudget]): 搜索预算，填充死胡同和压缩走廊时处理的格子
+            都计入扩展数 (见 work)
+
+        异常:
+        BudgetExceeded: 如果超出搜索预算
+        """
+        rows, cols, size = compiled.rows, compiled.cols, compiled.size
+        self.cols, self.size = cols, size
+        self.start, self.end = compiled.start, compiled.end
+        self.opened, self.filled_cells = fill_dead_ends(compiled, budget)
+        self.open_cells = self.opened.count(1)
+
+        bits, width = pack_bits(self.opened, rows, cols)
+        two, three = _degree_masks(bits, width)
+        self.is_node = unpack_bits(bits & (~two | three), rows, cols)
+        self.is_node[self.start] = self.is_node[self.end] = 1
+        self.node_count = self.is_node.count(1)
+        self.compressed = self.node_count <= MAX_NODE_RATIO * self.open_cells
+
+        self.nodes: List[int] = []
+        # 邻接表: 节点 -> [(目标节点, 权重, 走廊第一个格子)]
+        self.edges: Dict[int, List[Tuple[int, int, int]]] = {}
+        self.edge_count = 0
+        self.work = self.filled_cells
+        if self.compressed:
+            self._build(budget)
+
+    def _build(self, budget: Optional[SearchBudget]) -> None:
+        """
+        按编号顺序处理节点，每条走廊只从编号较小的一端走一次，同时加入两个方向的边
+        """
+        nodes = self.nodes
+        find = self.is_node.find
+        index = find(1)
+        while index >= 0:
+            nodes.append(index)
+            index = find(1, index + 1)
+
+        edges = self.edges
+        for node in nodes:
+            edges[node] = []
+        is_node = self.is_node
+        # 已经从另一端走过的走廊在本端的第一个格子
+        walked = set()
+        work = self.work
+        check_at = work
+        for node in nodes:
+            if budget is not None and work >= check_at:
+                check_at = work + budget.allowance(work, work)
+            for first in self._open_neighbors(node):
+                if is_node[first]:
+                    # 相邻的两个节点: 由编号较小的一端加入
+                    if first > node:
+                        edges[node].append((first, 1, first))
+                        edges[first].append((node, 1, node))
+                        self.edge_count += 1
+                    continue
+                if first in walked:
+                    continue
+                cells = self.walk(node, first)
+                work += len(cells)
+                target = cells[-1]
+                walked.add(cells[-2])
+                if target != node:
+                    edges[node].append((target, len(cells), first))
+                    edges[target].append((node, len(cells), cells[-2]))
+                    self.edge_count += 1
+        self.work = work
+
+    def _open_neighbors(self, index: int) -> List[int]:
+        """
+        返回填充后仍可通行的相邻格子
+        """
+        cols, size = self.cols, self.size
+        opened = self.opened
+        col = index % cols
+        result = []
+        if index >= cols and opened[index - cols]:
+            result.append(index - cols)
+        if index + cols < size and opened[index + cols]:
+            result.append(index + cols)
+        if col and opened[index - 1]:
+            result.append(index - 1)
+        if col != cols - 1 and opened[index + 1]:
+            result.append(index + 1)
+        return result
+
+    def walk(self, node: int, first: int) -> List[int]:
+        """
+        沿走廊从节点出发走到下一个节点
+
+        参数:
+        node (int): 出发节点
+        first (int): 走廊的第一个格子
+
+        返回:
+        List[int]: 走廊上的格子编号（不含出发节点，含到达节点）
+        """
+        cells = [first]
+        previous, current = node, first
+        is_node = self.is_node
+        while not is_node[current]:
+            for neighbor in self._open_neighbors(current):
+                if neighbor != previous:
+                    break
+            previous, current = current, neighbor
+            cells.append(current)
+        return cells
+
+    def shortest_path(
+        self,
+        stats: Dict,
+        on_expand: Optional[ExpandHook] = None,
+        budget: Optional[SearchBudget] = None,
+    ) -> Optional[List[int]]:
+        """
+        在路口图上用Dijkstra寻找最短路径，并展开为完整格子路径
+
+        参数:
+        stats (Dict): 统计信息字典
+        on_expand (Optional[ExpandHook]): 每个节点被扩展前的回调 (格子编号, 距离)
+        budget (Optional[SearchBudget]): 搜索预算，每扩展一批节点检查一次
+
+        返回:
+        Optional[List[int]]: 从起点到终点的格子编号列表，无法到达时返回None
+
+        异常:
+        BudgetExceeded: 如果超出搜索预算
+        """
+        start, end = self.start, self.end
+        distance = {start: 0}
+        previous: Dict[int, Tuple[int, int]] = {}
+        settled = set()
+        heap = [(0, start)]
+        peak = 1
+        expanded = 0
+        check_at = 0 if budget is not None else len(self.nodes) + 1
+
+        while heap:
+            if len(heap) > peak:
+                peak = len(heap)
+            dist, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == end:
+                break
+            if expanded >= check_at:
+                check_at = expanded + budget.allowance(expanded, len(distance))
+            expanded += 1
+            if on_expand is not None:
+                on_expand(node, dist)
+            for target, weight, first in self.edges[node]:
+                candidate = dist + weight
+                if candidate < distance.get(target, candidate + 1):
+                    distance[target] = candidate
+                    previous[target] = (node, first)
+                    heapq.heappush(heap, (candidate, target))
+
+        stats["visited_cells"] = len(settled)
+        stats["nodes_expanded"] = len(settled) - (end in settled)
+        stats["peak_frontier"] = peak
+        if end not in settled:
+            return None
+
+        # 展开走廊
+        segments = []
+        node = end
+        while node != start:
+            source, first = previous[node]
+            segments.append(self.walk(source, first))
+            node = source
+        path = [start]
+        for cells in reversed(segments):
+            path.extend(cells)
+        return path
+
+
+def corridor_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    走廊压缩搜索引擎
+
+    compressed 为 False 时在填充后的网格上执行 BFS，统计信息与 "bfs" 引擎相同。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，写入 visited_cells 以及图规模信息
+        (graph_nodes、graph_edges、filled_cells、compressed)
+    on_expand (Optional[ExpandHook]): 每个路口节点被扩展前的回调 (格子编号, 距离)
+    budget (Optional[SearchBudget]): 搜索预算，预处理处理的格子和路口图上扩展的节点
+        都计入扩展数
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    graph = JunctionGraph(compiled, budget)
+    if budget is not None:
+        budget = budget.after(graph.work)
+    # 填充标记和节点标记两个逐格字节数组 + 邻接表 (每条有向边约一个三元组)
+    memory = (
+        2 * compiled.size
+        + len(graph.nodes) * _NODE_BYTES
+        + 2 * graph.edge_count * _EDGE_BYTES
+    )
+    stats.update(
+        {
+            "open_cells": graph.open_cells + graph.filled_cells,
+            "filled_cells": graph.filled_cells,
+            "graph_nodes": graph.node_count,
+            "graph_edges": graph.edge_count,
+            "compressed": graph.compressed,
+            "peak_memory_estimate": memory,
+        }
+    )
+    if graph.compressed:
+        return graph.shortest_path(stats, on_expand, budget)
+
+    # engines 模块导入了本模块，在这里导入以避免循环导入
+    from .engines import bfs_search
+
+    filled = CompiledMaze(
+        compiled.rows, compiled.cols, graph.opened, compiled.start, compiled.end
+    )
+    path = bfs_search(filled, stats, on_expand, budget)
+    stats["peak_memory_estimate"] += memory
+    return path
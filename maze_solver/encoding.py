@@ -0,0 +1,328 @@
+"""
+紧凑路径编码模块
+
+百万步的路径用 encoded_path 字符串和 movement 坐标元组列表保存时占用大量内存，
+序列化也很慢。本模块提供三种可选的紧凑表示以及还原为原格式的解码函数:
+
+    - "rle": 游程编码的方向串，例如 "R12D3L"，使用 codes 中的方向编码；
+      次数为 1 时省略，但某个编码是另一个编码的前缀时总是写出次数以保证可解码
+    - "packed": 每步 2 位的 bytes，第一步在第一个字节的最低两位 (0 上, 1 下, 2 左, 3 右)
+    - "array": array('i') 坐标 [row0, col0, row1, col1, ...]
+
+求解时通过 bfs_solve 的 output 参数选择，结果中分别写入 rle_path、packed_path
+和 movement_array；output 中包含 "full" 时仍同时写入 movement、path 和 encoded_path。
+"""
+
+import re
+from array import array
+from itertools import groupby
+from typing import Collection, Dict, List, Pattern, Sequence, Tuple
+
+from .grid import DIRECTION_NAMES, DIRECTION_VECTORS, CompiledMaze, index_path_to_moves
+
+# 可选的输出格式
+OUTPUT_FORMATS = ("full", "rle", "packed", "array")
+
+# 每个格式写入的结果键
+FORMAT_KEYS = {"rle": "rle_path", "packed": "packed_path", "array": "movement_array"}
+
+# 两位方向编号的掩码
+_LOW_BITS = 0x03
+
+
+def check_output(output: Collection[str]) -> None:
+    """
+    验证输出格式
+
+    参数:
+    output (Collection[str]): 输出格式集合
+
+    异常:
+    ValueError: 如果包含未知格式或为空
+    """
+    if isinstance(output, str):
+        raise ValueError("output 必须是格式名称的集合，例如 ('full', 'rle')")
+    unknown = [name for name in output if name not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"未知的输出格式 {unknown}，可选: {', '.join(OUTPUT_FORMATS)}")
+    if not output:
+        raise ValueError("output 至少需要一种格式")
+
+
+def _direction_codes(codes: Dict[str, str]) -> List[str]:
+    return [codes[name] for name in DIRECTION_NAMES]
+
+
+def prefix_free(direction_codes: Sequence[str]) -> bool:
+    """
+    判断方向编码中是否没有任何一个是另一个的前缀
+    """
+    return not any(
+        a != b and b.startswith(a) for a in direction_codes for b in direction_codes
+    )
+
+
+def run_length_encode(moves: Sequence[int], codes: Dict[str, str]) -> str:
+    """
+    将方向编号序列编码为游程串
+
+    参数:
+    moves (Sequence[int]): 方向编号序列 (0 上, 1 下, 2 左, 3 右)
+    codes (Dict[str, str]): 方向编码字典
+
+    返回:
+    str: 游程串，例如 "R12D3L"
+
+    异常:
+    ValueError: 如果方向编码中含有数字 (无法与次数区分)
+    """
+    direction_codes = _direction_codes(codes)
+    if any(ch.isdigit() for code in direction_codes for ch in code):
+        raise ValueError("方向编码中含有数字时不能使用游程编码")
+    # 编码之间有前缀关系时省略次数会产生歧义，此时用次数分隔每一段
+    minimum = 1 if prefix_free(direction_codes) else 0
+    parts = []
+    for move, group in groupby(moves):
+        count = sum(1 for _ in group)
+        parts.append(direction_codes[move])
+        if count > minimum:
+            parts.append(str(count))
+    return "".join(parts)
+
+
+def code_pattern(codes: Dict[str, str], counted: bool = False) -> Pattern:
+    """
+    构造匹配方向编码的正则表达式
+
+    较长的编码排在前面，因此多字符编码之间存在前缀关系时也按最长匹配切分。
+
+    参数:
+    codes (Dict[str, str]): 方向编码字典
+    counted (bool): 是否在每个编码后匹配可选的次数
+
+    返回:
+    Pattern: 第一组为方向编码 (第二组为次数)
+    """
+    alternatives = sorted(_direction_codes(codes), key=len, reverse=True)
+    pattern = "(" + "|".join(re.escape(code) for code in alternatives) + ")"
+    if counted:
+        pattern += r"(\d*)"
+    return re.compile(pattern)
+
+
+def run_length_decode_moves(text: str, codes: Dict[str, str]) -> bytearray:
+    """
+    将游程串解码为方向编号序列
+
+    参数:
+    text (str): 游程串
+    codes (Dict[str, str]): 编码时使用的方向编码字典
+
+    返回:
+    bytearray: 方向编号序列
+
+    异常:
+    ValueError: 如果游程串无法解析
+    """
+    direction_ids = {code: i for i, code in enumerate(_direction_codes(codes))}
+    moves = bytearray()
+    position = 0
+    for match in code_pattern(codes, counted=True).finditer(text):
+        if match.start() != position:
+            break
+        count = int(match.group(2)) if match.group(2) else 1
+        moves += bytes((direction_ids[match.group(1)],)) * count
+        position = match.end()
+    if position != len(text):
+        raise ValueError(
+            f"无法解析的游程编码，位置 {position}: {text[position:position + 10]!r}"
+        )
+    return moves
+
+
+def run_length_decode(text: str, codes: Dict[str, str]) -> str:
+    """
+    将游程串还原为 encoded_path 格式
+
+    参数:
+    text (str): 游程串
+    codes (Dict[str, str]): 方向编码字典
+
+    返回:
+    str: 逐步编码的路径字符串
+    """
+    return moves_to_encoded(run_length_decode_moves(text, codes), codes)
+
+
+def pack_moves(moves: Sequence[int]) -> bytes:
+    """
+    把方向编号序列打包为每步 2 位的 bytes
+
+    使用大整数按位运算一次处理整个序列，不逐步循环。
+
+    参数:
+    moves (Sequence[int]): 方向编号序列
+
+    返回:
+    bytes: 长度为 ceil(步数 / 4) 的字节串，末尾不足 4 步的高位为 0
+    """
+    data = bytes(moves) + bytes(-len(moves) % 4)
+    size = len(data) // 4
+    packed = 0
+    for shift in range(4):
+        # 每个字节只有低两位，左移 6 位以内不会溢出到相邻字节
+        packed |= int.from_bytes(data[shift::4], "little") << (2 * shift)
+    return packed.to_bytes(size, "little")
+
+
+def unpack_moves(data: bytes, steps: int) -> bytearray:
+    """
+    把每步 2 位的 bytes 还原为方向编号序列
+
+    参数:
+    data (bytes): pack_moves 的结果
+    steps (int): 步数
+
+    返回:
+    bytearray: 方向编号序列
+
+    异常:
+    ValueError: 如果字节数与步数不符
+    """
+    size = len(data)
+    if size != (steps + 3) // 4:
+        raise ValueError(f"打包路径长度 {size} 与步数 {steps} 不符")
+    value = int.from_bytes(data, "little")
+    mask = int.from_bytes(bytes((_LOW_BITS,)) * size, "little")
+    moves = bytearray(4 * size)
+    for shift in range(4):
+        moves[shift::4] = ((value >> (2 * shift)) & mask).to_bytes(size, "little")
+    del moves[steps:]
+    return moves
+
+
+def moves_to_encoded(moves: Sequence[int], codes: Dict[str, str]) -> str:
+    """
+    将方向编号序列转换为 encoded_path 格式
+    """
+    direction_codes = _direction_codes(codes)
+    return "".join([direction_codes[move] for move in moves])
+
+
+def moves_to_path(moves: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    将方向编号序列转换为 path 格式 (方向向量列表)
+    """
+    return [DIRECTION_VECTORS[move] for move in moves]
+
+
+def moves_to_movement(
+    moves: Sequence[int], start: Tuple[int, int]
+) -> List[Tuple[int, int]]:
+    """
+    从起点出发按方向编号序列生成 movement 格式 (坐标列表)
+    """
+    row, col = start
+    movement = [(row, col)]
+    for move in moves:
+        dr, dc = DIRECTION_VECTORS[move]
+        row += dr
+        col += dc
+        movement.append((row, col))
+    return movement
+
+
+def index_path_to_array(index_path: Sequence[int], cols: int) -> array:
+    """
+    将格子编号路径转换为 array('i') 坐标 [row0, col0, row1, col1, ...]
+    """
+    flat = array("i", bytes(8 * len(index_path)))
+    flat[0::2] = array("i", [index // cols for index in index_path])
+    flat[1::2] = array("i", [index % cols for index in index_path])
+    return flat
+
+
+def array_to_movement(flat: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    将 array('i') 坐标还原为 movement 格式
+
+    异常:
+    ValueError: 如果数组长度不是偶数
+    """
+    if len(flat) % 2:
+        raise ValueError("坐标数组长度必须是偶数")
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+def add_encodings(
+    result: Dict,
+    compiled: CompiledMaze,
+    index_path: Sequence[int],
+    codes: Dict[str, str],
+    output: Collection[str],
+) -> Dict:
+    """
+    按 output 向结果字典写入紧凑表示
+
+    参数:
+    result (Dict): 已填充路径的结果字典
+    compiled (CompiledMaze): 编译后的迷宫
+    index_path (Sequence[int]): 从起点到终点的格子编号列表
+    codes (Dict[str, str]): 方向编码字典
+    output (Collection[str]): 输出格式
+
+    返回:
+    Dict: 结果字典
+    """
+    if "rle" in output or "packed" in output:
+        moves = index_path_to_moves(index_path, compiled.cols)
+        if "rle" in output:
+            result["rle_path"] = run_length_encode(moves, codes)
+        if "packed" in output:
+            result["packed_path"] = pack_moves(moves)
+    if "array" in output:
+        result["movement_array"] = index_path_to_array(index_path, compiled.cols)
+    return result
+
+
+def expand_result(result: Dict, codes: Dict[str, str]) -> Dict:
+    """
+    根据紧凑表示补全结果中的 movement、path 和 encoded_path
+
+    优先使用 movement_array，其次 packed_path，最后 rle_path。
+    已经包含完整字段或未找到路径的结果原样返回。
+
+    参数:
+    result (Dict): bfs_solve 格式的结果
+    codes (Dict[str, str]): 求解时使用的方向编码字典
+
+    返回:
+    Dict: 补全后的结果字典 (原地修改)
+
+    异常:
+    ValueError: 如果结果中没有任何可用的路径表示
+    """
+    if not result["found"] or result["movement"]:
+        return result
+    if "movement_array" in result:
+        movement = array_to_movement(result["movement_array"])
+        vectors = {vector: move for move, vector in enumerate(DIRECTION_VECTORS)}
+        moves = bytearray(
+            [
+                vectors[(b[0] - a[0], b[1] - a[1])]
+                for a, b in zip(movement, movement[1:])
+            ]
+        )
+    else:
+        if "packed_path" in result:
+            moves = unpack_moves(result["packed_path"], result["steps"])
+        elif "rle_path" in result:
+            moves = run_length_decode_moves(result["rle_path"], codes)
+        else:
+            raise ValueError("结果中没有可用的路径表示")
+        start = result["statistics"]["start_position"]
+        movement = moves_to_movement(moves, tuple(start))
+    result["movement"] = movement
+    result["path"] = moves_to_path(moves)
+    result["encoded_path"] = moves_to_encoded(moves, codes)
+    return result
@@ -0,0 +1,196 @@
+"""
+搜索引擎模块
+所有引擎都接收编译后的迷宫，返回从起点到终点的格子编号路径
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .budget import SearchBudget
+from .grid import START_MARK, CompiledMaze, trace_back
+from .bitboard import bitboard_search
+from .corridor import corridor_search
+from .external import external_search
+from .informed import anytime_search, astar_search, greedy_search
+from .landmarks import alt_search
+from .weighted import dijkstra_search, zero_one_search
+from .instrument import ExpandHook
+
+# 引擎签名: (编译迷宫, 统计信息字典, **选项) -> 格子编号路径或None
+# 引擎忽略自己不支持的选项；所有引擎都支持 budget 选项 (见 budget 模块)
+SearchEngine = Callable[..., Optional[List[int]]]
+
+# 列表中每个整数元素的估计内存 (8字节指针 + 32字节整数对象)
+_LIST_ITEM_BYTES = 40
+
+
+def bfs_levels(
+    compiled: CompiledMaze,
+    came: bytearray,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+) -> Iterator[Tuple[int, List[int]]]:
+    """
+    按层执行广度优先搜索，依次产出每层新发现的格子
+
+    层内扩展顺序与原实现相同 (上下左右)，并在终点出队时停止，
+    因此 visited_cells 与原实现完全一致。迭代结束后 came[end] 非零表示找到终点，
+    可用 trace_back 回溯路径。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    came (bytearray): 长度为格子数的全零数组，写入每个格子的到达方向标记
+    stats (Dict): 统计信息字典，迭代结束时写入 visited_cells、nodes_expanded、
+        peak_frontier (最大层宽) 和 peak_memory_estimate (字节)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 距离)，
+        只在每层开始时检查一次，未设置时没有额外开销
+    budget (Optional[SearchBudget]): 搜索预算，层内每扩展一批格子检查一次
+
+    返回:
+    Iterator[Tuple[int, List[int]]]: (距离, 新发现的格子列表)，第一项为 (0, [起点])；
+        列表由搜索继续使用，调用者不能修改
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    start, end = compiled.start, compiled.end
+    last_col = cols - 1
+
+    came[start] = START_MARK
+    frontier = [start]
+    discovered = 1
+    expanded = 0
+    peak = 1
+    depth = 0
+    found = False
+    yield 0, frontier
+
+    while frontier:
+        if came[end]:
+            # 终点已在本层中：只扩展排在它前面的格子
+            frontier = frontier[: frontier.index(end)]
+            found = True
+        if on_expand is not None:
+            for current in frontier:
+                on_expand(current, depth)
+
+        next_level: List[int] = []
+        append = next_level.append
+        if budget is None:
+            batches: Iterable[Sequence[int]] = (frontier,)
+        else:
+            batches = budget.chunks(frontier, expanded, discovered, next_level)
+        for batch in batches:
+            for current in batch:
+                neighbor = current - cols
+                if neighbor >= 0 and passable[neighbor] and not came[neighbor]:
+                    came[neighbor] = 1
+                    append(neighbor)
+                neighbor = current + cols
+                if neighbor < size and passable[neighbor] and not came[neighbor]:
+                    came[neighbor] = 2
+                    append(neighbor)
+                col = current % cols
+                if col and passable[current - 1] and not came[current - 1]:
+                    came[current - 1] = 3
+                    append(current - 1)
+                if col != last_col and passable[current + 1] and not came[current + 1]:
+                    came[current + 1] = 4
+                    append(current + 1)
+
+        expanded += len(frontier)
+        discovered += len(next_level)
+        if len(next_level) > peak:
+            peak = len(next_level)
+        depth += 1
+        if next_level:
+            yield depth, next_level
+        if found:
+            break
+        frontier = next_level
+
+    stats.update(
+        {
+            "visited_cells": discovered,
+            "nodes_expanded": expanded,
+            "peak_frontier": peak,
+            # 可通行数组 + 方向标记数组 + 两层列表 (指针与整数对象)
+            "peak_memory_estimate": 2 * size + 2 * peak * _LIST_ITEM_BYTES,
+        }
+    )
+
+
+def bfs_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    广度优先搜索引擎
+
+    按层扩展 (见 bfs_levels)，使用方向标记数组代替逐节点复制路径，
+    路径和 visited_cells 与原实现完全一致。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、
+        peak_frontier (最大层宽) 和 peak_memory_estimate (字节)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 距离)，
+        只在每层开始时检查一次，未设置时没有额外开销
+    budget (Optional[SearchBudget]): 搜索预算
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    came = bytearray(compiled.size)
+    for _ in bfs_levels(compiled, came, stats, on_expand, budget):
+        pass
+    if not came[compiled.end]:
+        return None
+    return trace_back(came, compiled.end, compiled.cols)
+
+
+# 引擎注册表
+ENGINES: Dict[str, SearchEngine] = {
+    "bfs": bfs_search,
+    "corridor": corridor_search,
+    "dijkstra": dijkstra_search,
+    "zero_one": zero_one_search,
+    "astar": astar_search,
+    "greedy": greedy_search,
+    "anytime": anytime_search,
+    "alt": alt_search,
+    "bitboard": bitboard_search,
+    "external": external_search,
+}
+
+# 按地形代价计算最小代价路径的引擎，结果中总是包含 total_cost
+WEIGHTED_ENGINES = frozenset({"dijkstra", "zero_one"})
+
+
+def get_engine(name: str) -> SearchEngine:
+    """
+    按名称获取搜索引擎
+
+    参数:
+    name (str): 引擎名称
+
+    返回:
+    SearchEngine: 搜索引擎函数
+
+    异常:
+    ValueError: 如果引擎名称未知
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"未知的搜索引擎 '{name}'，可选: {', '.join(sorted(ENGINES))}"
+        ) from None
@@ -0,0 +1,363 @@
+"""
+外存 BFS 引擎模块
+
+10⁹ 个格子的迷宫即使可通行数组放在磁盘上 (见 tiles 模块)，每格 1 字节的方向标记数组
+和队列也放不进内存。本模块实现 Munagala-Ranade 式的外存 BFS，不保存全局访问集合:
+
+    1. 顺序读取当前层文件，把相邻格子 (格子编号 << 2 | 方向) 写入内存缓冲区，
+       缓冲区达到内存预算时排序后写成一个临时有序段
+    2. 多路归并各有序段，去掉重复格子，再与上一层和当前层的有序文件流式比较，
+       剩下的格子就是下一层 (无向图中相邻格子只可能在前后两层或本层)
+    3. 下一层按格子编号有序写入文件；到达方向按每格 2 位写入方向文件
+
+只保留最近两层的格子文件，方向文件大小为格子数 / 4 字节。找到终点后，
+从终点开始按方向文件逐步回溯路径。内存占用由 memory_budget 限制:
+排序缓冲区、归并时每个有序段的读缓冲区和方向文件的页缓冲区都计入预算。
+
+配合 TiledGrid 使用时，按格子编号有序扩展也让块的访问基本按顺序推进。
+"""
+
+import heapq
+import os
+import tempfile
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .budget import SearchBudget
+from .grid import CompiledMaze
+from .instrument import ExpandHook
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# 排序缓冲区中每条记录的估计内存 (数组 8 字节 + 排序时的列表指针和整数对象)
+_RECORD_OVERHEAD = 48
+# 排序缓冲区最少容纳的记录数
+_MIN_CHUNK = 1024
+# 顺序读写文件时每次读写的记录数 (每条 8 字节)
+_STREAM_RECORDS = 8192
+_STREAM_BYTES = _STREAM_RECORDS * 8
+# 方向文件的页大小 (字节)
+_PAGE = 4096
+# 归并结束标记，大于任何记录
+_END = 1 << 64
+
+
+def _read_records(path: str) -> Iterator[int]:
+    """
+    按块顺序读取记录文件
+    """
+    with open(path, "rb") as handle:
+        while True:
+            block = array("Q")
+            try:
+                block.fromfile(handle, _STREAM_RECORDS)
+            except EOFError:
+                # 不足一块时已读到的记录仍然保留在 block 中
+                pass
+            if not block:
+                return
+            yield from block
+
+
+def _write_records(path: str, records: Iterable[int]) -> int:
+    """
+    把记录顺序写入文件
+
+    返回:
+    int: 写入的字节数
+    """
+    written = 0
+    block = array("Q")
+    with open(path, "wb") as handle:
+        for record in records:
+            block.append(record)
+            if len(block) >= _STREAM_RECORDS:
+                block.tofile(handle)
+                written += len(block) * 8
+                block = array("Q")
+        block.tofile(handle)
+        written += len(block) * 8
+    return written
+
+
+class _DirectionFile:
+    """
+    每格 2 位的到达方向文件
+
+    同一层的格子按编号递增写入，因此只缓冲一页，换页时写回。
+    """
+
+    def __init__(self, path: str, size: int):
+        self._handle = open(path, "w+b")
+        self._handle.truncate((size + 3) // 4)
+        self._page = -1
+        self._buffer = bytearray()
+        self._dirty = False
+
+    def _load(self, page: int) -> None:
+        self.flush()
+        self._handle.seek(page * _PAGE)
+        self._buffer = bytearray(self._handle.read(_PAGE))
+        self._page = page
+
+    def set(self, cell: int, direction: int) -> None:
+        offset = cell >> 2
+        page = offset // _PAGE
+        if page != self._page:
+            self._load(page)
+        self._buffer[offset - page * _PAGE] |= direction << ((cell & 3) * 2)
+        self._dirty = True
+
+    def get(self, cell: int) -> int:
+        offset = cell >> 2
+        page = offset // _PAGE
+        if page != self._page:
+            self._load(page)
+        return (self._buffer[offset - page * _PAGE] >> ((cell & 3) * 2)) & 3
+
+    def flush(self) -> None:
+        if self._dirty:
+            self._handle.seek(self._page * _PAGE)
+            self._handle.write(self._buffer)
+            self._dirty = False
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def external_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    temp_dir: Optional[str] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    外存广度优先搜索引擎
+
+    每层写入临时目录中的有序文件，去重只依赖前两层，不分配每格 1 字节的数组。
+    路径是最短路径，等长路径之间选择格子编号最小的前驱所在的方向。忽略地形代价。
+    临时目录在返回 (或抛出异常) 前删除。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫，passable 可以是 TiledGrid
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、peak_frontier、
+        peak_memory_estimate (字节)、end_distance、spilled_runs (写出的有序段数)
+        和 disk_bytes_written
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 距离)
+    budget (Optional[SearchBudget]): 搜索预算
+    memory_budget (int): 内存预算 (字节)，小于约 0.3 MB 时按最小缓冲区运行
+    temp_dir (Optional[str]): 临时文件所在目录 (默认系统临时目录)
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    ValueError: 如果 memory_budget 不是正数
+    BudgetExceeded: 如果超出搜索预算
+    """
+    if memory_budget <= 0:
+        raise ValueError("memory_budget 必须大于 0")
+    with tempfile.TemporaryDirectory(prefix="maze-ebfs-", dir=temp_dir) as workdir:
+        search = _ExternalBFS(compiled, workdir, memory_budget)
+        try:
+            return search.run(stats, on_expand, budget)
+        finally:
+            search.close()
+
+
+class _ExternalBFS:
+    """
+    一次外存 BFS 的临时文件和计数
+    """
+
+    def __init__(self, compiled: CompiledMaze, workdir: str, memory_budget: int):
+        self.compiled = compiled
+        self.workdir = workdir
+        # 预算的一半给排序缓冲区，另一半给归并时的读缓冲区
+        self.chunk = max(_MIN_CHUNK, memory_budget // 2 // _RECORD_OVERHEAD)
+        # 归并时还要同时读取前两层文件
+        self.fan_in = max(2, memory_budget // 2 // _STREAM_BYTES - 2)
+        self.directions = _DirectionFile(
+            os.path.join(workdir, "directions"), compiled.size
+        )
+        self.files = 0
+        self.runs = 0
+        self.written = 0
+        self.peak_memory = 0
+
+    def _path(self, name: str) -> str:
+        self.files += 1
+        return os.path.join(self.workdir, f"{name}-{self.files}")
+
+    def _spill(self, records: Iterable[int]) -> str:
+        path = self._path("run")
+        self.written += _write_records(path, records)
+        self.runs += 1
+        return path
+
+    def _merge(self, runs: List[str]) -> List[str]:
+        """
+        每次归并 fan_in 个有序段，直到剩余段数不超过 fan_in
+        """
+        while len(runs) > self.fan_in:
+            merged = []
+            for first in range(0, len(runs), self.fan_in):
+                group = runs[first : first + self.fan_in]
+                merged.append(self._spill(heapq.merge(*map(_read_records, group))))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+        return runs
+
+    def _expand(
+        self,
+        level: str,
+        depth: int,
+        on_expand: Optional[ExpandHook],
+        budget: Optional[SearchBudget],
+        counts: List[int],
+    ) -> Iterator[int]:
+        """
+        扩展一层，产出有序且可能重复的 (格子编号 << 2 | 方向) 记录
+        """
+        compiled = self.compiled
+        cols, size = compiled.cols, compiled.size
+        passable = compiled.passable
+        last_col = cols - 1
+        buffer = array("Q")
+        append = buffer.append
+        runs: List[str] = []
+        expanded, visited, check_at = counts
+        for current in _read_records(level):
+            if expanded >= check_at:
+                check_at = expanded + budget.allowance(expanded, visited)
+            if on_expand is not None:
+                on_expand(current, depth)
+            expanded += 1
+            neighbor = current - cols
+            if neighbor >= 0 and passable[neighbor]:
+                append(neighbor << 2)
+            neighbor = current + cols
+            if neighbor < size and passable[neighbor]:
+                append(neighbor << 2 | 1)
+            col = current % cols
+            if col and passable[current - 1]:
+                append((current - 1) << 2 | 2)
+            if col != last_col and passable[current + 1]:
+                append((current + 1) << 2 | 3)
+            if len(buffer) >= self.chunk:
+                self._note_memory(len(buffer), 0)
+                runs.append(self._spill(sorted(buffer)))
+                buffer = array("Q")
+                append = buffer.append
+        counts[0], counts[2] = expanded, check_at
+
+        runs = self._merge(runs)
+        self._note_memory(len(buffer), len(runs) + 2)
+        buffer = array("Q", sorted(buffer))
+        try:
+            yield from heapq.merge(buffer, *map(_read_records, runs))
+        finally:
+            for path in runs:
+                os.remove(path)
+
+    def _note_memory(self, records: int, streams: int) -> None:
+        estimate = records * _RECORD_OVERHEAD + streams * _STREAM_BYTES + _PAGE
+        if estimate > self.peak_memory:
+            self.peak_memory = estimate
+
+    def run(
+        self,
+        stats: Dict,
+        on_expand: Optional[ExpandHook],
+        budget: Optional[SearchBudget],
+    ) -> Optional[List[int]]:
+        compiled = self.compiled
+        start, end = compiled.start, compiled.end
+        directions = self.directions
+
+        previous: Optional[str] = None
+        level = self._path("level")
+        self.written += _write_records(level, [start])
+        visited = 1
+        peak = 1
+        depth = 0
+        found = start == end
+        # [已扩展, 已访问, 下次检查预算时的扩展数]
+        counts = [0, 1, 0 if budget is not None else compiled.size + 1]
+
+        while not found:
+            candidates = self._expand(level, depth, on_expand, budget, counts)
+            older = _read_records(previous) if previous is not None else iter(())
+            same = _read_records(level)
+            old_cell = next(older, _END)
+            same_cell = next(same, _END)
+            last = -1
+            count = 0
+            block = array("Q")
+            following = self._path("level")
+            with open(following, "wb") as handle:
+                for record in candidates:
+                    cell = record >> 2
+                    if cell == last:
+                        continue
+                    last = cell
+                    while old_cell < cell:
+                        old_cell = next(older, _END)
+                    while same_cell < cell:
+                        same_cell = next(same, _END)
+                    if old_cell == cell or same_cell == cell:
+                        continue
+                    directions.set(cell, record & 3)
+                    block.append(cell)
+                    count += 1
+                    if len(block) >= _STREAM_RECORDS:
+                        block.tofile(handle)
+                        block = array("Q")
+                    if cell == end:
+                        found = True
+                        break
+                block.tofile(handle)
+            self.written += count * 8
+            candidates.close()
+            directions.flush()
+            if previous is not None:
+                os.remove(previous)
+            previous, level = level, following
+            depth += 1
+            counts[1] = visited = visited + count
+            if count > peak:
+                peak = count
+            if not count:
+                break
+
+        stats.update(
+            {
+                "visited_cells": visited,
+                "nodes_expanded": counts[0],
+                "peak_frontier": peak,
+                "peak_memory_estimate": self.peak_memory,
+                "end_distance": depth if found else None,
+                "spilled_runs": self.runs,
+                "disk_bytes_written": self.written + (compiled.size + 3) // 4,
+            }
+        )
+        if not found:
+            return None
+
+        # 按方向文件回溯: 方向 0 上、1 下、2 左、3 右，前驱在相反方向
+        cols = compiled.cols
+        back = (cols, -cols, 1, -1)
+        path = [end]
+        current = end
+        while current != start:
+            current += back[directions.get(current)]
+            path.append(current)
+        path.reverse()
+        return path
+
+    def close(self) -> None:
+        self.directions.close()
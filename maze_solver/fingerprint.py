@@ -0,0 +1,132 @@
+"""
+迷宫指纹模块
+
+缓存和去重需要一个廉价的迷宫标识，但对 List[List[str]] 直接求哈希每次都要拼接全部格子。
+MazeFingerprint 为每一行保存一个 16 字节的 BLAKE2b 摘要，合并摘要再对符号摘要和
+各行摘要求哈希:
+
+    指纹 = BLAKE2b(符号摘要 + 行数 + 第 0 行摘要 + 第 1 行摘要 + ...)
+
+修改一个格子只需要重新计算所在行的摘要 (O(列数))；合并摘要在下次读取时按需重新计算，
+只处理每行 16 字节，与格子总数无关。符号摘要覆盖道路/墙壁/起点/终点符号和地形代价表，
+同一指纹的迷宫在同样的符号下编译结果相同。
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+
+# 行摘要字节数
+ROW_DIGEST_SIZE = 16
+
+
+def row_digest(row: Sequence[str]) -> bytes:
+    """
+    计算一行的摘要
+
+    参数:
+    row (Sequence[str]): 一行格子符号
+
+    返回:
+    bytes: ROW_DIGEST_SIZE 字节的摘要
+    """
+    return hashlib.blake2b(
+        "\x1f".join(row).encode("utf-8"), digest_size=ROW_DIGEST_SIZE
+    ).digest()
+
+
+def symbols_digest(
+    symbols: Sequence[str], costs: Optional[Dict[str, int]] = None
+) -> bytes:
+    """
+    计算符号和地形代价表的摘要
+
+    参数:
+    symbols (Sequence[str]): (道路, 墙壁, 起点, 终点) 符号
+    costs (Optional[Dict[str, int]]): 地形代价表
+
+    返回:
+    bytes: ROW_DIGEST_SIZE 字节的摘要
+    """
+    digest = hashlib.blake2b(digest_size=ROW_DIGEST_SIZE)
+    digest.update("\x1f".join(symbols).encode("utf-8") + b"\x1e")
+    if costs:
+        digest.update(json.dumps(sorted(costs.items())).encode("utf-8"))
+    return digest.digest()
+
+
+class MazeFingerprint:
+    """
+    可增量更新的迷宫指纹
+    """
+
+    def __init__(
+        self,
+        maze: Sequence[Sequence[str]],
+        symbols: Sequence[str],
+        costs: Optional[Dict[str, int]] = None,
+    ):
+        """
+        计算迷宫每一行的摘要
+
+        参数:
+        maze (Sequence[Sequence[str]]): 二维迷宫数组
+        symbols (Sequence[str]): (道路, 墙壁, 起点, 终点) 符号
+        costs (Optional[Dict[str, int]]): 地形代价表
+        """
+        self._symbols = symbols_digest(symbols, costs)
+        self._rows: List[bytes] = [row_digest(row) for row in maze]
+        self._digest: Optional[bytes] = None
+
+    def update_row(self, index: int, row: Sequence[str]) -> None:
+        """
+        某一行的内容改变后重新计算该行摘要
+
+        参数:
+        index (int): 行号
+        row (Sequence[str]): 该行新的格子符号
+
+        异常:
+        IndexError: 如果行号越界
+        """
+        self._rows[index] = row_digest(row)
+        self._digest = None
+
+    def set_symbols(
+        self, symbols: Sequence[str], costs: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        符号或地形代价表改变后更新符号摘要
+
+        参数:
+        symbols (Sequence[str]): (道路, 墙壁, 起点, 终点) 符号
+        costs (Optional[Dict[str, int]]): 地形代价表
+        """
+        self._symbols = symbols_digest(symbols, costs)
+        self._digest = None
+
+    def digest(self) -> bytes:
+        """
+        返回合并摘要
+
+        返回:
+        bytes: 20 字节的摘要
+        """
+        if self._digest is None:
+            digest = hashlib.blake2b(self._symbols, digest_size=20)
+            digest.update(len(self._rows).to_bytes(8, "little"))
+            digest.update(b"".join(self._rows))
+            self._digest = digest.digest()
+        return self._digest
+
+    def hexdigest(self) -> str:
+        """
+        返回十六进制指纹 (40 个字符)
+        """
+        return self.digest().hex()
+
+    def __str__(self) -> str:
+        return self.hexdigest()
+
+    def __repr__(self) -> str:
+        return f"MazeFingerprint({self.hexdigest()}, rows={len(self._rows)})"
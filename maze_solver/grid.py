@@ -0,0 +1,280 @@
+"""
+编译迷宫模块
+将二维符号迷宫编译为一维可通行数组，供各种搜索引擎共享
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 方向顺序与 MazeSolver 保持一致：上、下、左、右
+DIRECTION_NAMES = ("up", "down", "left", "right")
+DIRECTION_VECTORS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# 方向标记数组中起点的标记值，其余非零值为 1 + 到达该格子的方向编号
+START_MARK = 5
+
+
+class CompiledMaze:
+    """
+    编译后的迷宫
+
+    使用一维数组保存每个格子是否可通行，格子编号为 row * cols + col。
+    所有搜索引擎都只依赖这个结构，而不再直接读取符号迷宫。
+    带地形代价的迷宫另有一个逐格代价数组，表示进入该格子的代价。
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        passable: Sequence[int],
+        start: Optional[int],
+        end: Optional[int],
+        costs: Optional[Sequence[int]] = None,
+    ):
+        """
+        初始化编译迷宫
+
+        参数:
+        rows (int): 行数
+        cols (int): 列数
+        passable (Sequence[int]): 长度为 rows * cols 的可通行标记 (1 可通行, 0 墙壁)
+        start (Optional[int]): 起点编号
+        end (Optional[int]): 终点编号
+        costs (Optional[Sequence[int]]): 长度为 rows * cols 的进入代价，
+            None 表示所有可通行格子代价为 1
+        """
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.passable = passable
+        self.start = start
+        self.end = end
+        self.costs = costs
+
+    def index(self, position: Tuple[int, int]) -> int:
+        """
+        坐标转换为格子编号
+        """
+        return position[0] * self.cols + position[1]
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """
+        格子编号转换为坐标
+        """
+        return divmod(index, self.cols)
+
+    def neighbors(self, index: int) -> List[Tuple[int, int]]:
+        """
+        返回可通行的相邻格子
+
+        参数:
+        index (int): 格子编号
+
+        返回:
+        List[Tuple[int, int]]: (方向编号, 相邻格子编号) 列表，方向顺序为上下左右
+        """
+        cols = self.cols
+        passable = self.passable
+        result = []
+        if index >= cols and passable[index - cols]:
+            result.append((0, index - cols))
+        if index + cols < self.size and passable[index + cols]:
+            result.append((1, index + cols))
+        col = index % cols
+        if col > 0 and passable[index - 1]:
+            result.append((2, index - 1))
+        if col < cols - 1 and passable[index + 1]:
+            result.append((3, index + 1))
+        return result
+
+    def with_endpoints(
+        self, start: Tuple[int, int], end: Tuple[int, int]
+    ) -> "CompiledMaze":
+        """
+        返回共享可通行数组、但起点和终点不同的编译迷宫
+
+        参数:
+        start (Tuple[int, int]): 起点坐标
+        end (Tuple[int, int]): 终点坐标
+
+        返回:
+        CompiledMaze: 新的编译迷宫
+
+        异常:
+        ValueError: 如果坐标越界或位于墙上
+        """
+        indices = []
+        for position in (start, end):
+            x, y = position
+            if not (0 <= x < self.rows and 0 <= y < self.cols):
+                raise ValueError(f"坐标 {position} 超出迷宫范围")
+            index = x * self.cols + y
+            if not self.passable[index]:
+                raise ValueError(f"坐标 {position} 不可通行")
+            indices.append(index)
+        return CompiledMaze(
+            self.rows, self.cols, self.passable, indices[0], indices[1], self.costs
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledMaze(rows={self.rows}, cols={self.cols}, "
+            f"start={self.start}, end={self.end})"
+        )
+
+
+def compile_maze(
+    maze: List[List[str]],
+    road_symbol: str,
+    start_symbol: str,
+    end_symbol: str,
+    start_pos: Optional[Tuple[int, int]] = None,
+    end_pos: Optional[Tuple[int, int]] = None,
+    costs: Optional[Dict[str, int]] = None,
+) -> CompiledMaze:
+    """
+    将二维符号迷宫编译为一维可通行数组
+
+    道路、起点、终点以及代价表中的地形符号可通行，其余任何符号都视为墙壁。
+
+    参数:
+    maze (List[List[str]]): 二维迷宫数组
+    road_symbol (str): 道路符号
+    start_symbol (str): 起点符号
+    end_symbol (str): 终点符号
+    start_pos (Optional[Tuple[int, int]]): 起点坐标
+    end_pos (Optional[Tuple[int, int]]): 终点坐标
+    costs (Optional[Dict[str, int]]): 地形符号 -> 进入代价；提供时生成逐格代价数组，
+        道路、起点和终点的代价为 1
+
+    返回:
+    CompiledMaze: 编译后的迷宫
+    """
+    rows, cols = len(maze), len(maze[0])
+    open_symbols = {road_symbol, start_symbol, end_symbol}
+    if costs:
+        open_symbols.update(costs)
+    passable = bytearray(rows * cols)
+    table: Dict[int, int] = {}
+
+    offset = 0
+    for row in maze:
+        text = "".join(row)
+        if len(text) == cols:
+            # 单字符格子：借助 str.translate 整行转换
+            for char in set(text):
+                if ord(char) not in table:
+                    table[ord(char)] = 1 if char in open_symbols else 0
+            passable[offset : offset + cols] = text.translate(table).encode("latin-1")
+        else:
+            # 存在多字符格子时逐格判断
+            for j, cell in enumerate(row):
+                if cell in open_symbols:
+                    passable[offset + j] = 1
+        offset += cols
+
+    weights = None
+    if costs is not None:
+        table_costs = dict(costs)
+        table_costs.update({road_symbol: 1, start_symbol: 1, end_symbol: 1})
+        get = table_costs.get
+        weights = array("I")
+        for row in maze:
+            weights.extend([get(cell, 0) for cell in row])
+
+    start = start_pos[0] * cols + start_pos[1] if start_pos is not None else None
+    end = end_pos[0] * cols + end_pos[1] if end_pos is not None else None
+    return CompiledMaze(rows, cols, passable, start, end, weights)
+
+
+def index_path_to_moves(index_path: Sequence[int], cols: int) -> bytearray:
+    """
+    将格子编号路径转换为方向编号序列
+
+    参数:
+    index_path (Sequence[int]): 从起点到终点的格子编号列表
+    cols (int): 迷宫列数
+
+    返回:
+    bytearray: 方向编号序列 (0 上, 1 下, 2 左, 3 右)
+    """
+    moves = bytearray(max(len(index_path) - 1, 0))
+    for k in range(len(index_path) - 1):
+        delta = index_path[k + 1] - index_path[k]
+        if delta == -cols:
+            moves[k] = 0
+        elif delta == cols:
+            moves[k] = 1
+        elif delta == -1:
+            moves[k] = 2
+        else:
+            moves[k] = 3
+    return moves
+
+
+def trace_back(came: bytearray, end: int, cols: int) -> List[int]:
+    """
+    根据方向标记数组回溯路径
+
+    参数:
+    came (bytearray): 每个格子的到达方向标记 (1 + 方向编号)，起点为 5
+    end (int): 终点编号
+    cols (int): 迷宫列数
+
+    返回:
+    List[int]: 从起点到终点的格子编号列表
+    """
+    offsets = (-cols, cols, -1, 1)
+    path = [end]
+    current = end
+    while came[current] != START_MARK:
+        current -= offsets[came[current] - 1]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def fill_path_result(
+    result: Dict,
+    compiled: CompiledMaze,
+    index_path: Sequence[int],
+    codes: Dict[str, str],
+    full: bool = True,
+) -> Dict:
+    """
+    根据格子编号路径填充 bfs_solve 格式的结果字典
+
+    结果字典中含有 total_cost 时同时写入路径总代价 (进入各格子的代价之和)。
+    full 为 False 时不写入 movement、path 和 encoded_path (由紧凑编码代替，见 encoding 模块)。
+
+    参数:
+    result (Dict): 已包含 statistics 的结果字典
+    compiled (CompiledMaze): 编译后的迷宫
+    index_path (Sequence[int]): 从起点到终点的格子编号列表
+    codes (Dict[str, str]): 方向编码字典
+    full (bool): 是否写入完整的坐标、方向和编码路径
+
+    返回:
+    Dict: 填充后的结果字典
+    """
+    cols = compiled.cols
+    moves = index_path_to_moves(index_path, cols)
+    result.update(
+        {"found": True, "length": len(index_path), "steps": len(index_path) - 1}
+    )
+    if full:
+        direction_codes = [codes[name] for name in DIRECTION_NAMES]
+        result["movement"] = [divmod(index, cols) for index in index_path]
+        result["path"] = [DIRECTION_VECTORS[move] for move in moves]
+        result["encoded_path"] = "".join([direction_codes[move] for move in moves])
+    result["statistics"]["direction_counts"] = {
+        name: moves.count(i) for i, name in enumerate(DIRECTION_NAMES)
+    }
+    if "total_cost" in result:
+        costs = compiled.costs
+        if costs is None:
+            result["total_cost"] = len(index_path) - 1
+        else:
+            result["total_cost"] = sum([costs[index] for index in index_path[1:]])
+    return result
@@ -0,0 +1,323 @@
+"""
+启发式搜索引擎模块
+
+使用到终点的曼哈顿距离 (乘以最小格子代价，保证不高估) 作为启发函数:
+
+    - "astar": 加权 A*，优先级为 g + ε·h，路径代价不超过最优的 ε 倍 (默认 ε = 1，即最优)
+    - "greedy": 贪心最佳优先，只按 h 排序，最快找到一条可行路径但没有质量保证
+    - "anytime": 从较大的 ε 开始反复执行加权 A*，每轮减小 ε 并保留更好的路径，
+      直到证明最优或超出搜索预算 (见 budget 模块)，返回当时最好的路径
+
+结果的 statistics 中 suboptimality_bound 为路径代价与最优代价之比的上界:
+加权 A* 为 ε，且不超过 路径代价 / 起点的启发值 (最优代价的下界)；贪心搜索只有后者。返回的格子编号路径与其他引擎相同，仍按 codes 编码。
+"""
+
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .budget import BudgetExceeded, SearchBudget
+from .grid import START_MARK, CompiledMaze, trace_back
+from .instrument import ExpandHook
+
+# 未到达格子的距离
+_UNREACHED = 0xFFFFFFFF
+
+# 堆中每个 (优先级, h, 编号) 元组的估计内存
+_HEAP_ITEM_BYTES = 130
+
+# anytime 引擎的初始权重，以及认为已收敛到最优的阈值
+DEFAULT_ANYTIME_WEIGHT = 5.0
+_CONVERGED = 1.01
+
+
+class _Outcome:
+    """
+    一轮加权 A* 的结果
+    """
+
+    __slots__ = ("path", "cost", "lower_bound", "expanded", "discovered", "peak")
+
+    def __init__(self):
+        self.path: Optional[List[int]] = None
+        self.cost = 0
+        self.lower_bound = 0
+        self.expanded = 0
+        self.discovered = 1
+        self.peak = 1
+
+
+def _min_cost(compiled: CompiledMaze) -> int:
+    """
+    返回进入可通行格子的最小代价，用于缩放启发函数
+    """
+    costs = compiled.costs
+    if costs is None:
+        return 1
+    passable = compiled.passable
+    return min([cost for index, cost in enumerate(costs) if passable[index]], default=1)
+
+
+def _weighted_astar(
+    compiled: CompiledMaze,
+    weight: Optional[float],
+    on_expand: Optional[ExpandHook],
+    budget: Optional[SearchBudget],
+    offset: int = 0,
+) -> _Outcome:
+    """
+    执行一轮加权 A*，weight 为 None 时执行贪心最佳优先搜索
+
+    不重新打开已关闭的格子；启发函数一致时路径代价仍不超过最优的 weight 倍。
+    offset 为之前各轮已扩展的格子数，用于累计检查 max_expansions。
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    costs = compiled.costs
+    scale = _min_cost(compiled)
+    start, end = compiled.start, compiled.end
+    end_row, end_col = divmod(end, cols)
+    last_col = cols - 1
+    greedy = weight is None
+
+    dist = array("I", [_UNREACHED]) * size
+    dist[start] = 0
+    came = bytearray(size)
+    came[start] = START_MARK
+    closed = bytearray(size)
+    row, col = divmod(start, cols)
+    h = (abs(row - end_row) + abs(col - end_col)) * scale
+    heap: List[Tuple[float, int, int]] = [(h if greedy else weight * h, h, start)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    outcome = _Outcome()
+    expanded = 0
+    discovered = 1
+    peak = 1
+    check_at = 0 if budget is not None else size + 1
+
+    try:
+        while heap:
+            if len(heap) > peak:
+                peak = len(heap)
+            _, _, current = heappop(heap)
+            if closed[current]:
+                continue  # 过期的堆项
+            closed[current] = 1
+            if current == end:
+                outcome.path = trace_back(came, end, cols)
+                break
+            g = dist[current]
+            if expanded >= check_at:
+                check_at = expanded + budget.allowance(offset + expanded, discovered)
+            if on_expand is not None:
+                on_expand(current, g)
+            expanded += 1
+
+            row, col = divmod(current, cols)
+            for neighbor, mark, ok, h in (
+                (current - cols, 1, row > 0, row - 1 - end_row),
+                (current + cols, 2, current + cols < size, row + 1 - end_row),
+                (current - 1, 3, col != 0, col - 1 - end_col),
+                (current + 1, 4, col != last_col, col + 1 - end_col),
+            ):
+                if not ok or not passable[neighbor] or closed[neighbor]:
+                    continue
+                candidate = g + (costs[neighbor] if costs is not None else 1)
+                known = dist[neighbor]
+                if candidate < known:
+                    if known == _UNREACHED:
+                        discovered += 1
+                    dist[neighbor] = candidate
+                    came[neighbor] = mark
+                    # h 先存放变化的那一维坐标差，这里补上另一维
+                    if mark <= 2:
+                        h = (abs(h) + abs(col - end_col)) * scale
+                    else:
+                        h = (abs(row - end_row) + abs(h)) * scale
+                    if greedy:
+                        heappush(heap, (h, candidate, neighbor))
+                    else:
+                        heappush(heap, (candidate + weight * h, h, neighbor))
+    except BudgetExceeded as e:
+        # 换成包含之前各轮的累计统计
+        raise BudgetExceeded(e.reason, discovered, offset + expanded) from None
+
+    outcome.expanded = expanded
+    outcome.discovered = discovered
+    outcome.peak = peak
+    if outcome.path is not None:
+        outcome.cost = dist[end]
+        # 起点的启发值不高估，是最优代价的下界
+        row, col = divmod(start, cols)
+        outcome.lower_bound = (abs(row - end_row) + abs(col - end_col)) * scale
+    return outcome
+
+
+def _bound(cost: int, lower_bound: int, weight: Optional[float]) -> Optional[float]:
+    """
+    计算次优上界: 权重 ε 与 代价 / 最优代价下界 中较小的一个，至少为 1
+    """
+    if cost == 0 or lower_bound >= cost or weight == 1.0:
+        return 1.0
+    candidates = [cost / lower_bound] if lower_bound else []
+    if weight is not None:
+        candidates.append(weight)
+    return max(1.0, min(candidates)) if candidates else None
+
+
+def _record(stats: Dict, outcome: _Outcome, size: int, bound: Optional[float]) -> None:
+    stats.update(
+        {
+            "visited_cells": outcome.discovered,
+            "nodes_expanded": outcome.expanded,
+            "peak_frontier": outcome.peak,
+            # 可通行、方向标记、关闭标记 + 距离数组 + 堆
+            "peak_memory_estimate": 3 * size
+            + 4 * size
+            + outcome.peak * _HEAP_ITEM_BYTES,
+            "suboptimality_bound": bound,
+        }
+    )
+
+
+def _check_weight(weight: float) -> float:
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+        raise ValueError("weight 必须是数字")
+    if not weight >= 1:
+        raise ValueError("weight 不能小于 1")
+    return float(weight)
+
+
+def astar_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    weight: float = 1.0,
+    **options,
+) -> Optional[List[int]]:
+    """
+    加权 A* 搜索引擎
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、peak_frontier、
+        peak_memory_estimate 和 suboptimality_bound
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算
+    weight (float): 启发函数权重 ε (≥ 1)，路径代价不超过最优的 ε 倍
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    ValueError: 如果 weight 小于 1
+    BudgetExceeded: 如果超出搜索预算
+    """
+    weight = _check_weight(weight)
+    outcome = _weighted_astar(compiled, weight, on_expand, budget)
+    bound = None
+    if outcome.path is not None:
+        bound = _bound(outcome.cost, outcome.lower_bound, weight)
+    _record(stats, outcome, compiled.size, bound)
+    stats["weight"] = weight
+    return outcome.path
+
+
+def greedy_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    贪心最佳优先搜索引擎
+
+    总是扩展离终点 (曼哈顿距离) 最近的格子，通常只访问很少的格子，
+    但路径可能远长于最短路径，suboptimality_bound 只能由 路径代价 / 起点的启发值 给出。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典 (同 astar_search)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    outcome = _weighted_astar(compiled, None, on_expand, budget)
+    bound = None
+    if outcome.path is not None:
+        bound = _bound(outcome.cost, outcome.lower_bound, None)
+    _record(stats, outcome, compiled.size, bound)
+    return outcome.path
+
+
+def anytime_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    weight: float = DEFAULT_ANYTIME_WEIGHT,
+    **options,
+) -> Optional[List[int]]:
+    """
+    anytime 加权 A* 搜索引擎
+
+    第一轮使用权重 weight 快速找到路径，之后每轮把 ε - 1 减半并重新搜索，
+    保留代价最小的路径。次优上界降到 1 (已证明最优) 或超出搜索预算时停止；
+    已有路径时超出预算不算失败，statistics 中 anytime_stopped 记录停止原因。
+    nodes_expanded 为所有轮次的累计值。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，除 astar_search 的字段外写入
+        anytime_iterations (完成的轮数) 和 weight (最后完成一轮的权重)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算，通常设置 timeout 或 deadline
+    weight (float): 第一轮的权重 ε (≥ 1)
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    ValueError: 如果 weight 小于 1
+    BudgetExceeded: 如果找到第一条路径之前就超出预算
+    """
+    weight = _check_weight(weight)
+    best: Optional[_Outcome] = None
+    bound: Optional[float] = None
+    expanded = 0
+    iterations = 0
+    while True:
+        try:
+            outcome = _weighted_astar(compiled, weight, on_expand, budget, expanded)
+        except BudgetExceeded as e:
+            if best is None:
+                raise
+            stats["anytime_stopped"] = e.reason
+            break
+        iterations += 1
+        expanded += outcome.expanded
+        if outcome.path is None:
+            best = outcome
+            break
+        if best is None or outcome.cost < best.cost:
+            best = outcome
+        # 权重逐轮减小，本轮权重即已完成各轮中的最小权重
+        bound = _bound(best.cost, outcome.lower_bound, weight)
+        stats["weight"] = weight
+        if weight <= 1.0 or (bound is not None and bound <= 1.0):
+            break
+        weight = 1.0 + (weight - 1.0) / 2
+        if weight < _CONVERGED:
+            weight = 1.0
+
+    _record(stats, best, compiled.size, bound)
+    stats["nodes_expanded"] = expanded
+    stats["anytime_iterations"] = iterations
+    return best.path
@@ -0,0 +1,81 @@
+"""
+求解过程插桩模块
+记录 bfs_solve 各阶段耗时，并转发扩展/阶段回调
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+# 阶段回调: (阶段名称, 耗时秒数)
+PhaseHook = Callable[[str, float], None]
+# 扩展回调: (格子编号, 距离)
+ExpandHook = Callable[[int, int], None]
+
+# bfs_solve 的阶段，按执行顺序排列
+PHASES = ("validate", "positions", "compile", "search", "result")
+
+
+class Instrumentation:
+    """
+    求解插桩
+
+    通过 MazeSolver.enable_instrumentation() 启用。未启用时 bfs_solve
+    只在每个阶段边界做一次 None 判断，搜索循环内部没有任何额外开销。
+    """
+
+    def __init__(
+        self,
+        on_expand: Optional[ExpandHook] = None,
+        on_phase: Optional[PhaseHook] = None,
+    ):
+        """
+        初始化插桩
+
+        参数:
+        on_expand (Optional[ExpandHook]): 格子被扩展前的回调 (格子编号, 距离)
+        on_phase (Optional[PhaseHook]): 每个阶段结束时的回调 (阶段名称, 耗时秒数)
+        """
+        self.on_expand = on_expand
+        self.on_phase = on_phase
+        self.timings: Dict[str, float] = {}
+        self._began = 0.0
+        self._last = 0.0
+
+    def begin(self) -> None:
+        """
+        开始一次求解计时
+        """
+        self.timings = {}
+        self._began = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """
+        结束一个阶段并记录耗时
+
+        参数:
+        phase (str): 阶段名称
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.timings[phase] = elapsed
+        self._last = now
+        if self.on_phase is not None:
+            self.on_phase(phase, elapsed)
+
+    def report(self) -> Dict:
+        """
+        返回写入 statistics 的插桩信息
+
+        返回:
+        Dict: timings (各阶段秒数) 和 total_time (总秒数)
+        """
+        return {
+            "timings": dict(self.timings),
+            "total_time": self._last - self._began,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Instrumentation(on_expand={self.on_expand!r}, "
+            f"on_phase={self.on_phase!r})"
+        )
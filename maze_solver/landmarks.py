@@ -0,0 +1,412 @@
+"""
+地标 (ALT) 索引模块
+
+对同一个静态迷宫反复查询起点/终点时，预先选择 k 个地标并计算从每个地标出发的
+BFS 步数数组 (array('I'))。由三角不等式，任意两个格子 v、t 之间的步数不小于
+|d_L(t) - d_L(v)|，取所有地标中的最大值 (以及曼哈顿距离) 作为 A* 的启发函数，
+比单纯的曼哈顿距离紧得多，在墙壁多、绕路多的迷宫中大幅减少扩展的格子数。
+
+    - 地标按最远点策略选择: 第一个是离起点最远的格子，之后每个都是离已选地标最远的格子
+    - 每次查询只使用对该起点/终点下界最大的 active 个地标
+    - 起点和终点位于不同连通区域时直接判定无法到达 (某个地标能到达其中一个而不能到达另一个)
+
+索引可以保存到磁盘，与迷宫文件放在一起，加载时校验迷宫尺寸和可通行数组的 CRC32。
+
+使用方法:
+    compiled = solver.compile(maze)
+    index = LandmarkIndex.build(compiled, count=8)
+    index.save("maze.landmarks")
+    index = LandmarkIndex.load("maze.landmarks", compiled)
+    result = solver.solve_compiled(compiled.with_endpoints(s, t), "alt", landmarks=index)
+"""
+
+import heapq
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .budget import SearchBudget
+from .grid import START_MARK, CompiledMaze, trace_back
+from .informed import _min_cost
+from .instrument import ExpandHook
+from .paths import distance_field
+
+# 距离数组中未到达格子的值 (array('i') 中的 -1 按 array('I') 解释)
+UNREACHED = 0xFFFFFFFF
+
+DEFAULT_LANDMARKS = 8
+DEFAULT_ACTIVE = 4
+
+_MAGIC = b"MZLM"
+_VERSION = 1
+# 魔数、版本、保留、行数、列数、地标数、可通行数组 CRC32
+_HEADER = struct.Struct("<4sHHIIII")
+
+# 堆项中 h 所占的范围 (h 不超过 array('I') 的最大值)
+_SPAN = 1 << 32
+
+# 堆中每个整数项的估计内存
+_HEAP_ITEM_BYTES = 48
+
+
+def _checksum(compiled: CompiledMaze) -> int:
+    return zlib.crc32(bytes(compiled.passable))
+
+
+def _unsigned(dist: array) -> array:
+    """
+    把 distance_field 的 array('i') 按字节重新解释为 array('I')，-1 变为 UNREACHED
+    """
+    result = array("I")
+    result.frombytes(dist.tobytes())
+    return result
+
+
+class LandmarkIndex:
+    """
+    一个迷宫的地标距离索引
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        landmarks: Sequence[int],
+        distances: Sequence[array],
+        checksum: int,
+    ):
+        """
+        参数:
+        rows (int): 迷宫行数
+        cols (int): 迷宫列数
+        landmarks (Sequence[int]): 地标格子编号
+        distances (Sequence[array]): 每个地标到所有格子的步数 (array('I')，无法到达为 UNREACHED)
+        checksum (int): 可通行数组的 CRC32
+        """
+        self.rows = rows
+        self.cols = cols
+        self.landmarks = list(landmarks)
+        self.distances = list(distances)
+        self.checksum = checksum
+
+    @classmethod
+    def build(
+        cls, compiled: CompiledMaze, count: int = DEFAULT_LANDMARKS
+    ) -> "LandmarkIndex":
+        """
+        按最远点策略选择地标并计算距离数组
+
+        需要 count + 1 次 BFS，内存为 4 * count * 格子数 字节。
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫
+        count (int): 地标数量
+
+        返回:
+        LandmarkIndex: 地标索引
+
+        异常:
+        ValueError: 如果 count 不是正整数或迷宫没有可通行格子
+        """
+        if not isinstance(count, int) or count <= 0:
+            raise ValueError("地标数量必须是正整数")
+        origin = compiled.start
+        if origin is None or not compiled.passable[origin]:
+            origin = bytes(compiled.passable).find(1)
+            if origin < 0:
+                raise ValueError("迷宫中没有可通行的格子")
+
+        # nearest[v] 为 v 到已选地标的最小步数，第一个地标取离起点最远的格子
+        nearest = _unsigned(distance_field(compiled, origin))
+        landmarks: List[int] = []
+        distances: List[array] = []
+        for _ in range(count):
+            farthest = max(filter(UNREACHED.__ne__, nearest), default=0)
+            if farthest == 0 and landmarks:
+                break  # 连通区域中的格子都已是地标
+            landmark = nearest.index(farthest)
+            dist = _unsigned(distance_field(compiled, landmark))
+            landmarks.append(landmark)
+            distances.append(dist)
+            nearest = array("I", map(min, nearest, dist))
+        return cls(
+            compiled.rows, compiled.cols, landmarks, distances, _checksum(compiled)
+        )
+
+    def check(self, compiled: CompiledMaze, full: bool = False) -> None:
+        """
+        检查索引是否属于该迷宫
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫
+        full (bool): 是否同时校验可通行数组的 CRC32 (需要遍历整个迷宫)
+
+        异常:
+        ValueError: 如果尺寸或校验和不符
+        """
+        if (compiled.rows, compiled.cols) != (self.rows, self.cols):
+            raise ValueError(
+                f"地标索引的尺寸 {self.rows}x{self.cols} 与迷宫 "
+                f"{compiled.rows}x{compiled.cols} 不符"
+            )
+        if full and _checksum(compiled) != self.checksum:
+            raise ValueError("地标索引与迷宫的可通行格子不符")
+
+    def lower_bound(self, source: int, target: int) -> Optional[int]:
+        """
+        两个格子之间步数的下界
+
+        参数:
+        source (int): 格子编号
+        target (int): 格子编号
+
+        返回:
+        Optional[int]: 步数下界；可以确定两个格子不连通时返回 None
+        """
+        best = 0
+        for dist in self.distances:
+            a, b = dist[source], dist[target]
+            if (a == UNREACHED) != (b == UNREACHED):
+                return None
+            if a != UNREACHED and abs(a - b) > best:
+                best = abs(a - b)
+        return best
+
+    def active(self, source: int, target: int, limit: int) -> List[Tuple[array, int]]:
+        """
+        选择对该查询下界最大的 limit 个地标
+
+        返回:
+        List[Tuple[array, int]]: (距离数组, 终点处的距离) 列表
+        """
+        candidates = []
+        for dist in self.distances:
+            a, b = dist[source], dist[target]
+            if a != UNREACHED and b != UNREACHED:
+                candidates.append((abs(a - b), dist, b))
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [(dist, b) for _, dist, b in candidates[:limit]]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        距离数组占用的字节数
+        """
+        return sum(dist.itemsize * len(dist) for dist in self.distances)
+
+    def save(self, path: str) -> None:
+        """
+        保存到文件 (小端字节序)
+
+        参数:
+        path (str): 文件路径，通常放在迷宫文件旁边
+        """
+        with open(path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC,
+                    _VERSION,
+                    0,
+                    self.rows,
+                    self.cols,
+                    len(self.landmarks),
+                    self.checksum,
+                )
+            )
+            for values in [array("I", self.landmarks)] + self.distances:
+                if sys.byteorder == "big":
+                    values = array("I", values)
+                    values.byteswap()
+                values.tofile(f)
+
+    @classmethod
+    def load(
+        cls, path: str, compiled: Optional[CompiledMaze] = None
+    ) -> "LandmarkIndex":
+        """
+        从文件加载
+
+        参数:
+        path (str): 文件路径
+        compiled (Optional[CompiledMaze]): 提供时校验尺寸和可通行数组的 CRC32
+
+        返回:
+        LandmarkIndex: 地标索引
+
+        异常:
+        ValueError: 如果文件格式无效或与迷宫不符
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError("地标索引文件不完整")
+            magic, version, _, rows, cols, count, checksum = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError("不是地标索引文件")
+            if version != _VERSION:
+                raise ValueError(f"不支持的地标索引版本 {version}")
+            arrays = []
+            try:
+                for length in [count] + [rows * cols] * count:
+                    values = array("I")
+                    values.fromfile(f, length)
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    arrays.append(values)
+            except EOFError:
+                raise ValueError("地标索引文件不完整") from None
+        index = cls(rows, cols, arrays[0], arrays[1:], checksum)
+        if compiled is not None:
+            index.check(compiled, full=True)
+        return index
+
+    def __repr__(self) -> str:
+        return (
+            f"LandmarkIndex(size={self.rows}x{self.cols}, "
+            f"landmarks={len(self.landmarks)})"
+        )
+
+
+def _record(
+    stats: Dict, size: int, discovered: int, expanded: int, peak: int, used: int
+) -> None:
+    stats.update(
+        {
+            "visited_cells": discovered,
+            "nodes_expanded": expanded,
+            "peak_frontier": peak,
+            # 可通行、方向标记、关闭标记 + 距离数组 + 堆 (不含索引本身)
+            "peak_memory_estimate": 3 * size + 4 * size + peak * _HEAP_ITEM_BYTES,
+            "landmarks_used": used,
+        }
+    )
+
+
+def alt_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    landmarks: Optional[LandmarkIndex] = None,
+    active: int = DEFAULT_ACTIVE,
+    **options,
+) -> Optional[List[int]]:
+    """
+    使用地标下界作为启发函数的 A* 搜索引擎 (ALT)
+
+    启发函数为 max(曼哈顿距离, 各活动地标的 |d_L(终点) - d_L(v)|) 乘以最小格子代价，
+    不高估且一致，返回的路径是最短 (最小代价) 路径。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、peak_frontier、
+        peak_memory_estimate 和 landmarks_used
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算
+    landmarks (Optional[LandmarkIndex]): 该迷宫的地标索引
+    active (int): 每次查询使用的地标数量上限
+
+    返回:
+    Optional[List[int]]: 格子编号路径，无法到达时返回None
+
+    异常:
+    ValueError: 如果没有提供地标索引或索引与迷宫尺寸不符
+    BudgetExceeded: 如果超出搜索预算
+    """
+    if landmarks is None:
+        raise ValueError("alt 引擎需要 landmarks 参数 (见 LandmarkIndex.build)")
+    landmarks.check(compiled)
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    costs = compiled.costs
+    start, end = compiled.start, compiled.end
+    if landmarks.lower_bound(start, end) is None:
+        # 起点和终点不在同一个连通区域
+        _record(stats, size, 1, 0, 1, 0)
+        return None
+
+    pairs = landmarks.active(start, end, active)
+    scale = _min_cost(compiled)
+    end_row, end_col = divmod(end, cols)
+    last_col = cols - 1
+
+    # 堆项编码为单个整数 ((f * _SPAN + h) * size + 编号)，比元组比较更快；
+    # f 相同时 h 小 (离终点近) 的格子先出堆
+    dist = array("I", [UNREACHED]) * size
+    dist[start] = 0
+    came = bytearray(size)
+    came[start] = START_MARK
+    closed = bytearray(size)
+    row, col = divmod(start, cols)
+    h = abs(row - end_row) + abs(col - end_col)
+    for table, target in pairs:
+        bound = table[start] - target
+        if bound < 0:
+            bound = -bound
+        if bound > h:
+            h = bound
+    h *= scale
+    heap: List[int] = [(h * _SPAN + h) * size + start]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    path: Optional[List[int]] = None
+    expanded = 0
+    discovered = 1
+    peak = 1
+    check_at = 0 if budget is not None else size + 1
+
+    while heap:
+        if len(heap) > peak:
+            peak = len(heap)
+        current = heappop(heap) % size
+        if closed[current]:
+            continue  # 过期的堆项
+        closed[current] = 1
+        if current == end:
+            path = trace_back(came, end, cols)
+            break
+        g = dist[current]
+        if expanded >= check_at:
+            check_at = expanded + budget.allowance(expanded, discovered)
+        if on_expand is not None:
+            on_expand(current, g)
+        expanded += 1
+
+        row, col = divmod(current, cols)
+        for neighbor, mark, ok, h in (
+            (current - cols, 1, row > 0, abs(row - 1 - end_row) + abs(col - end_col)),
+            (
+                current + cols,
+                2,
+                current + cols < size,
+                abs(row + 1 - end_row) + abs(col - end_col),
+            ),
+            (current - 1, 3, col != 0, abs(row - end_row) + abs(col - 1 - end_col)),
+            (
+                current + 1,
+                4,
+                col != last_col,
+                abs(row - end_row) + abs(col + 1 - end_col),
+            ),
+        ):
+            if not ok or not passable[neighbor] or closed[neighbor]:
+                continue
+            candidate = g + (costs[neighbor] if costs is not None else 1)
+            known = dist[neighbor]
+            if candidate < known:
+                if known == UNREACHED:
+                    discovered += 1
+                dist[neighbor] = candidate
+                came[neighbor] = mark
+                for table, target in pairs:
+                    bound = table[neighbor] - target
+                    if bound < 0:
+                        bound = -bound
+                    if bound > h:
+                        h = bound
+                h *= scale
+                heappush(heap, ((candidate + h) * _SPAN + h) * size + neighbor)
+
+    _record(stats, size, discovered, expanded, peak, len(pairs))
+    return path
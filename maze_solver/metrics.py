@@ -0,0 +1,435 @@
+"""
+指标模块
+
+进程内的指标注册表，支持计数器、仪表和直方图，可输出为 Prometheus 文本格式，
+不依赖任何第三方库。
+
+SolverMetrics 定义了求解器使用的指标:
+    - maze_solver_solves_total{outcome}: 按结果统计的求解次数
+      (found / no_path / missing_start / missing_end / budget_exceeded)
+    - maze_solver_solve_seconds{engine}: 每个引擎的求解耗时直方图
+    - maze_solver_visited_cells{engine}: 每个引擎的访问格子数直方图
+    - maze_solver_cache_requests_total{cache, result}: 缓存命中/未命中次数
+    - maze_solver_cache_hit_ratio{cache}: 缓存命中率
+
+使用方法:
+    solver.enable_metrics()          # 使用全局注册表 REGISTRY
+    ...
+    print(REGISTRY.render())         # Prometheus 文本
+"""
+
+import abc
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# 默认的延迟直方图桶 (秒)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+# 默认的格子数直方图桶
+CELL_BUCKETS = tuple(10**k for k in range(1, 9))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(abc.ABC):
+    """
+    指标基类，子类实现 samples()
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        try:
+            key = tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            key = ()
+        if len(key) != len(labels) or len(key) != len(self.labelnames):
+            raise ValueError(
+                f"指标 {self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}"
+            )
+        return key
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """
+        返回 (样本名, 标签文本, 值) 序列
+        """
+
+    def render(self) -> List[str]:
+        """
+        输出该指标的 Prometheus 文本行
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """
+    单调递增计数器
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        增加计数
+
+        参数:
+        amount (float): 增加量，必须非负
+        **labels: 标签值
+
+        异常:
+        ValueError: 如果增加量为负或标签不匹配
+        """
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        """
+        读取当前计数
+        """
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """
+    可任意设置的仪表
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        设置仪表值
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels: str) -> float:
+        """
+        读取当前值
+        """
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """
+    累积桶直方图
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数 (非累积，最后一个为 +Inf), 总和, 总数]
+        self._values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        记录一个观测值
+        """
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][slot] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def get_count(self, **labels: str) -> int:
+        """
+        读取观测次数
+        """
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(
+                (k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()
+            )
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    同名指标只会创建一次，重复注册返回已有对象。
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.solver_metrics: Optional["SolverMetrics"] = None
+
+    def _register(self, cls: type, name: str, *args, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"指标 {name} 已注册为 {metric.kind}")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """
+        获取或创建计数器
+        """
+        return self._register(Counter, name, documentation, labelnames)  # type: ignore
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """
+        获取或创建仪表
+        """
+        return self._register(Gauge, name, documentation, labelnames)  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        获取或创建直方图
+        """
+        return self._register(  # type: ignore
+            Histogram, name, documentation, labelnames, buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """
+        按名称获取指标
+        """
+        return self._metrics.get(name)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        注册在输出前调用的回调，用于刷新派生指标（例如命中率）
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        输出 Prometheus 文本格式
+
+        返回:
+        str: text/plain; version=0.0.4 格式的指标文本
+        """
+        for collector in list(self._collectors):
+            collector()
+        lines: List[str] = []
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 全局默认注册表
+REGISTRY = MetricsRegistry()
+
+# 求解结果分类
+OUTCOMES = ("found", "no_path", "missing_start", "missing_end", "budget_exceeded")
+
+
+class SolverMetrics:
+    """
+    求解器指标
+
+    记录一次求解只需一次计数器加一和两次直方图观测。
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        在注册表上创建（或复用）求解器指标
+
+        参数:
+        registry (Optional[MetricsRegistry]): 指标注册表，默认使用全局 REGISTRY
+        """
+        self.registry = registry if registry is not None else REGISTRY
+        self.solves = self.registry.counter(
+            "maze_solver_solves_total", "Total solves by outcome.", ("outcome",)
+        )
+        self.latency = self.registry.histogram(
+            "maze_solver_solve_seconds",
+            "Solve latency in seconds by engine.",
+            ("engine",),
+            LATENCY_BUCKETS,
+        )
+        self.visited = self.registry.histogram(
+            "maze_solver_visited_cells",
+            "Visited cells per solve by engine.",
+            ("engine",),
+            CELL_BUCKETS,
+        )
+        self.cache_requests = self.registry.counter(
+            "maze_solver_cache_requests_total",
+            "Cache lookups by cache and result.",
+            ("cache", "result"),
+        )
+        self.cache_ratio = self.registry.gauge(
+            "maze_solver_cache_hit_ratio", "Cache hit ratio by cache.", ("cache",)
+        )
+        self._caches: Dict[str, None] = {}
+        self.registry.add_collector(self._update_ratios)
+
+    def record_solve(self, result: Dict, seconds: float) -> None:
+        """
+        记录一次求解
+
+        参数:
+        result (Dict): bfs_solve 返回的结果
+        seconds (float): 求解耗时
+        """
+        stats = result["statistics"]
+        engine = stats.get("engine", "bfs")
+        if result["found"]:
+            outcome = "found"
+        elif stats.get("start_position") is None:
+            outcome = "missing_start"
+        elif stats.get("end_position") is None:
+            outcome = "missing_end"
+        elif "budget_exceeded" in stats:
+            outcome = "budget_exceeded"
+        else:
+            outcome = "no_path"
+        self.solves.inc(outcome=outcome)
+        self.latency.observe(seconds, engine=engine)
+        self.visited.observe(stats.get("visited_cells", 0), engine=engine)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """
+        记录一次缓存查询
+
+        参数:
+        cache (str): 缓存名称
+        hit (bool): 是否命中
+        """
+        self._caches[cache] = None
+        self.cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+    def _update_ratios(self) -> None:
+        for cache in list(self._caches):
+            hits = self.cache_requests.get(cache=cache, result="hit")
+            misses = self.cache_requests.get(cache=cache, result="miss")
+            total = hits + misses
+            self.cache_ratio.set(hits / total if total else 0.0, cache=cache)
+
+
+def get_solver_metrics(registry: Optional[MetricsRegistry] = None) -> SolverMetrics:
+    """
+    获取绑定在注册表上的求解器指标，每个注册表只创建一次
+
+    参数:
+    registry (Optional[MetricsRegistry]): 指标注册表，默认使用全局 REGISTRY
+
+    返回:
+    SolverMetrics: 求解器指标
+    """
+    registry = registry if registry is not None else REGISTRY
+    with registry._lock:
+        metrics = registry.solver_metrics
+    if metrics is None:
+        metrics = SolverMetrics(registry)
+        with registry._lock:
+            if registry.solver_metrics is None:
+                registry.solver_metrics = metrics
+            metrics = registry.solver_metrics
+    return metrics
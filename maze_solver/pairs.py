@@ -0,0 +1,275 @@
+"""
+多起点/终点批量求解模块
+
+多智能体场景需要在同一个网格上求解成百上千个 (起点, 终点) 对。逐对调用
+bfs_solve 需要把符号写进迷宫副本，并且每次都重新搜索。本模块按公共端点分组:
+
+    - 按起点分组: 每个不同的起点只做一次搜索，得到到达该组所有终点的最短路径树
+    - 按终点分组: 每个不同的终点做一次反向搜索，从各起点沿树回溯到终点
+    - "auto": 选择不同端点较少的一侧
+
+搜索在该组所有端点都已确定最短距离后立即停止。无地形代价时使用逐层 BFS，
+按起点分组得到的路径与 bfs_solve 完全相同；有地形代价时使用 Dijkstra，
+反向搜索时每条边的代价是离开的格子 (即正向进入的格子) 的代价。
+"""
+
+import heapq
+from array import array
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .grid import START_MARK, CompiledMaze, trace_back
+from .structs import Code, Symbols
+
+GROUPS = ("auto", "source", "target")
+
+# 未到达格子的距离
+_UNREACHED = 0xFFFFFFFF
+
+
+def cell_index(compiled: CompiledMaze, position: Sequence[int]) -> int:
+    """
+    坐标转换为格子编号并检查是否可通行
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    position (Sequence[int]): (行, 列) 坐标
+
+    返回:
+    int: 格子编号
+
+    异常:
+    ValueError: 如果坐标格式错误、越界或位于墙上
+    """
+    try:
+        row, col = position
+    except (TypeError, ValueError):
+        raise ValueError(f"坐标 {position!r} 必须是 (行, 列)") from None
+    if not (isinstance(row, int) and isinstance(col, int)):
+        raise ValueError(f"坐标 {position!r} 必须是整数")
+    if not (0 <= row < compiled.rows and 0 <= col < compiled.cols):
+        raise ValueError(f"坐标 {(row, col)} 超出迷宫范围")
+    index = row * compiled.cols + col
+    if not compiled.passable[index]:
+        raise ValueError(f"坐标 {(row, col)} 不可通行")
+    return index
+
+
+def _bfs_tree(
+    compiled: CompiledMaze, root: int, targets: Sequence[int]
+) -> Tuple[bytearray, int]:
+    """
+    从 root 逐层扩展，直到所有 targets 都被发现
+
+    返回:
+    Tuple[bytearray, int]: (方向标记数组, 已访问格子数)
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    last_col = cols - 1
+    came = bytearray(size)
+    came[root] = START_MARK
+    remaining = list(targets)
+    frontier = [root]
+    discovered = 1
+    while frontier:
+        # 已发现的端点从末尾弹出，列表为空即全部发现
+        while remaining and came[remaining[-1]]:
+            remaining.pop()
+        if not remaining:
+            break
+        next_level: List[int] = []
+        append = next_level.append
+        for current in frontier:
+            neighbor = current - cols
+            if neighbor >= 0 and passable[neighbor] and not came[neighbor]:
+                came[neighbor] = 1
+                append(neighbor)
+            neighbor = current + cols
+            if neighbor < size and passable[neighbor] and not came[neighbor]:
+                came[neighbor] = 2
+                append(neighbor)
+            col = current % cols
+            if col and passable[current - 1] and not came[current - 1]:
+                came[current - 1] = 3
+                append(current - 1)
+            if col != last_col and passable[current + 1] and not came[current + 1]:
+                came[current + 1] = 4
+                append(current + 1)
+        discovered += len(next_level)
+        frontier = next_level
+    return came, discovered
+
+
+def _dijkstra_tree(
+    compiled: CompiledMaze, root: int, targets: Sequence[int], reverse: bool
+) -> Tuple[bytearray, int]:
+    """
+    从 root 执行 Dijkstra，直到所有 targets 都已确定最小代价
+
+    reverse 为 True 时计算各格子到 root 的代价: 从 current 回到 neighbor 的边
+    代价为 costs[current]。
+
+    返回:
+    Tuple[bytearray, int]: (方向标记数组, 已访问格子数)
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    costs = compiled.costs
+    last_col = cols - 1
+    dist = array("I", [_UNREACHED]) * size
+    dist[root] = 0
+    came = bytearray(size)
+    came[root] = START_MARK
+    closed = bytearray(size)
+    wanted = set(targets)
+    wanted.discard(root)
+    heap = [(0, root)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    discovered = 1
+    while heap and wanted:
+        d, current = heappop(heap)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        wanted.discard(current)
+        row, col = divmod(current, cols)
+        leave = costs[current]
+        for neighbor, mark, ok in (
+            (current - cols, 1, row > 0),
+            (current + cols, 2, current + cols < size),
+            (current - 1, 3, col != 0),
+            (current + 1, 4, col != last_col),
+        ):
+            if not ok or not passable[neighbor] or closed[neighbor]:
+                continue
+            candidate = d + (leave if reverse else costs[neighbor])
+            known = dist[neighbor]
+            if candidate < known:
+                if known == _UNREACHED:
+                    discovered += 1
+                dist[neighbor] = candidate
+                came[neighbor] = mark
+                heappush(heap, (candidate, neighbor))
+    return came, discovered
+
+
+def group_pairs(
+    pairs: Sequence[Optional[Tuple[int, int]]], group: str = "auto"
+) -> Tuple[bool, Dict[int, List[int]]]:
+    """
+    按公共端点分组
+
+    参数:
+    pairs (Sequence[Optional[Tuple[int, int]]]): (起点编号, 终点编号)，无效的对为 None
+    group (str): "source"、"target" 或 "auto" (不同端点较少的一侧，相同时按起点)
+
+    返回:
+    Tuple[bool, Dict[int, List[int]]]: (是否按终点分组, 树根 -> 在 pairs 中的位置列表)
+
+    异常:
+    ValueError: 如果 group 无效
+    """
+    if group not in GROUPS:
+        raise ValueError(f"未知的分组方式 '{group}'，可选: {', '.join(GROUPS)}")
+    valid = [pair for pair in pairs if pair is not None]
+    if group == "auto":
+        sources = len({source for source, _ in valid})
+        targets = len({target for _, target in valid})
+        reverse = targets < sources
+    else:
+        reverse = group == "target"
+    groups: Dict[int, List[int]] = {}
+    for position, pair in enumerate(pairs):
+        if pair is not None:
+            groups.setdefault(pair[1] if reverse else pair[0], []).append(position)
+    return reverse, groups
+
+
+def iter_pair_paths(
+    compiled: CompiledMaze,
+    pairs: Sequence[Optional[Tuple[int, int]]],
+    group: str = "auto",
+) -> Iterator[Tuple[int, Optional[List[int]], Dict]]:
+    """
+    按组搜索并回溯每一对的最短路径
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫 (不需要起点和终点)
+    pairs (Sequence[Optional[Tuple[int, int]]]): (起点编号, 终点编号)，无效的对为 None
+    group (str): 分组方式 (见 group_pairs)
+
+    返回:
+    Iterator[Tuple[int, Optional[List[int]], Dict]]: (在 pairs 中的位置, 格子编号路径或 None,
+        该组共享的统计信息 group、tree_root、tree_pairs、visited_cells)，按组依次产出
+    """
+    reverse, groups = group_pairs(pairs, group)
+    cols = compiled.cols
+    for root, positions in groups.items():
+        others = [pairs[position][0 if reverse else 1] for position in positions]
+        if compiled.costs is None:
+            came, visited = _bfs_tree(compiled, root, others)
+        else:
+            came, visited = _dijkstra_tree(compiled, root, others, reverse)
+        stats = {
+            "group": "target" if reverse else "source",
+            "tree_root": compiled.position(root),
+            "tree_pairs": len(positions),
+            "visited_cells": visited,
+        }
+        for position, other in zip(positions, others):
+            if not came[other]:
+                yield position, None, stats
+                continue
+            path = trace_back(came, other, cols)
+            if reverse:
+                path.reverse()
+            yield position, path, stats
+
+
+def solve_pairs(
+    maze: Union[List[List[str]], CompiledMaze],
+    pairs: Iterable[Tuple[Tuple[int, int], Tuple[int, int]]],
+    code: Optional[Union[Code, Tuple[str, str, str, str]]] = None,
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]] = None,
+    group: str = "auto",
+    output: Optional[Collection[str]] = None,
+) -> List[Dict]:
+    """
+    在同一个迷宫上批量求解多个 (起点, 终点) 对
+
+    参数:
+    maze (Union[List[List[str]], CompiledMaze]): 二维迷宫数组或编译后的迷宫
+    pairs (Iterable): ((起点行, 起点列), (终点行, 终点列)) 序列
+    code (Optional[Union[Code, Tuple[str, str, str, str]]]): 方向编码，默认 U/D/L/R
+    symbols (Optional[Union[Symbols, Tuple[str, str, str, str]]]): 迷宫符号，
+        默认 ("0", "1", "*", "#")；Symbols 中的 costs 启用地形代价
+    group (str): 分组方式 ("auto"、"source" 或 "target")
+    output (Optional[Collection[str]]): 路径输出格式 (见 bfs_solve)
+
+    返回:
+    List[Dict]: 按输入顺序排列的结果 (见 MazeSolver.solve_pairs)
+
+    异常:
+    ValueError: 如果迷宫无效或 group 未知
+    """
+    # 延迟导入，避免与 core 模块循环依赖
+    from .core import MazeSolver
+
+    solver = MazeSolver()
+    if isinstance(symbols, Symbols):
+        solver.set_symbols(symbols)
+    elif symbols is not None:
+        solver.set_symbols(*symbols)
+    if code is not None:
+        solver.set_code(*code)
+    return solver.solve_pairs(pairs, maze, group, output)
@@ -0,0 +1,326 @@
+"""
+多路径模块
+
+在编译迷宫上枚举最短路径和前 k 短路径，全部以生成器形式惰性产出，
+调用者可以随时停止。
+
+    - iter_shortest_paths: 沿 BFS 分层有向图枚举所有最短路径 (按步数，忽略地形代价)
+    - iter_k_shortest: Yen 算法，按总代价从小到大产出前 k 条无环路径
+    - count_shortest_paths: 在 BFS 距离层上动态规划统计最短路径条数，不枚举路径
+"""
+
+import heapq
+from array import array
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .grid import DIRECTION_NAMES, CompiledMaze, index_path_to_moves
+
+# 距离数组中未到达格子的值
+UNREACHED = -1
+
+
+def distance_field(compiled: CompiledMaze, source: int) -> array:
+    """
+    计算从一个格子出发到所有格子的步数
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    source (int): 出发格子编号
+
+    返回:
+    array: 长度为格子数的 array('i')，无法到达的格子为 -1
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    last_col = cols - 1
+    dist = array("i", [UNREACHED]) * size
+    dist[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_level: List[int] = []
+        append = next_level.append
+        for current in frontier:
+            neighbor = current - cols
+            if neighbor >= 0 and passable[neighbor] and dist[neighbor] < 0:
+                dist[neighbor] = depth
+                append(neighbor)
+            neighbor = current + cols
+            if neighbor < size and passable[neighbor] and dist[neighbor] < 0:
+                dist[neighbor] = depth
+                append(neighbor)
+            col = current % cols
+            if col and passable[current - 1] and dist[current - 1] < 0:
+                dist[current - 1] = depth
+                append(current - 1)
+            if col != last_col and passable[current + 1] and dist[current + 1] < 0:
+                dist[current + 1] = depth
+                append(current + 1)
+        frontier = next_level
+    return dist
+
+
+def count_shortest_paths(compiled: CompiledMaze, modulus: Optional[int] = None) -> int:
+    """
+    统计最短路径 (按步数) 的条数
+
+    按层广度优先扩展，每个格子的路径数等于上一层所有相邻格子的路径数之和，
+    到达终点所在层后停止。时间和内存都是 O(格子数)，不会枚举任何路径。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    modulus (Optional[int]): 取模的模数，默认使用 Python 大整数精确计算
+
+    返回:
+    int: 最短路径条数 (或其对 modulus 取模的结果)，无法到达时为 0
+
+    异常:
+    ValueError: 如果模数不是正整数
+    """
+    if modulus is not None and (not isinstance(modulus, int) or modulus <= 0):
+        raise ValueError("模数必须是正整数")
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    start, end = compiled.start, compiled.end
+    last_col = cols - 1
+    if start == end:
+        return 1 if modulus is None else 1 % modulus
+
+    dist = array("i", [UNREACHED]) * size
+    dist[start] = 0
+    counts: List[int] = [0] * size
+    counts[start] = 1
+    frontier = [start]
+    depth = 0
+    while frontier and dist[end] < 0:
+        depth += 1
+        next_level: List[int] = []
+        append = next_level.append
+        for current in frontier:
+            count = counts[current]
+            col = current % cols
+            for neighbor, ok in (
+                (current - cols, current >= cols),
+                (current + cols, current + cols < size),
+                (current - 1, col != 0),
+                (current + 1, col != last_col),
+            ):
+                if not ok or not passable[neighbor]:
+                    continue
+                if dist[neighbor] < 0:
+                    dist[neighbor] = depth
+                    counts[neighbor] = count
+                    append(neighbor)
+                elif dist[neighbor] == depth:
+                    counts[neighbor] += count
+        if modulus is not None:
+            for index in next_level:
+                counts[index] %= modulus
+        frontier = next_level
+    return counts[end] if dist[end] >= 0 else 0
+
+
+def _direction_codes(codes: Dict[str, str]) -> List[str]:
+    return [codes[name] for name in DIRECTION_NAMES]
+
+
+def iter_shortest_paths(compiled: CompiledMaze, codes: Dict[str, str]) -> Iterator[str]:
+    """
+    惰性枚举所有最短路径
+
+    先从终点做一次 BFS 得到到终点的距离，再从起点深度优先地只走距离减一的格子，
+    因此每条分支都能到达终点，不会回溯死路。额外内存为一个距离数组和
+    与路径长度成正比的栈。路径按首个不同方向 (上、下、左、右) 的顺序产出。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    codes (Dict[str, str]): 方向编码字典
+
+    返回:
+    Iterator[str]: 编码后的最短路径，无法到达时不产出任何路径
+    """
+    start, end = compiled.start, compiled.end
+    dist = distance_field(compiled, end)
+    if dist[start] < 0:
+        return
+    if start == end:
+        yield ""
+        return
+
+    direction_codes = _direction_codes(codes)
+    neighbors = compiled.neighbors
+
+    def steps(current: int) -> Iterator[Tuple[int, int]]:
+        target = dist[current] - 1
+        for direction, neighbor in neighbors(current):
+            if dist[neighbor] == target:
+                yield direction, neighbor
+
+    stack = [steps(start)]
+    moves: List[str] = []
+    while stack:
+        for direction, neighbor in stack[-1]:
+            moves.append(direction_codes[direction])
+            if neighbor == end:
+                yield "".join(moves)
+                moves.pop()
+                continue
+            stack.append(steps(neighbor))
+            break
+        else:
+            stack.pop()
+            if moves:
+                moves.pop()
+
+
+def _spur_path(
+    compiled: CompiledMaze,
+    source: int,
+    blocked_cells: Set[int],
+    blocked_edges: Set[Tuple[int, int]],
+) -> Optional[Tuple[int, List[int]]]:
+    """
+    避开指定格子和边，求从 source 到终点的最小代价路径
+
+    使用字典保存距离，只为实际到达的格子分配内存。
+    """
+    end = compiled.end
+    costs = compiled.costs
+    neighbors = compiled.neighbors
+    dist = {source: 0}
+    parent: Dict[int, int] = {}
+
+    if costs is None:
+        # 等权：广度优先搜索
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                break
+            d = dist[current] + 1
+            for _, neighbor in neighbors(current):
+                if (
+                    neighbor not in dist
+                    and neighbor not in blocked_cells
+                    and (current, neighbor) not in blocked_edges
+                ):
+                    dist[neighbor] = d
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+    else:
+        heap = [(0, source)]
+        done: Set[int] = set()
+        while heap:
+            d, current = heapq.heappop(heap)
+            if current in done:
+                continue
+            done.add(current)
+            if current == end:
+                break
+            for _, neighbor in neighbors(current):
+                if neighbor in blocked_cells or (current, neighbor) in blocked_edges:
+                    continue
+                candidate = d + costs[neighbor]
+                if candidate < dist.get(neighbor, candidate + 1):
+                    dist[neighbor] = candidate
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (candidate, neighbor))
+
+    if end not in dist or (costs is not None and end not in done):
+        return None
+    path = [end]
+    while path[-1] != source:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return dist[end], path
+
+
+def _path_cost(compiled: CompiledMaze, path: Sequence[int]) -> int:
+    costs = compiled.costs
+    if costs is None:
+        return len(path) - 1
+    return sum([costs[index] for index in path[1:]])
+
+
+def _encode(path: Sequence[int], cols: int, direction_codes: List[str]) -> str:
+    return "".join([direction_codes[move] for move in index_path_to_moves(path, cols)])
+
+
+def iter_k_shortest(
+    compiled: CompiledMaze, k: int, codes: Dict[str, str]
+) -> Iterator[str]:
+    """
+    使用 Yen 算法按总代价从小到大惰性产出前 k 条无环路径
+
+    每产出一条路径后才计算下一条的候选，候选堆只保留还可能被采用的
+    k - 已产出数 条，内存与 k 和路径长度成正比。带地形代价的迷宫按总代价排序，
+    否则按步数排序。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    k (int): 最多产出的路径数
+    codes (Dict[str, str]): 方向编码字典
+
+    返回:
+    Iterator[str]: 编码后的路径
+
+    异常:
+    ValueError: 如果 k 不是正整数
+    """
+    if not isinstance(k, int) or k <= 0:
+        raise ValueError("k 必须是正整数")
+    start = compiled.start
+    cols = compiled.cols
+    direction_codes = _direction_codes(codes)
+
+    first = _spur_path(compiled, start, set(), set())
+    if first is None:
+        return
+    accepted = [first[1]]
+    yield _encode(first[1], cols, direction_codes)
+
+    candidates: List[Tuple[int, Tuple[int, ...]]] = []
+    seen = {tuple(first[1])}
+    while len(accepted) < k:
+        last = accepted[-1]
+        # 每条已采用路径与最新路径的公共前缀长度
+        common = []
+        for path in accepted:
+            length = 0
+            for a, b in zip(path, last):
+                if a != b:
+                    break
+                length += 1
+            common.append(length)
+
+        for i in range(len(last) - 1):
+            spur = last[i]
+            blocked_edges = {
+                (path[i], path[i + 1])
+                for path, length in zip(accepted, common)
+                if length > i and len(path) > i + 1
+            }
+            blocked_cells = set(last[:i])
+            found = _spur_path(compiled, spur, blocked_cells, blocked_edges)
+            if found is None:
+                continue
+            candidate = tuple(last[:i] + found[1])
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            heapq.heappush(candidates, (_path_cost(compiled, candidate), candidate))
+
+        if not candidates:
+            return
+        # 只保留还可能被采用的候选
+        remaining = k - len(accepted)
+        if len(candidates) > remaining:
+            candidates = heapq.nsmallest(remaining, candidates)
+            heapq.heapify(candidates)
+            seen = {path for _, path in candidates}
+            seen.update(tuple(path) for path in accepted)
+        _, best = heapq.heappop(candidates)
+        accepted.append(list(best))
+        yield _encode(best, cols, direction_codes)
@@ -0,0 +1,301 @@
+"""
+持久化结果缓存模块
+
+批处理任务经常重启并重新求解同一批迷宫。ResultCache 把求解结果保存在 SQLite 数据库中
+(只依赖标准库 sqlite3)，键由迷宫指纹、符号、方向编码、引擎和启发函数权重组成，
+值是 result_to_bytes 的紧凑二进制 (见 serialize 模块)。
+
+    - 数据库使用 WAL 模式，多个工作进程可以同时读取同一个缓存文件，写入互不阻塞读取
+    - ttl 秒后条目过期；条目数超过 max_entries 时按最近访问时间淘汰最旧的条目
+    - 命中和未命中分别计数，启用求解指标时通过 record_cache("result", ...) 上报
+
+每个进程 (包括 fork 出的工作进程) 都应自行创建 ResultCache，不要共享同一个连接。
+
+使用方法:
+    with ResultCache("results.sqlite", ttl=7 * 86400, max_entries=2_000_000) as cache:
+        for maze in corpus:
+            result = cache.solve(solver, maze, engine="bfs")
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Collection, Dict, List, Optional, Sequence
+
+from .fingerprint import MazeFingerprint
+from .metrics import SolverMetrics
+from .serialize import result_from_bytes, result_to_bytes
+
+# 键格式或存储格式改变时递增，旧条目自然失效
+CACHE_VERSION = 1
+
+# 命中时距上次记录超过该秒数才更新访问时间，避免每次读取都写数据库
+_TOUCH_INTERVAL = 60.0
+
+# 每写入多少条检查一次淘汰
+_EVICT_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def cache_key(
+    fingerprint: str,
+    symbols: Sequence[str],
+    codes: Sequence[str],
+    engine: str = "bfs",
+    weight: Optional[float] = None,
+) -> str:
+    """
+    计算缓存键
+
+    参数:
+    fingerprint (str): 迷宫指纹 (MazeFingerprint.hexdigest())
+    symbols (Sequence[str]): (道路, 墙壁, 起点, 终点) 符号
+    codes (Sequence[str]): (上, 下, 左, 右) 方向编码
+    engine (str): 搜索引擎名称
+    weight (Optional[float]): 启发函数权重
+
+    返回:
+    str: 十六进制缓存键
+    """
+    payload = json.dumps(
+        [CACHE_VERSION, fingerprint, list(symbols), list(codes), engine, weight],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """
+    基于 SQLite 的持久化求解结果缓存
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        metrics: Optional[SolverMetrics] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        打开 (必要时创建) 缓存数据库
+
+        参数:
+        path (str): 数据库文件路径，":memory:" 表示只在本连接内有效的内存数据库
+        ttl (Optional[float]): 条目有效秒数，None 表示不过期
+        max_entries (Optional[int]): 最多保留的条目数，None 表示不限制
+        metrics (Optional[SolverMetrics]): 上报命中/未命中的求解指标
+            (默认使用 solve 时求解器启用的指标)
+        timeout (float): 等待其他进程释放写锁的秒数
+
+        异常:
+        ValueError: 如果 ttl 或 max_entries 不是正数
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl 必须大于 0")
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries 必须大于 0")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get(self, key: str, output: Optional[Collection[str]] = None) -> Optional[Dict]:
+        """
+        读取缓存的结果
+
+        参数:
+        key (str): 缓存键 (见 cache_key)
+        output (Optional[Collection[str]]): 要还原的路径格式，默认与写入时相同
+
+        返回:
+        Optional[Dict]: 结果字典，未命中或已过期时返回 None
+        """
+        row = self._connection.execute(
+            "SELECT created, accessed, data FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is not None and self.ttl is not None and now - row[0] > self.ttl:
+            self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if now - row[1] > _TOUCH_INTERVAL:
+            self._connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return result_from_bytes(row[2], output=output)
+
+    def put(
+        self, key: str, result: Dict, codes: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        写入结果，已有的同键条目被替换
+
+        参数:
+        key (str): 缓存键 (见 cache_key)
+        result (Dict): bfs_solve 格式的结果
+        codes (Optional[Dict[str, str]]): 求解时使用的方向编码字典，默认 U/D/L/R
+        """
+        data = result_to_bytes(result, codes)
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results (key, created, accessed, data) "
+            "VALUES (?, ?, ?, ?)",
+            (key, now, now, data),
+        )
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def solve(
+        self,
+        solver,
+        maze: Optional[List[List[str]]] = None,
+        engine: str = "bfs",
+        weight: Optional[float] = None,
+        output: Optional[Collection[str]] = None,
+        **options,
+    ) -> Dict:
+        """
+        先查缓存，未命中时调用 solver.bfs_solve 并写入缓存
+
+        超出搜索预算的结果不写入缓存；其余结果 (包括无法到达) 都会缓存。
+
+        参数:
+        solver (MazeSolver): 求解器，使用它当前的符号、地形代价和方向编码
+        maze (Optional[List[List[str]]]): 二维迷宫数组 (默认使用 set_maze 设置的迷宫，
+            此时指纹随 set_cell 增量更新，不需要重新计算)
+        engine (str): 搜索引擎名称
+        weight (Optional[float]): 启发函数权重
+        output (Optional[Collection[str]]): 路径输出格式 (见 bfs_solve)
+        **options: 传给 bfs_solve 的预算参数 (max_expansions、timeout、deadline、cancel)
+
+        返回:
+        Dict: 与 bfs_solve 相同格式的结果
+
+        异常:
+        ValueError: 如果未设置迷宫或迷宫格式无效
+        """
+        symbols = solver.get_symbols()
+        symbol_tuple = (
+            symbols["road"],
+            symbols["wall"],
+            symbols["start"],
+            symbols["end"],
+        )
+        codes = solver.get_codes()
+        if maze is None:
+            fingerprint = solver.get_fingerprint().hexdigest()
+        else:
+            solver.validate_maze(maze)
+            fingerprint = MazeFingerprint(
+                maze, symbol_tuple, solver.get_costs()
+            ).hexdigest()
+        key = cache_key(
+            fingerprint,
+            symbol_tuple,
+            (codes["up"], codes["down"], codes["left"], codes["right"]),
+            engine,
+            weight,
+        )
+
+        result = self.get(key, output)
+        metrics = self.metrics if self.metrics is not None else solver.metrics
+        if metrics is not None:
+            metrics.record_cache("result", result is not None)
+        if result is not None:
+            solver.last_result = result
+            return result
+        result = solver.bfs_solve(
+            maze, engine=engine, weight=weight, output=output, **options
+        )
+        if "budget_exceeded" not in result["statistics"]:
+            self.put(key, result, codes)
+        return result
+
+    def evict(self) -> int:
+        """
+        删除过期条目，并在条目数超过 max_entries 时删除最久未访问的条目
+
+        返回:
+        int: 删除的条目数
+        """
+        removed = 0
+        if self.ttl is not None:
+            removed += self._connection.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.ttl,)
+            ).rowcount
+        if self.max_entries is not None:
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                removed += self._connection.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                ).rowcount
+        return removed
+
+    def statistics(self) -> Dict:
+        """
+        返回缓存统计
+
+        返回:
+        Dict: entries、hits、misses 和 hit_ratio (本对象的累计值)
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """
+        删除所有条目
+        """
+        self._connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """
+        执行一次淘汰并关闭数据库连接
+        """
+        self.evict()
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultCache(path={self.path!r}, ttl={self.ttl}, "
+            f"max_entries={self.max_entries})"
+        )
@@ -0,0 +1,430 @@
+"""
+求解结果二进制序列化模块
+
+服务之间用 JSON 传递 bfs_solve 结果时，movement 和 path 是嵌套列表，
+百万步的路径序列化又慢又大。本模块只用标准库把结果编码为带版本号的二进制布局:
+
+    头部  4s 魔数 "MZRS"、B 版本、B 标记 (见 _FOUND 等)、B 输出格式 (见 _OUTPUTS)
+    varint 行数、列数，起点行、列，终点行、列 (有起点/终点时)
+    varint 步数，varint 总代价 (有 total_cost 时)
+    4 个方向编码 (varint 字节数 + UTF-8)
+    每步 2 位的方向 (同 packed_path)
+    varint 字节数 + JSON [其余统计信息, 其余结果键]
+
+movement、path、encoded_path、direction_counts、maze_size 等都可以由起点、方向和编码
+还原，不再逐项保存。解码时按原结果包含的输出格式重建，也可以通过 output 指定。
+
+批量结果可以用 ResultWriter 写入同一个流: 流头 "MZRB" + 版本，之后每个结果前是
+varint 字节数；iter_results 逐个读出。
+"""
+
+import json
+import struct
+from array import array
+from itertools import accumulate, chain, repeat
+from typing import BinaryIO, Collection, Dict, Iterator, List, Optional, Tuple
+
+from .encoding import (
+    FORMAT_KEYS,
+    OUTPUT_FORMATS,
+    check_output,
+    pack_moves,
+    run_length_decode_moves,
+    run_length_encode,
+    unpack_moves,
+)
+from .grid import DIRECTION_NAMES, DIRECTION_VECTORS
+
+_MAGIC = b"MZRS"
+_STREAM_MAGIC = b"MZRB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBB")
+_STREAM_HEADER = struct.Struct("<4sB")
+
+# 标记位
+_FOUND = 1
+_HAS_COST = 2
+_HAS_START = 4
+_HAS_END = 8
+
+# 输出格式位，与 OUTPUT_FORMATS 顺序一致
+_OUTPUTS = {name: 1 << bit for bit, name in enumerate(OUTPUT_FORMATS)}
+
+DEFAULT_CODES = {"up": "U", "down": "D", "left": "L", "right": "R"}
+
+# 由头部和方向还原、不写入 JSON 的键
+_PATH_KEYS = frozenset(
+    {"found", "movement", "path", "length", "steps", "encoded_path", "statistics"}
+    | {"total_cost"}
+    | set(FORMAT_KEYS.values())
+)
+
+_VECTOR_MOVES = {vector: move for move, vector in enumerate(DIRECTION_VECTORS)}
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError(f"varint 不能编码负数 {value}")
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise ValueError("结果数据不完整") from None
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _result_moves(result: Dict, codes: Dict[str, str]) -> bytes:
+    """
+    从结果中已有的任意路径表示取出方向编号序列
+    """
+    steps = result["steps"]
+    if "packed_path" in result:
+        return unpack_moves(result["packed_path"], steps)
+    direction_codes = [codes[name] for name in DIRECTION_NAMES]
+    encoded = result.get("encoded_path")
+    if encoded and all(len(code) == 1 for code in direction_codes):
+        # 单字符编码：借助 str.translate 整串转换，未知字符保持原值 (>= 4)
+        table = {ord(code): move for move, code in enumerate(direction_codes)}
+        moves = encoded.translate(table).encode("latin-1", "replace")
+        if len(moves) == steps and (not moves or max(moves) < 4):
+            return moves
+    movement = result.get("movement")
+    if not movement and "movement_array" in result:
+        flat = result["movement_array"]
+        movement = list(zip(flat[0::2], flat[1::2]))
+    if movement:
+        return bytes(
+            [
+                _VECTOR_MOVES[(b[0] - a[0], b[1] - a[1])]
+                for a, b in zip(movement, movement[1:])
+            ]
+        )
+    if "rle_path" in result:
+        return run_length_decode_moves(result["rle_path"], codes)
+    raise ValueError("结果中没有可用的路径表示")
+
+
+def _maze_shape(statistics: Dict) -> Tuple[int, int]:
+    try:
+        rows, cols = statistics["maze_size"].split("x")
+        return int(rows), int(cols)
+    except (KeyError, AttributeError, ValueError):
+        return 0, 0
+
+
+def result_to_bytes(result: Dict, codes: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    把求解结果编码为二进制
+
+    参数:
+    result (Dict): bfs_solve 格式的结果 (完整字段或 output 指定的紧凑格式均可)
+    codes (Optional[Dict[str, str]]): 求解时使用的方向编码字典，默认 U/D/L/R
+
+    返回:
+    bytes: 二进制结果
+
+    异常:
+    ValueError: 如果找到路径的结果中没有任何路径表示
+    TypeError: 如果统计信息或其他结果键无法用 JSON 表示
+    """
+    if codes is None:
+        codes = DEFAULT_CODES
+    statistics = dict(result.get("statistics") or {})
+    found = bool(result["found"])
+    moves = _result_moves(result, codes) if found else b""
+    steps = len(moves)
+
+    flags = _FOUND if found else 0
+    cost = result.get("total_cost")
+    if isinstance(cost, int) and cost >= 0:
+        flags |= _HAS_COST
+    start = statistics.get("start_position")
+    end = statistics.get("end_position")
+    if start is not None:
+        flags |= _HAS_START
+    if end is not None:
+        flags |= _HAS_END
+    outputs = 0
+    if not found or result.get("movement") or result.get("encoded_path"):
+        outputs |= _OUTPUTS["full"]
+    for name, key in FORMAT_KEYS.items():
+        if key in result:
+            outputs |= _OUTPUTS[name]
+
+    out = bytearray(_HEADER.pack(_MAGIC, _VERSION, flags, outputs))
+    rows, cols = _maze_shape(statistics)
+    _put_varint(out, rows)
+    _put_varint(out, cols)
+    for position in (start, end):
+        if position is not None:
+            _put_varint(out, position[0])
+            _put_varint(out, position[1])
+    _put_varint(out, steps)
+    if flags & _HAS_COST:
+        _put_varint(out, cost)
+    for name in DIRECTION_NAMES:
+        code = codes[name].encode("utf-8")
+        _put_varint(out, len(code))
+        out += code
+    out += pack_moves(moves)
+
+    # 只省略能够原样还原的统计项
+    derived = _derived_statistics(rows, cols, start, end, moves)
+    for key, value in derived.items():
+        if key in statistics and statistics[key] == value:
+            del statistics[key]
+    extra = {key: value for key, value in result.items() if key not in _PATH_KEYS}
+    if cost is not None and not flags & _HAS_COST:
+        extra["total_cost"] = cost
+    tail = json.dumps(
+        [statistics, extra], ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    _put_varint(out, len(tail))
+    out += tail
+    return bytes(out)
+
+
+def _derived_statistics(
+    rows: int,
+    cols: int,
+    start: Optional[Tuple[int, int]],
+    end: Optional[Tuple[int, int]],
+    moves: bytes,
+) -> Dict:
+    return {
+        "maze_size": f"{rows}x{cols}",
+        "total_cells": rows * cols,
+        "start_position": start,
+        "end_position": end,
+        "direction_counts": {
+            name: moves.count(move) for move, name in enumerate(DIRECTION_NAMES)
+        },
+    }
+
+
+def result_from_bytes(
+    data: bytes,
+    codes: Optional[Dict[str, str]] = None,
+    output: Optional[Collection[str]] = None,
+) -> Dict:
+    """
+    把 result_to_bytes 的二进制还原为结果字典
+
+    参数:
+    data (bytes): 二进制结果
+    codes (Optional[Dict[str, str]]): 生成 encoded_path 和 rle_path 使用的方向编码，
+        默认使用编码时保存的方向编码
+    output (Optional[Collection[str]]): 要还原的路径格式 (见 bfs_solve)，
+        默认与编码前的结果相同
+
+    返回:
+    Dict: bfs_solve 格式的结果；movement 中的坐标是元组，
+        其余统计信息中的元组经过 JSON 后变为列表
+
+    异常:
+    ValueError: 如果数据不是二进制结果、版本不受支持或数据不完整
+    """
+    data = bytes(data)
+    if len(data) < _HEADER.size:
+        raise ValueError("结果数据不完整")
+    magic, version, flags, outputs = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("不是二进制求解结果")
+    if version != _VERSION:
+        raise ValueError(f"不支持的结果版本 {version}")
+    pos = _HEADER.size
+    rows, pos = _get_varint(data, pos)
+    cols, pos = _get_varint(data, pos)
+    positions: List[Optional[Tuple[int, int]]] = []
+    for flag in (_HAS_START, _HAS_END):
+        if flags & flag:
+            row, pos = _get_varint(data, pos)
+            col, pos = _get_varint(data, pos)
+            positions.append((row, col))
+        else:
+            positions.append(None)
+    start, end = positions
+    steps, pos = _get_varint(data, pos)
+    cost = None
+    if flags & _HAS_COST:
+        cost, pos = _get_varint(data, pos)
+    stored_codes = {}
+    for name in DIRECTION_NAMES:
+        size, pos = _get_varint(data, pos)
+        stored_codes[name] = data[pos : pos + size].decode("utf-8")
+        pos += size
+    packed_size = (steps + 3) // 4
+    packed = data[pos : pos + packed_size]
+    pos += packed_size
+    size, pos = _get_varint(data, pos)
+    if pos + size != len(data):
+        raise ValueError("结果数据不完整")
+    statistics, extra = json.loads(data[pos:].decode("utf-8"))
+
+    moves = unpack_moves(packed, steps)
+    derived = _derived_statistics(rows, cols, start, end, moves)
+    derived.update(statistics)
+    if codes is None:
+        codes = stored_codes
+    if output is None:
+        output = [name for name in OUTPUT_FORMATS if outputs & _OUTPUTS[name]]
+    else:
+        check_output(output)
+
+    result: Dict = {
+        "found": bool(flags & _FOUND),
+        "movement": [],
+        "path": [],
+        "length": steps + 1 if flags & _FOUND else 0,
+        "steps": steps,
+        "encoded_path": "",
+        "statistics": derived,
+    }
+    if cost is not None:
+        result["total_cost"] = cost
+    result.update(extra)
+    if flags & _FOUND:
+        _fill_moves(result, moves, start, cols, codes, output)
+    return result
+
+
+def _fill_moves(
+    result: Dict,
+    moves: bytes,
+    start: Optional[Tuple[int, int]],
+    cols: int,
+    codes: Dict[str, str],
+    output: Collection[str],
+) -> None:
+    """
+    按输出格式由方向编号序列生成路径字段
+    """
+    if "full" in output or "array" in output:
+        if start is None:
+            raise ValueError("结果中缺少起点，无法还原坐标")
+        # 用格子编号的前缀和生成坐标，避免逐步的 Python 循环；
+        # 缺少列数时用足够大的行宽，保证路径不会跨行
+        width = cols if cols > start[1] else start[1] + len(moves) + 1
+        deltas = (-width, width, -1, 1)
+        indices = accumulate(
+            chain((start[0] * width + start[1],), map(deltas.__getitem__, moves))
+        )
+        movement = list(map(divmod, indices, repeat(width)))
+        if "full" in output:
+            result["movement"] = movement
+        if "array" in output:
+            result["movement_array"] = array("i", chain.from_iterable(movement))
+    if "full" in output:
+        result["path"] = list(map(DIRECTION_VECTORS.__getitem__, moves))
+        direction_codes = [codes[name] for name in DIRECTION_NAMES]
+        if all(len(code) == 1 and ord(code) < 256 for code in direction_codes):
+            table = bytes.maketrans(
+                bytes(range(4)), "".join(direction_codes).encode("latin-1")
+            )
+            result["encoded_path"] = moves.translate(table).decode("latin-1")
+        else:
+            result["encoded_path"] = "".join(map(direction_codes.__getitem__, moves))
+    if "rle" in output:
+        result["rle_path"] = run_length_encode(moves, codes)
+    if "packed" in output:
+        result["packed_path"] = pack_moves(moves)
+
+
+class ResultWriter:
+    """
+    把多个求解结果写入同一个二进制流
+
+    使用方法:
+        with open("results.bin", "wb") as stream:
+            writer = ResultWriter(stream, solver.get_codes())
+            for result in results:
+                writer.write(result)
+    """
+
+    def __init__(self, stream: BinaryIO, codes: Optional[Dict[str, str]] = None):
+        """
+        写入流头
+
+        参数:
+        stream (BinaryIO): 以二进制方式打开的可写流
+        codes (Optional[Dict[str, str]]): 求解时使用的方向编码字典，默认 U/D/L/R
+        """
+        self.stream = stream
+        self.codes = codes
+        self.count = 0
+        stream.write(_STREAM_HEADER.pack(_STREAM_MAGIC, _VERSION))
+
+    def write(self, result: Dict) -> int:
+        """
+        追加一个结果
+
+        参数:
+        result (Dict): bfs_solve 格式的结果
+
+        返回:
+        int: 写入的字节数
+        """
+        record = result_to_bytes(result, self.codes)
+        prefix = bytearray()
+        _put_varint(prefix, len(record))
+        self.stream.write(prefix)
+        self.stream.write(record)
+        self.count += 1
+        return len(prefix) + len(record)
+
+
+def iter_results(
+    stream: BinaryIO,
+    codes: Optional[Dict[str, str]] = None,
+    output: Optional[Collection[str]] = None,
+) -> Iterator[Dict]:
+    """
+    逐个读出 ResultWriter 写入的结果
+
+    参数:
+    stream (BinaryIO): 以二进制方式打开的可读流
+    codes (Optional[Dict[str, str]]): 见 result_from_bytes
+    output (Optional[Collection[str]]): 见 result_from_bytes
+
+    返回:
+    Iterator[Dict]: 按写入顺序产出的结果
+
+    异常:
+    ValueError: 如果流头无效或数据不完整
+    """
+    header = stream.read(_STREAM_HEADER.size)
+    if len(header) < _STREAM_HEADER.size:
+        raise ValueError("结果流不完整")
+    magic, version = _STREAM_HEADER.unpack(header)
+    if magic != _STREAM_MAGIC:
+        raise ValueError("不是二进制结果流")
+    if version != _VERSION:
+        raise ValueError(f"不支持的结果流版本 {version}")
+    while True:
+        size = shift = 0
+        while True:
+            byte = stream.read(1)
+            if not byte:
+                if shift:
+                    raise ValueError("结果流不完整")
+                return
+            size |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                break
+            shift += 7
+        record = stream.read(size)
+        if len(record) != size:
+            raise ValueError("结果流不完整")
+        yield result_from_bytes(record, codes, output)
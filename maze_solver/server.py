@@ -0,0 +1,490 @@
+"""
+本地求解服务模块
+
+常驻进程通过 HTTP（本机端口或 Unix 套接字）接收求解请求，只依赖标准库。
+已解析的迷宫按指纹缓存在主进程中，编译后的迷宫缓存在工作进程中；
+同一指纹的请求总是分派到同一个工作进程，因此重复求解只需支付搜索本身的开销。
+
+接口:
+    POST /solve    {"maze", "width", "height", "symbols", "costs", "code", "engine",
+                    "movement", "max_expansions", "timeout", "weight"}
+                   或 {"fingerprint", ...} (复用已缓存的迷宫)
+    GET  /health   服务状态
+    GET  /metrics  Prometheus 文本格式的指标
+
+命令行用法:
+    maze-solver serve --port 8765 --workers 4
+    maze-solver serve --unix /tmp/maze-solver.sock
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .cli import (
+    DEFAULT_CODE,
+    DEFAULT_SYMBOLS,
+    _code_from,
+    _symbols_from,
+    build_maze,
+    summarize_result,
+)
+from .core import MazeSolver
+from .fingerprint import MazeFingerprint, symbols_digest
+from .grid import CompiledMaze, compile_maze
+from .metrics import REGISTRY, MetricsRegistry, get_solver_metrics
+from .structs import Symbols
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 128
+
+# 请求体大小上限 (字节)
+MAX_BODY_BYTES = 256 * 1024 * 1024
+
+
+def maze_fingerprint(
+    maze: List[List[str]],
+    symbols: Sequence[str],
+    costs: Optional[Dict[str, int]] = None,
+) -> str:
+    """
+    计算迷宫指纹
+
+    指纹覆盖迷宫的每个格子、道路/墙壁/起点/终点符号以及地形代价表，
+    同一指纹的迷宫编译结果相同 (见 fingerprint 模块)。
+
+    参数:
+    maze (List[List[str]]): 二维迷宫数组
+    symbols (Sequence[str]): (道路, 墙壁, 起点, 终点) 符号
+    costs (Optional[Dict[str, int]]): 地形代价表
+
+    返回:
+    str: 十六进制指纹
+    """
+    return MazeFingerprint(maze, symbols, costs).hexdigest()
+
+
+class UnknownFingerprint(Exception):
+    """
+    请求只带指纹，但服务端没有缓存对应的迷宫
+    """
+
+    def __init__(self, fingerprint: str):
+        """
+        参数:
+        fingerprint (str): 请求中的迷宫指纹
+        """
+        super().__init__(f"未知的迷宫指纹 {fingerprint}")
+        self.fingerprint = fingerprint
+
+
+class _LRU:
+    """
+    按插入/访问顺序淘汰的有界字典
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# 工作进程内的编译迷宫缓存: 编译缓存键 (指纹 + 符号摘要) -> CompiledMaze
+_compiled: Optional[_LRU] = None
+
+
+def _init_worker(cache_size: int) -> None:
+    global _compiled
+    _compiled = _LRU(cache_size)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _worker_solve(
+    key: str,
+    maze: Optional[List[Union[List[str], str]]],
+    symbols: Symbols,
+    code: Tuple[str, str, str, str],
+    engine: str,
+    movement: bool,
+    max_expansions: Optional[int] = None,
+    timeout: Optional[float] = None,
+    weight: Optional[float] = None,
+) -> Optional[Tuple[Dict, bool]]:
+    """
+    在工作进程中求解，timeout 从工作进程开始处理时计时
+
+    编译结果取决于迷宫、符号和地形代价，key 同时包含迷宫指纹和符号摘要，
+    只带指纹的请求换了符号或代价表时不会复用旧的编译结果。
+    maze 的每个元素可以是行字符串 (每格一个字符时主进程用它减小序列化开销)。
+
+    返回:
+    Optional[Tuple[Dict, bool]]: (结果, 是否命中编译缓存)；
+        未命中且没有提供迷宫时返回None，由主进程带上迷宫重试
+    """
+    cache = _compiled if _compiled is not None else _LRU(1)
+    solver = MazeSolver()
+    solver.set_symbols(symbols)
+    solver.set_code(*code)
+    compiled: Optional[CompiledMaze] = cache.get(key)
+    cached = compiled is not None
+    options = {"max_expansions": max_expansions, "timeout": timeout, "weight": weight}
+    if compiled is not None:
+        result = solver.solve_compiled(compiled, engine, **options)
+    elif maze is None:
+        return None
+    else:
+        maze = [list(row) if isinstance(row, str) else row for row in maze]
+        road, wall, start, end = symbols
+        start_pos, end_pos = solver.find_positions(maze, start, end)
+        if start_pos is None or end_pos is None:
+            # 缺少起点或终点，交给 bfs_solve 生成错误结果
+            result = solver.bfs_solve(maze, engine=engine, **options)
+        else:
+            compiled = compile_maze(
+                maze, road, start, end, start_pos, end_pos, solver.costs or None
+            )
+            cache.put(key, compiled)
+            result = solver.solve_compiled(compiled, engine, **options)
+
+    # 只把需要的字段传回主进程，避免序列化整条坐标路径
+    return summarize_result(result, movement), cached
+
+
+def _packed(
+    maze: Optional[List[List[str]]],
+) -> Optional[List[Union[List[str], str]]]:
+    """
+    每格都是单个字符时把迷宫压缩为行字符串列表，减小发往工作进程的序列化开销
+    """
+    if maze is None:
+        return None
+    rows = ["".join(row) for row in maze]
+    if all(len(text) == len(row) and "" not in row for text, row in zip(rows, maze)):
+        return rows
+    return maze
+
+
+class SolveService:
+    """
+    求解服务
+
+    维护迷宫缓存和按指纹分片的工作进程，HTTP 层只负责编解码。
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """
+        初始化服务并启动工作进程
+
+        参数:
+        workers (Optional[int]): 工作进程数，默认 CPU 核数
+        cache_size (int): 主进程和每个工作进程缓存的迷宫数量上限
+        registry (Optional[MetricsRegistry]): 指标注册表，默认使用全局 REGISTRY
+        """
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.cache_size = cache_size
+        self.registry = registry if registry is not None else REGISTRY
+        self.metrics = get_solver_metrics(self.registry)
+        self.mazes = _LRU(cache_size)
+        # 每个工作进程已缓存的编译键 (镜像工作进程的 LRU)，已缓存时不再序列化迷宫
+        self._resident = [_LRU(cache_size) for _ in range(self.workers)]
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        # 每个分片一个单进程池，保证同一指纹总是落在同一个进程
+        self._shards = [
+            ProcessPoolExecutor(
+                max_workers=1, initializer=_init_worker, initargs=(cache_size,)
+            )
+            for _ in range(self.workers)
+        ]
+        # 提前启动进程并完成导入
+        for future in [shard.submit(_warm_up) for shard in self._shards]:
+            future.result()
+
+    def solve(self, request: Dict) -> Dict:
+        """
+        处理一个求解请求
+
+        参数:
+        request (Dict): 请求对象，包含 maze 或 fingerprint，
+            可选 width、height、symbols、code、engine、movement、
+            max_expansions 和 timeout (搜索预算，超出时结果的 statistics 中带 error)、
+            weight (启发函数权重)
+
+        返回:
+        Dict: found、steps、length、encoded_path、statistics、fingerprint、cached
+            (以及可选的 movement)
+
+        异常:
+        UnknownFingerprint: 如果指纹未知且请求中没有迷宫
+        ValueError: 如果请求格式无效
+        KeyError: 如果 symbols 或 code 字典缺少字段
+        """
+        began = time.perf_counter()
+        with self._lock:
+            self.requests += 1
+        symbols = _symbols_from(request.get("symbols", DEFAULT_SYMBOLS))
+        if "costs" in request:
+            symbols = Symbols(*symbols, costs=request["costs"])
+        code = _code_from(request.get("code", DEFAULT_CODE))
+        engine = request.get("engine", "bfs")
+
+        maze: Optional[List[List[str]]] = None
+        if "maze" in request:
+            maze = build_maze(
+                request["maze"], request.get("width"), request.get("height")
+            )
+            fingerprint = maze_fingerprint(maze, symbols, symbols.costs)
+            self.mazes.put(fingerprint, maze)
+        else:
+            fingerprint = request.get("fingerprint")
+            if not isinstance(fingerprint, str):
+                raise ValueError("请求必须包含 maze 或 fingerprint")
+
+        index = int(fingerprint[:8], 16) % len(self._shards)
+        shard = self._shards[index]
+        resident = self._resident[index]
+        key = fingerprint + symbols_digest(symbols, symbols.costs).hex()
+        max_expansions = request.get("max_expansions")
+        if max_expansions is not None and (
+            not isinstance(max_expansions, int) or isinstance(max_expansions, bool)
+        ):
+            raise ValueError("max_expansions 必须是整数")
+        timeout = request.get("timeout")
+        if timeout is not None and (
+            not isinstance(timeout, (int, float)) or isinstance(timeout, bool)
+        ):
+            raise ValueError("timeout 必须是数字")
+        weight = request.get("weight")
+        if weight is not None and (
+            not isinstance(weight, (int, float)) or isinstance(weight, bool)
+        ):
+            raise ValueError("weight 必须是数字")
+        args = (
+            symbols,
+            code.to_tuple(),
+            engine,
+            bool(request.get("movement")),
+            max_expansions,
+            timeout,
+            weight,
+        )
+        # 工作进程很可能已缓存编译结果时先只发送键，未命中再带上迷宫重试
+        first = maze if resident.get(key) is None else None
+        outcome = shard.submit(_worker_solve, key, _packed(first), *args).result()
+        if outcome is None:
+            if maze is None:
+                maze = self.mazes.get(fingerprint)
+                self.metrics.record_cache("maze", maze is not None)
+                if maze is None:
+                    raise UnknownFingerprint(fingerprint)
+            outcome = shard.submit(_worker_solve, key, _packed(maze), *args).result()
+        resident.put(key, True)
+
+        output, cached = outcome
+        self.metrics.record_cache("compiled", cached)
+        self.metrics.record_solve(output, time.perf_counter() - began)
+        output["fingerprint"] = fingerprint
+        output["cached"] = cached
+        return output
+
+    def health(self) -> Dict:
+        """
+        返回服务状态
+        """
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "cached_mazes": len(self.mazes),
+            "requests": self.requests,
+            "uptime": time.time() - self.started,
+        }
+
+    def close(self) -> None:
+        """
+        关闭工作进程
+        """
+        for shard in self._shards:
+            shard.shutdown(wait=True)
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP 请求处理器，使用持久连接
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MazeSolver"
+
+    def setup(self) -> None:
+        # 头部和正文分两次写出，TCP 连接需关闭 Nagle 算法以免与延迟确认叠加
+        self.disable_nagle_algorithm = self.request.family in (
+            socket.AF_INET,
+            socket.AF_INET6,
+        )
+        super().setup()
+
+    def address_string(self) -> str:
+        # Unix 套接字没有客户端地址
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def do_GET(self) -> None:
+        service: SolveService = self.server.service  # type: ignore
+        if self.path == "/health":
+            self._send_json(200, service.health())
+        elif self.path == "/metrics":
+            body = service.registry.render().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"未知路径 {self.path}"})
+
+    def do_POST(self) -> None:
+        service: SolveService = self.server.service  # type: ignore
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": "请求体过大"})
+            return
+        body = self.rfile.read(length)
+        if self.path != "/solve":
+            self._send_json(404, {"error": f"未知路径 {self.path}"})
+            return
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError("请求体必须是 JSON 对象")
+            response = service.solve(request)
+        except UnknownFingerprint as e:
+            self._send_json(404, {"error": str(e)})
+        except (ValueError, TypeError, KeyError) as e:
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._send_json(500, {"error": f"内部错误 {type(e).__name__}: {e}"})
+        else:
+            self._send_json(200, response)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    监听 Unix 套接字的多线程 HTTP 服务器
+    """
+
+    daemon_threads = True
+
+
+def create_server(
+    service: SolveService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """
+    创建绑定到求解服务的 HTTP 服务器
+
+    参数:
+    service (SolveService): 求解服务
+    host (str): 监听地址 (默认只监听本机)
+    port (int): 监听端口，0 表示自动分配
+    unix_socket (Optional[str]): Unix 套接字路径，提供时忽略 host/port
+    verbose (bool): 是否输出访问日志
+
+    返回:
+    socketserver.BaseServer: 尚未开始服务的服务器
+    """
+    server: socketserver.BaseServer
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = UnixHTTPServer(unix_socket, SolveRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), SolveRequestHandler)
+        server.daemon_threads = True  # type: ignore
+    server.service = service  # type: ignore
+    server.verbose = verbose  # type: ignore
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[str] = None,
+    workers: Optional[int] = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    verbose: bool = False,
+) -> None:
+    """
+    启动求解服务并一直运行，直到收到 KeyboardInterrupt
+
+    参数:
+    host (str): 监听地址
+    port (int): 监听端口
+    unix_socket (Optional[str]): Unix 套接字路径
+    workers (Optional[int]): 工作进程数，默认 CPU 核数
+    cache_size (int): 缓存的迷宫数量上限
+    verbose (bool): 是否输出访问日志
+    """
+    service = SolveService(workers, cache_size)
+    server = create_server(service, host, port, unix_socket, verbose)
+    if isinstance(server, HTTPServer):
+        address = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    else:
+        address = f"unix:{unix_socket}"
+    print(f"MazeSolver 服务已启动: {address} ({service.workers} 个工作进程)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.unlink(unix_socket)
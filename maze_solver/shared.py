@@ -0,0 +1,355 @@
+"""
+共享内存迷宫模块
+
+多进程求解时，每个任务都序列化完整的 List[List[str]] 迷宫，大网格的传输开销
+往往超过搜索本身。SharedMaze 把编译后的迷宫 (可通行数组和可选的代价数组)
+一次性写入 multiprocessing.shared_memory，工作进程按名称附加，
+直接在共享内存上搜索而不复制；之后每个起点/终点查询只需要传递几十字节。
+
+共享内存块的布局 (小端):
+
+    头部  4s 魔数 "MZSH"、H 版本、H 标记 (1 表示带代价)、I 行数、I 列数、
+          q 起点编号、q 终点编号 (共 32 字节)
+    rows * cols 字节的可通行数组
+    (按 4 字节对齐后) rows * cols 个 uint32 代价
+
+使用方法:
+    with SharedMaze.create(solver.compile(maze)) as shared:
+        results = shared.solve_queries([((1, 1), (9, 9)), ((1, 1), (5, 3))], workers=4)
+
+    # 自行管理进程池时，在工作进程中调用
+    result = solve_shared(shared.name, (1, 1), (9, 9), engine="bfs")
+
+需要 Python 3.8 及以上版本 (multiprocessing.shared_memory)。
+"""
+
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .grid import CompiledMaze
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7
+    shared_memory = None  # type: ignore
+
+_MAGIC = b"MZSH"
+_VERSION = 1
+_HAS_COSTS = 1
+_HEADER = struct.Struct("<4sHHIIqq")
+
+Position = Tuple[int, int]
+Query = Tuple[Position, Position]
+
+# 工作进程内已附加的共享迷宫: 名称 -> SharedMaze
+_attached: Dict[str, "SharedMaze"] = {}
+
+
+def _require_shared_memory() -> None:
+    if shared_memory is None:
+        raise RuntimeError("共享内存迷宫需要 Python 3.8 或更高版本")
+
+
+def _costs_offset(size: int) -> int:
+    return (_HEADER.size + size + 3) & ~3
+
+
+def _open_block(name: str):
+    """
+    按名称附加共享内存块
+
+    Python 3.13 起附加方不注册到资源跟踪器，避免工作进程退出时误删共享内存。
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedMaze:
+    """
+    位于共享内存中的编译迷宫
+
+    compiled 的 passable (和 costs) 是共享内存上的 memoryview，调用 close() 后失效。
+    创建者负责在所有工作进程用完后调用 unlink() 释放共享内存；
+    用作上下文管理器时，退出时关闭，创建者还会释放。
+    """
+
+    def __init__(self, block, owner: bool):
+        """
+        包装已打开的共享内存块，请使用 create 或 attach 构造
+
+        异常:
+        ValueError: 如果共享内存块不是 SharedMaze 格式
+        """
+        self._block = block
+        self.owner = owner
+        buffer = block.buf
+        magic, version, flags, rows, cols, start, end = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            block.close()
+            raise ValueError(f"共享内存 '{block.name}' 不是迷宫数据")
+        if version != _VERSION:
+            block.close()
+            raise ValueError(f"不支持的共享迷宫版本 {version}")
+        size = rows * cols
+        self._views: List[memoryview] = [buffer[_HEADER.size : _HEADER.size + size]]
+        costs = None
+        if flags & _HAS_COSTS:
+            offset = _costs_offset(size)
+            raw = buffer[offset : offset + 4 * size]
+            costs = raw.cast("I")
+            self._views += [raw, costs]
+        self.compiled = CompiledMaze(
+            rows,
+            cols,
+            self._views[0],
+            start if start >= 0 else None,
+            end if end >= 0 else None,
+            costs,
+        )
+
+    @classmethod
+    def create(cls, compiled: CompiledMaze, name: Optional[str] = None) -> "SharedMaze":
+        """
+        把编译后的迷宫写入新的共享内存块
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫 (见 MazeSolver.compile)
+        name (Optional[str]): 共享内存名称，默认自动生成
+
+        返回:
+        SharedMaze: 创建者持有的共享迷宫
+
+        异常:
+        RuntimeError: 如果 Python 版本低于 3.8
+        """
+        _require_shared_memory()
+        size = compiled.size
+        costs = compiled.costs
+        total = (
+            _costs_offset(size) + 4 * size if costs is not None else _HEADER.size + size
+        )
+        block = shared_memory.SharedMemory(name=name, create=True, size=total)
+        try:
+            buffer = block.buf
+            _HEADER.pack_into(
+                buffer,
+                0,
+                _MAGIC,
+                _VERSION,
+                _HAS_COSTS if costs is not None else 0,
+                compiled.rows,
+                compiled.cols,
+                compiled.start if compiled.start is not None else -1,
+                compiled.end if compiled.end is not None else -1,
+            )
+            buffer[_HEADER.size : _HEADER.size + size] = bytes(compiled.passable)
+            if costs is not None:
+                offset = _costs_offset(size)
+                target = buffer[offset : offset + 4 * size].cast("I")
+                try:
+                    target[:] = memoryview(_uint32(costs))
+                finally:
+                    target.release()
+            return cls(block, owner=True)
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMaze":
+        """
+        按名称附加已发布的共享迷宫，不复制数据
+
+        参数:
+        name (str): 共享内存名称 (创建者的 name 属性)
+
+        返回:
+        SharedMaze: 附加的共享迷宫
+
+        异常:
+        RuntimeError: 如果 Python 版本低于 3.8
+        FileNotFoundError: 如果共享内存不存在
+        ValueError: 如果共享内存不是迷宫数据
+        """
+        _require_shared_memory()
+        return cls(_open_block(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """
+        共享内存名称，传给工作进程用于附加
+        """
+        return self._block.name
+
+    @property
+    def nbytes(self) -> int:
+        """
+        共享内存块的字节数
+        """
+        return self._block.size
+
+    def close(self) -> None:
+        """
+        释放本进程对共享内存的映射，compiled 随之失效
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._block.close()
+
+    def unlink(self) -> None:
+        """
+        删除共享内存块 (已附加的进程仍可使用到各自关闭为止)
+        """
+        self._block.unlink()
+
+    def solve_queries(
+        self,
+        queries: Iterable[Query],
+        workers: Optional[int] = None,
+        engine: str = "bfs",
+        code: Optional[Tuple[str, str, str, str]] = None,
+        output: Optional[Sequence[str]] = None,
+        max_expansions: Optional[int] = None,
+        timeout: Optional[float] = None,
+        weight: Optional[float] = None,
+        chunksize: int = 16,
+    ) -> List[Dict]:
+        """
+        在多个工作进程中求解一批起点/终点查询
+
+        每批查询只传递共享内存名称、求解选项和坐标，工作进程第一次收到
+        某个名称时附加共享内存并缓存，之后的查询不再传输迷宫。
+
+        参数:
+        queries (Iterable[Query]): ((起点行, 起点列), (终点行, 终点列)) 序列
+        workers (Optional[int]): 工作进程数 (默认 CPU 核数)
+        engine (str): 搜索引擎名称
+        code (Optional[Tuple[str, str, str, str]]): 方向编码，默认 U/D/L/R
+        output (Optional[Sequence[str]]): 路径输出格式 (见 bfs_solve)，
+            长路径建议使用 ("packed",) 等紧凑格式以减少回传的数据
+        max_expansions, timeout, weight: 见 bfs_solve
+        chunksize (int): 每次发给工作进程的查询数
+
+        返回:
+        List[Dict]: 按查询顺序排列的结果，格式同 bfs_solve；
+            起点或终点无效时 statistics 中 'error' 说明原因
+        """
+        call = partial(
+            _solve_query,
+            self.name,
+            {
+                "engine": engine,
+                "code": code,
+                "output": output,
+                "max_expansions": max_expansions,
+                "timeout": timeout,
+                "weight": weight,
+            },
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(call, queries, chunksize=chunksize))
+
+    def __enter__(self) -> "SharedMaze":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __repr__(self) -> str:
+        compiled = self.compiled
+        return (
+            f"SharedMaze(name={self._block.name!r}, "
+            f"size={compiled.rows}x{compiled.cols}, owner={self.owner})"
+        )
+
+
+def _uint32(costs: Sequence[int]) -> array:
+    if isinstance(costs, array) and costs.typecode == "I":
+        return costs
+    return array("I", costs)
+
+
+def attach_cached(name: str) -> SharedMaze:
+    """
+    在当前进程中附加共享迷宫，同一名称只附加一次
+
+    参数:
+    name (str): 共享内存名称
+
+    返回:
+    SharedMaze: 附加的共享迷宫 (进程退出前保持打开)
+    """
+    shared = _attached.get(name)
+    if shared is None:
+        shared = _attached[name] = SharedMaze.attach(name)
+    return shared
+
+
+def solve_shared(
+    name: str,
+    start: Position,
+    end: Position,
+    engine: str = "bfs",
+    code: Optional[Tuple[str, str, str, str]] = None,
+    output: Optional[Sequence[str]] = None,
+    max_expansions: Optional[int] = None,
+    timeout: Optional[float] = None,
+    weight: Optional[float] = None,
+) -> Dict:
+    """
+    在共享迷宫上求解一个起点/终点查询，适合在工作进程中调用
+
+    参数:
+    name (str): 共享内存名称
+    start (Position): 起点坐标
+    end (Position): 终点坐标
+    engine (str): 搜索引擎名称
+    code (Optional[Tuple[str, str, str, str]]): 方向编码，默认 U/D/L/R
+    output (Optional[Sequence[str]]): 路径输出格式 (见 bfs_solve)
+    max_expansions, timeout, weight: 见 bfs_solve
+
+    返回:
+    Dict: 与 bfs_solve 相同格式的结果
+
+    异常:
+    ValueError: 如果坐标越界或位于墙上
+    """
+    # 延迟导入，避免与 core 模块循环依赖
+    from .core import MazeSolver
+
+    solver = MazeSolver()
+    if code is not None:
+        solver.set_code(*code)
+    compiled = attach_cached(name).compiled.with_endpoints(tuple(start), tuple(end))
+    return solver.solve_compiled(
+        compiled,
+        engine,
+        max_expansions=max_expansions,
+        timeout=timeout,
+        weight=weight,
+        output=output,
+    )
+
+
+def _solve_query(name: str, options: Dict, query: Query) -> Dict:
+    start, end = query
+    try:
+        return solve_shared(name, start, end, **options)
+    except ValueError as e:
+        from .core import MazeSolver
+
+        compiled = attach_cached(name).compiled
+        result = MazeSolver()._new_result(
+            compiled.rows, compiled.cols, tuple(start), tuple(end), options["engine"]
+        )
+        result["statistics"]["error"] = str(e)
+        return result
@@ -3,6 +3,8 @@
 包含Code和Symbols两个数据结构类
 """
 
+from typing import Dict, Optional
+
 
 class Code:
     """
@@ -48,10 +50,17 @@ class Code:
 class Symbols:
     """
     迷宫符号结构体
-    存储道路、墙壁、起点、终点的符号
+    存储道路、墙壁、起点、终点的符号，以及可选的地形代价表
     """
 
-    def __init__(self, road: str, wall: str, start: str, end: str):
+    def __init__(
+        self,
+        road: str,
+        wall: str,
+        start: str,
+        end: str,
+        costs: Optional[Dict[str, int]] = None,
+    ):
         """
         初始化Symbols结构体
 
@@ -60,14 +69,18 @@ class Symbols:
             wall (str): 墙壁符号
             start (str): 起点符号
             end (str): 终点符号
+            costs (Optional[Dict[str, int]]): 额外地形符号 -> 进入该格子的代价，
+                例如 {"~": 3, "^": 5}；道路、起点和终点的代价为 1
         """
         self.road = road
         self.wall = wall
         self.start = start
         self.end = end
+        self.costs = dict(costs) if costs else {}
 
     def __repr__(self):
-        return f"Symbols(road='{self.road}', wall='{self.wall}', start='{self.start}', end='{self.end}')"
+        costs = f", costs={self.costs!r}" if self.costs else ""
+        return f"Symbols(road='{self.road}', wall='{self.wall}', start='{self.start}', end='{self.end}'{costs})"
 
     def __str__(self):
         return (
@@ -0,0 +1,380 @@
+"""
+分块磁盘迷宫模块
+
+超出内存的迷宫不能再以 List[List[str]] 或整块 bytearray 的形式加载。
+本模块把可通行数组按固定大小的矩形块 (tile) 写入磁盘文件，求解时用 mmap 映射文件，
+只把边界经过的块读入内存，常驻块的数量由 LRU 缓存限制。
+
+TiledGrid 实现了搜索引擎需要的 passable 序列接口 (len 和按格子编号取值)，
+因此它的 compiled 属性可以直接交给 solve_compiled 和各个搜索引擎，
+引擎在边界推进时按需换入块。结果的 statistics 中增加:
+
+    tile_loads       本次求解从磁盘读入的块数
+    tile_evictions   本次求解因缓存已满而换出的块数
+    tiles_resident   求解结束时常驻内存的块数
+
+文件布局 (小端):
+
+    头部  4s 魔数 "MZTL"、H 版本、H 保留、I 行数、I 列数、I 块行数、I 块列数、
+          q 起点编号、q 终点编号 (-1 表示没有)
+    按块行优先排列的块，每块 块行数 * 块列数 字节的 0/1，越界部分填 0
+
+注意只有可通行数组被分块；搜索引擎自己的方向标记数组等仍按每格 1 字节分配，
+地形代价不会写入文件。"bitboard" 引擎会一次读入全部块来打包位图。
+
+使用方法:
+    write_tiled("world.tiles", open("world.txt"), tile_size=(64, 64))
+    with TiledGrid("world.tiles", cache_tiles=256) as grid:
+        result = solver.solve_compiled(grid.compiled, engine="bfs")
+        print(result["statistics"]["tile_loads"])
+"""
+
+import mmap
+import struct
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .grid import CompiledMaze
+from .structs import Symbols
+
+_MAGIC = b"MZTL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIIIqq")
+
+DEFAULT_TILE_SIZE = (64, 64)
+DEFAULT_CACHE_TILES = 256
+
+Row = Union[str, Sequence[str]]
+
+
+def write_tiled(
+    path: str,
+    maze: Union[Iterable[Row], CompiledMaze],
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]] = None,
+    tile_size: Tuple[int, int] = DEFAULT_TILE_SIZE,
+) -> Tuple[int, int]:
+    """
+    把迷宫逐行写入分块文件
+
+    按块行缓冲，内存占用约为 块行数 * 列数 字节，与迷宫的总行数无关，
+    因此可以直接传入逐行读取的文本文件。
+
+    参数:
+    path (str): 输出文件路径
+    maze (Union[Iterable[Row], CompiledMaze]): 逐行产出的迷宫 (字符串或符号列表，
+        字符串行末尾的换行会被去掉)，或编译后的迷宫
+    symbols (Optional[Union[Symbols, Tuple[str, str, str, str]]]): (道路, 墙壁, 起点, 终点)，
+        默认 ("0", "1", "*", "#")；Symbols 中的地形符号视为可通行
+    tile_size (Tuple[int, int]): (块行数, 块列数)
+
+    返回:
+    Tuple[int, int]: (行数, 列数)
+
+    异常:
+    ValueError: 如果迷宫为空、各行长度不同或块大小无效
+    """
+    tile_rows, tile_cols = tile_size
+    if tile_rows < 1 or tile_cols < 1:
+        raise ValueError("块大小必须大于 0")
+    if isinstance(maze, CompiledMaze):
+        rows_iter = _compiled_rows(maze)
+        start_index, end_index = maze.start, maze.end
+    else:
+        rows_iter = _symbol_rows(maze, symbols)
+        start_index = end_index = None
+
+    with open(path, "wb") as handle:
+        handle.write(bytes(_HEADER.size))
+        band = bytearray()
+        rows = cols = 0
+        for row, (cells, start_col, end_col) in enumerate(rows_iter):
+            if row == 0:
+                cols = len(cells)
+                if cols == 0:
+                    raise ValueError("迷宫不能为空")
+            elif len(cells) != cols:
+                raise ValueError(f"第 {row} 行长度为 {len(cells)}，应为 {cols}")
+            if start_col is not None and start_index is None:
+                start_index = row * cols + start_col
+            if end_col is not None and end_index is None:
+                end_index = row * cols + end_col
+            band += cells
+            rows += 1
+            if rows % tile_rows == 0:
+                _write_band(handle, band, cols, tile_rows, tile_cols)
+                band = bytearray()
+        if rows == 0:
+            raise ValueError("迷宫不能为空")
+        if band:
+            band += bytes((tile_rows - rows % tile_rows) * cols)
+            _write_band(handle, band, cols, tile_rows, tile_cols)
+        handle.seek(0)
+        handle.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                0,
+                rows,
+                cols,
+                tile_rows,
+                tile_cols,
+                start_index if start_index is not None else -1,
+                end_index if end_index is not None else -1,
+            )
+        )
+    return rows, cols
+
+
+def _write_band(
+    handle, band: bytearray, cols: int, tile_rows: int, tile_cols: int
+) -> None:
+    """
+    把 tile_rows 行缓冲切成一行块写出
+    """
+    pad = bytes(-cols % tile_cols)
+    for first in range(0, cols, tile_cols):
+        width = min(tile_cols, cols - first)
+        for row in range(tile_rows):
+            offset = row * cols + first
+            handle.write(band[offset : offset + width])
+            if width < tile_cols:
+                handle.write(pad)
+
+
+def _compiled_rows(
+    compiled: CompiledMaze,
+) -> Iterator[Tuple[bytes, Optional[int], Optional[int]]]:
+    cols = compiled.cols
+    passable = compiled.passable
+    for row in range(compiled.rows):
+        yield bytes(passable[row * cols : (row + 1) * cols]), None, None
+
+
+def _symbol_rows(
+    maze: Iterable[Row],
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]],
+) -> Iterator[Tuple[bytes, Optional[int], Optional[int]]]:
+    """
+    把符号行转换为 (0/1 字节, 起点列, 终点列)
+    """
+    if symbols is None:
+        symbols = Symbols("0", "1", "*", "#")
+    if isinstance(symbols, Symbols):
+        road, start, end = symbols.road, symbols.start, symbols.end
+        open_symbols = {road, start, end, *symbols.costs}
+    else:
+        road, _, start, end = symbols
+        open_symbols = {road, start, end}
+    table: Dict[int, int] = {}
+    single = all(len(symbol) == 1 for symbol in open_symbols)
+    for row in maze:
+        if isinstance(row, str):
+            row = row.rstrip("\r\n")
+        if isinstance(row, str) and single:
+            # 单字符格子：借助 str.translate 整行转换
+            for char in set(row):
+                if ord(char) not in table:
+                    table[ord(char)] = 1 if char in open_symbols else 0
+            cells = row.translate(table).encode("latin-1")
+            start_col, end_col = row.find(start), row.find(end)
+        else:
+            row = list(row)
+            cells = bytes(1 if cell in open_symbols else 0 for cell in row)
+            start_col = row.index(start) if start in row else -1
+            end_col = row.index(end) if end in row else -1
+        yield (
+            cells,
+            start_col if start_col >= 0 else None,
+            end_col if end_col >= 0 else None,
+        )
+
+
+class TiledGrid:
+    """
+    映射到内存的分块可通行数组
+
+    按格子编号取值时定位所在的块，块不在缓存中则从文件读入，缓存超过
+    cache_tiles 块时换出最久未使用的块。连续访问同一块时跳过 LRU 记账。
+    """
+
+    def __init__(self, path: str, cache_tiles: int = DEFAULT_CACHE_TILES):
+        """
+        打开 write_tiled 写出的分块文件
+
+        参数:
+        path (str): 分块文件路径
+        cache_tiles (int): 最多常驻内存的块数
+
+        异常:
+        ValueError: 如果 cache_tiles 小于 1 或文件不是分块迷宫
+        """
+        if cache_tiles < 1:
+            raise ValueError("cache_tiles 必须大于 0")
+        self.path = path
+        self.cache_tiles = cache_tiles
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._last_id = -1
+        self._last_tile = b""
+        self.loads = 0
+        self.evictions = 0
+        self._file = open(path, "rb")
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"'{path}' 不是分块迷宫文件")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        (
+            magic,
+            version,
+            _,
+            self.rows,
+            self.cols,
+            self.tile_rows,
+            self.tile_cols,
+            start,
+            end,
+        ) = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' 不是分块迷宫文件")
+        if version != _VERSION:
+            self.close()
+            raise ValueError(f"不支持的分块迷宫版本 {version}")
+        self.size = self.rows * self.cols
+        self.tiles_across = -(-self.cols // self.tile_cols)
+        self.tile_bytes = self.tile_rows * self.tile_cols
+        tiles_down = -(-self.rows // self.tile_rows)
+        if (
+            len(self._map)
+            < _HEADER.size + tiles_down * self.tiles_across * self.tile_bytes
+        ):
+            self.close()
+            raise ValueError(f"分块迷宫文件 '{path}' 不完整")
+        self.start = start if start >= 0 else None
+        self.end = end if end >= 0 else None
+
+    @property
+    def compiled(self) -> CompiledMaze:
+        """
+        以本对象为可通行数组的编译迷宫
+        """
+        return CompiledMaze(self.rows, self.cols, self, self.start, self.end)
+
+    @property
+    def resident(self) -> int:
+        """
+        当前常驻内存的块数
+        """
+        return len(self._cache)
+
+    def tile(self, tile_id: int) -> bytes:
+        """
+        返回块的内容，必要时从文件读入并换出最久未使用的块
+
+        参数:
+        tile_id (int): 块编号 (块行 * 每行块数 + 块列)
+
+        返回:
+        bytes: 块行数 * 块列数 字节的 0/1
+        """
+        cache = self._cache
+        data = cache.get(tile_id)
+        if data is None:
+            offset = _HEADER.size + tile_id * self.tile_bytes
+            data = self._map[offset : offset + self.tile_bytes]
+            self.loads += 1
+            cache[tile_id] = data
+            if len(cache) > self.cache_tiles:
+                cache.popitem(last=False)
+                self.evictions += 1
+        else:
+            cache.move_to_end(tile_id)
+        self._last_id = tile_id
+        self._last_tile = data
+        return data
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("格子编号超出迷宫范围")
+        row, col = divmod(index, self.cols)
+        tile_row, inner_row = divmod(row, self.tile_rows)
+        tile_col, inner_col = divmod(col, self.tile_cols)
+        tile_id = tile_row * self.tiles_across + tile_col
+        # 最近一次访问的块已经位于 LRU 末尾，不需要再次记账
+        data = self._last_tile if tile_id == self._last_id else self.tile(tile_id)
+        return data[inner_row * self.tile_cols + inner_col]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        按格子编号顺序逐个产出 0/1 (逐行换入块)
+        """
+        for row in range(self.rows):
+            yield from self.row(row)
+
+    def row(self, row: int) -> bytes:
+        """
+        读取一整行的可通行标记
+
+        参数:
+        row (int): 行号
+
+        返回:
+        bytes: cols 字节的 0/1
+        """
+        tile_row, inner_row = divmod(row, self.tile_rows)
+        first = inner_row * self.tile_cols
+        parts: List[bytes] = []
+        for tile_col in range(self.tiles_across):
+            data = self.tile(tile_row * self.tiles_across + tile_col)
+            parts.append(data[first : first + self.tile_cols])
+        return b"".join(parts)[: self.cols]
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        返回累计的换页统计
+
+        返回:
+        Dict[str, int]: tile_loads、tile_evictions、tiles_resident 和
+            tile_cache_bytes (常驻块占用的字节数)
+        """
+        return {
+            "tile_loads": self.loads,
+            "tile_evictions": self.evictions,
+            "tiles_resident": self.resident,
+            "tile_cache_bytes": self.resident * self.tile_bytes,
+        }
+
+    def clear_cache(self) -> None:
+        """
+        换出所有常驻块 (不计入 tile_evictions)
+        """
+        self._cache.clear()
+        self._last_id = -1
+        self._last_tile = b""
+
+    def close(self) -> None:
+        """
+        释放缓存并关闭文件映射
+        """
+        self.clear_cache()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "TiledGrid":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"TiledGrid(path={self.path!r}, size={self.rows}x{self.cols}, "
+            f"tile={self.tile_rows}x{self.tile_cols}, cache_tiles={self.cache_tiles})"
+        )
@@ -0,0 +1,481 @@
+"""
+引擎自动选择与调优模块
+
+bfs_solve(engine="auto") 根据几个廉价的迷宫特征选择搜索引擎:
+
+    - size: 格子总数
+    - wall_density: 墙壁比例
+    - distance_ratio: 起点到终点的曼哈顿距离 / (行数 + 列数 - 2)
+    - corridor_ratio: 可通行格子中恰有两个可通行邻居 (走廊) 的比例，
+      大迷宫只抽样检查固定数量的格子
+
+自动选择只使用精确 (最短路径) 引擎: 带地形代价时使用 zero_one 或 dijkstra，
+否则在 bfs、corridor 和 astar 之间按阈值选择。阈值因机器和 Python 版本而异，
+调优命令在本机生成迷宫语料、对各引擎计时，搜索使选择结果最接近最快引擎的阈值，
+并保存为配置文件；没有配置文件时使用 DEFAULT_THRESHOLDS。
+
+配置文件路径依次取环境变量 MAZE_SOLVER_PROFILE、
+$XDG_CACHE_HOME/maze_solver/profile.json、~/.cache/maze_solver/profile.json。
+
+命令行用法:
+    python -m maze_solver.tune --sizes 1000,100000 --repeat 3
+    python -m maze_solver.tune --show
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .grid import CompiledMaze
+
+# bfs_solve 中表示自动选择的引擎名称
+AUTO_ENGINE = "auto"
+
+# 自动选择时比较的无权引擎
+CANDIDATE_ENGINES = ("bfs", "corridor", "astar")
+
+# 没有配置文件时使用的阈值
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    # 小于该格子数时直接使用 bfs (其他引擎的预处理不划算)
+    "small_size": 4096,
+    # 走廊比例不低于该值时使用 corridor；大于 1 表示不使用
+    # (首次求解只在部分完美迷宫上快于 BFS，死胡同链很长时更慢，由调优决定是否启用)
+    "corridor_ratio": 1.01,
+    # 起终点距离比例和墙壁比例都不超过这两个值时使用 astar
+    "astar_distance": 0.25,
+    "astar_wall_density": 0.2,
+}
+
+# 调优时搜索的候选阈值 (默认值总是参与比较)
+_CANDIDATES: Dict[str, Sequence[float]] = {
+    "small_size": (0, 1024, 4096, 16384, 65536),
+    "corridor_ratio": (0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 1.01),
+    "astar_distance": (0.0, 0.05, 0.1, 0.15, 0.25, 0.35, 0.5, 0.75, 1.0),
+    "astar_wall_density": (0.0, 0.1, 0.2, 0.3, 0.4, 1.0),
+}
+
+# 计算走廊比例时最多检查的格子数
+FEATURE_SAMPLES = 4096
+
+# 配置文件格式版本
+PROFILE_VERSION = 1
+PROFILE_ENV = "MAZE_SOLVER_PROFILE"
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5)
+
+# 路径 -> (修改时间, 阈值)
+_profile_cache: Dict[str, Tuple[float, Dict[str, float]]] = {}
+
+
+def default_profile_path() -> str:
+    """
+    返回配置文件路径 (环境变量 MAZE_SOLVER_PROFILE 优先)
+    """
+    path = os.environ.get(PROFILE_ENV)
+    if path:
+        return path
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache, "maze_solver", "profile.json")
+
+
+def _count_walls(passable) -> int:
+    try:
+        return passable.count(0)
+    except AttributeError:
+        return bytes(passable).count(0)
+
+
+def maze_features(compiled: CompiledMaze) -> Dict[str, float]:
+    """
+    计算用于选择引擎的迷宫特征
+
+    除墙壁计数外都是常数时间；走廊比例最多抽样 FEATURE_SAMPLES 个格子，
+    使用固定种子，同一迷宫总是得到相同结果。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+
+    返回:
+    Dict[str, float]: size、wall_density、distance_ratio 和 corridor_ratio
+    """
+    rows, cols, size = compiled.rows, compiled.cols, compiled.size
+    passable = compiled.passable
+    start_row, start_col = compiled.position(compiled.start)
+    end_row, end_col = compiled.position(compiled.end)
+    distance = abs(start_row - end_row) + abs(start_col - end_col)
+
+    if size <= FEATURE_SAMPLES:
+        sample: Sequence[int] = range(size)
+    else:
+        sample = random.Random(size).sample(range(size), FEATURE_SAMPLES)
+    last_col = cols - 1
+    open_cells = corridors = 0
+    for index in sample:
+        if not passable[index]:
+            continue
+        open_cells += 1
+        col = index % cols
+        degree = (
+            (index >= cols and passable[index - cols])
+            + (index + cols < size and passable[index + cols])
+            + (col != 0 and passable[index - 1])
+            + (col != last_col and passable[index + 1])
+        )
+        if degree == 2:
+            corridors += 1
+
+    return {
+        "size": size,
+        "wall_density": _count_walls(passable) / size,
+        "distance_ratio": distance / max(1, rows + cols - 2),
+        "corridor_ratio": corridors / open_cells if open_cells else 0.0,
+    }
+
+
+def choose_engine(features: Dict[str, float], thresholds: Dict[str, float]) -> str:
+    """
+    按阈值从 CANDIDATE_ENGINES 中选择引擎
+
+    参数:
+    features (Dict[str, float]): maze_features 的结果
+    thresholds (Dict[str, float]): 阈值 (键同 DEFAULT_THRESHOLDS)
+
+    返回:
+    str: 引擎名称
+    """
+    if features["size"] < thresholds["small_size"]:
+        return "bfs"
+    if features["corridor_ratio"] >= thresholds["corridor_ratio"]:
+        return "corridor"
+    if (
+        features["distance_ratio"] <= thresholds["astar_distance"]
+        and features["wall_density"] <= thresholds["astar_wall_density"]
+    ):
+        return "astar"
+    return "bfs"
+
+
+def select_engine(
+    compiled: CompiledMaze, thresholds: Optional[Dict[str, float]] = None
+) -> Tuple[str, Dict[str, float]]:
+    """
+    为编译后的迷宫选择搜索引擎
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    thresholds (Optional[Dict[str, float]]): 阈值，默认读取配置文件 (见 load_profile)
+
+    返回:
+    Tuple[str, Dict[str, float]]: (引擎名称, 迷宫特征)；带地形代价时不计算特征，
+        返回 zero_one (代价只有 0 和 1) 或 dijkstra 以及空字典
+    """
+    if compiled.costs is not None:
+        return ("zero_one" if max(compiled.costs) <= 1 else "dijkstra"), {}
+    features = maze_features(compiled)
+    if thresholds is None:
+        thresholds = load_profile()
+    return choose_engine(features, thresholds), features
+
+
+def load_profile(path: Optional[str] = None) -> Dict[str, float]:
+    """
+    读取配置文件中的阈值
+
+    结果按文件修改时间缓存；文件不存在、无法解析或版本不符时返回默认阈值，
+    文件中缺少的阈值也使用默认值。
+
+    参数:
+    path (Optional[str]): 配置文件路径 (默认见 default_profile_path)
+
+    返回:
+    Dict[str, float]: 阈值
+    """
+    if path is None:
+        path = default_profile_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return dict(DEFAULT_THRESHOLDS)
+    cached = _profile_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return dict(cached[1])
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+        if profile.get("version") == PROFILE_VERSION:
+            for name, value in profile.get("thresholds", {}).items():
+                if name in thresholds and isinstance(value, (int, float)):
+                    thresholds[name] = value
+    except (OSError, ValueError, AttributeError):
+        pass
+    _profile_cache[path] = (mtime, thresholds)
+    return dict(thresholds)
+
+
+def save_profile(profile: Dict, path: Optional[str] = None) -> str:
+    """
+    保存调优结果
+
+    参数:
+    profile (Dict): tune 返回的配置
+    path (Optional[str]): 配置文件路径 (默认见 default_profile_path)
+
+    返回:
+    str: 实际写入的路径
+    """
+    if path is None:
+        path = default_profile_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # 先写临时文件再替换，正在求解的进程不会读到不完整的文件
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    os.replace(temporary, path)
+    _profile_cache.pop(path, None)
+    return path
+
+
+def _near_endpoint(compiled: CompiledMaze) -> Optional[Tuple[int, int]]:
+    """
+    在起点附近 (约 1/8 边长处) 找一个可通行格子作为近距离终点
+    """
+    rows, cols = compiled.rows, compiled.cols
+    start_row, start_col = compiled.position(compiled.start)
+    target_row = min(rows - 1, start_row + max(1, rows // 8))
+    target_col = min(cols - 1, start_col + max(1, cols // 8))
+    for radius in range(max(rows, cols)):
+        for row in range(target_row - radius, target_row + radius + 1):
+            if not 0 <= row < rows:
+                continue
+            for col in (target_col - radius, target_col + radius):
+                if 0 <= col < cols and compiled.passable[row * cols + col]:
+                    return row, col
+    return None
+
+
+def benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    kinds: Optional[Sequence[str]] = None,
+    engines: Sequence[str] = CANDIDATE_ENGINES,
+    seed: int = 0,
+    repeat: int = 3,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> List[Dict]:
+    """
+    在基准测试语料上对各引擎计时
+
+    每个迷宫分别以远端 (对角) 和近端终点计时。
+
+    参数:
+    sizes (Sequence[int]): 目标格子数列表
+    kinds (Optional[Sequence[str]]): 迷宫类型 (默认全部，见 bench.CORPUS_KINDS)
+    engines (Sequence[str]): 参与比较的引擎
+    seed (int): 随机种子
+    repeat (int): 每个引擎的计时次数 (取最小值，每次都求解新的编译迷宫)
+    progress (Optional[Callable]): 每完成一个用例时的回调
+
+    返回:
+    List[Dict]: 每项包含 case、features 和 times (引擎 -> 秒)
+    """
+    # 延迟导入，避免与 core 模块循环依赖
+    from .bench import CORPUS_KINDS, generate_corpus, measure
+    from .core import MazeSolver
+    from .engines import get_engine
+
+    solver = MazeSolver()
+    searches = {name: get_engine(name) for name in engines}
+    cases = []
+    for corpus in generate_corpus(sizes, kinds or CORPUS_KINDS, seed):
+        compiled = solver.compile(corpus["maze"])
+        variants = [("far", compiled)]
+        near = _near_endpoint(compiled)
+        if near is not None:
+            variants.append(
+                (
+                    "near",
+                    compiled.with_endpoints(compiled.position(compiled.start), near),
+                )
+            )
+        for label, variant in variants:
+            endpoints = (
+                variant.position(variant.start),
+                variant.position(variant.end),
+            )
+            times = {}
+            for name, search in searches.items():
+                # bfs_solve 每次都编译新的迷宫: 每次计时都换一个新的 CompiledMaze
+                # (共享可通行数组)，按编译迷宫缓存的预处理不会让后几次计时变成热缓存
+                call = lambda search=search: search(  # noqa: E731
+                    variant.with_endpoints(*endpoints), {}
+                )
+                times[name] = measure(call, repeat, memory=False)["wall_time"]
+            case = {
+                "case": f"{corpus['case']}-{label}",
+                "features": maze_features(variant),
+                "times": times,
+            }
+            cases.append(case)
+            if progress is not None:
+                progress(case)
+    return cases
+
+
+def _regret(cases: Sequence[Dict], thresholds: Dict[str, float]) -> float:
+    """
+    选择结果相对最快引擎的平均耗时比
+    """
+    total = 0.0
+    for case in cases:
+        times = case["times"]
+        chosen = times.get(choose_engine(case["features"], thresholds))
+        best = min(times.values())
+        if chosen is None or best <= 0:
+            continue
+        total += chosen / best
+    return total / len(cases) if cases else 1.0
+
+
+def calibrate(cases: Sequence[Dict]) -> Tuple[Dict[str, float], float]:
+    """
+    网格搜索阈值，使选择结果的平均耗时比 (选择的引擎 / 最快的引擎) 最小
+
+    候选值相同时保留默认阈值。
+
+    参数:
+    cases (Sequence[Dict]): benchmark 的结果
+
+    返回:
+    Tuple[Dict[str, float], float]: (阈值, 平均耗时比)
+    """
+    names = list(DEFAULT_THRESHOLDS)
+    grids = [
+        [DEFAULT_THRESHOLDS[name]]
+        + [value for value in _CANDIDATES[name] if value != DEFAULT_THRESHOLDS[name]]
+        for name in names
+    ]
+    best = dict(DEFAULT_THRESHOLDS)
+    best_regret = _regret(cases, best)
+    for values in itertools.product(*grids):
+        thresholds = dict(zip(names, values))
+        regret = _regret(cases, thresholds)
+        if regret < best_regret - 1e-9:
+            best, best_regret = thresholds, regret
+    return best, best_regret
+
+
+def tune(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    kinds: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    repeat: int = 3,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    在本机计时并校准阈值
+
+    参数:
+    sizes (Sequence[int]): 目标格子数列表
+    kinds (Optional[Sequence[str]]): 迷宫类型
+    seed (int): 随机种子
+    repeat (int): 计时次数
+    progress (Optional[Callable]): 每完成一个用例时的回调
+
+    返回:
+    Dict: 配置 (version、meta、thresholds、regret、cases)，可交给 save_profile
+    """
+    cases = benchmark(sizes, kinds, CANDIDATE_ENGINES, seed, repeat, progress)
+    thresholds, regret = calibrate(cases)
+    return {
+        "version": PROFILE_VERSION,
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "thresholds": thresholds,
+        "regret": regret,
+        "default_regret": _regret(cases, DEFAULT_THRESHOLDS),
+        "cases": cases,
+    }
+
+
+def _format_case(case: Dict) -> str:
+    times = case["times"]
+    fastest = min(times, key=times.get)
+    columns = " ".join(
+        f"{name}={times[name] * 1000:9.2f}ms" for name in CANDIDATE_ENGINES
+    )
+    return f"{case['case']:>24} {columns}  最快: {fastest}"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    命令行入口
+
+    参数:
+    argv (Optional[Sequence[str]]): 命令行参数，默认读取 sys.argv
+
+    返回:
+    int: 退出状态
+    """
+    parser = argparse.ArgumentParser(
+        prog="maze-solver-tune", description="校准 engine='auto' 的引擎选择阈值"
+    )
+    parser.add_argument("--sizes", help="逗号分隔的目标格子数 (默认 1000,10000,100000)")
+    parser.add_argument("--kinds", help="逗号分隔的迷宫类型 (默认全部)")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数")
+    parser.add_argument("--out", help="配置文件路径 (默认见 MAZE_SOLVER_PROFILE)")
+    parser.add_argument("--dry-run", action="store_true", help="只输出结果，不保存")
+    parser.add_argument("--show", action="store_true", help="显示当前使用的阈值后退出")
+    args = parser.parse_args(argv)
+
+    path = args.out or default_profile_path()
+    if args.show:
+        print(f"配置文件: {path} ({'存在' if os.path.exists(path) else '不存在'})")
+        print(json.dumps(load_profile(path), indent=2))
+        return 0
+
+    def split(text: str) -> List[str]:
+        return [item.strip() for item in text.split(",") if item.strip()]
+
+    sizes = (
+        [int(float(size)) for size in split(args.sizes)]
+        if args.sizes
+        else DEFAULT_SIZES
+    )
+    kinds = split(args.kinds) if args.kinds else None
+    profile = tune(
+        sizes,
+        kinds,
+        args.seed,
+        args.repeat,
+        progress=lambda case: print(_format_case(case), flush=True),
+    )
+    print(f"阈值: {json.dumps(profile['thresholds'])}")
+    print(
+        f"平均耗时比: {profile['regret']:.3f} (默认阈值 {profile['default_regret']:.3f})"
+    )
+    if args.dry_run:
+        return 0
+    print(f"已保存: {save_profile(profile, path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+"""
+路径校验模块
+
+批量检查编码路径是否能在迷宫中从起点走到终点，而不需要重新求解。
+
+PathVerifier 在构造时预先计算:
+    - 方向编码的解码方式 (单字符编码用 str.translate；互不为前缀的多字符编码
+      只有唯一切分，先用 str.replace 整体替换为方向编号，替换不完整时用正则表达式
+      找出第一个无法解析的位置；存在前缀关系的编码用字典树)
+    - 四周补一圈墙的一维可通行表 (越界和撞墙都在一次查表中判断)
+并在第一次需要时从终点做一次 BFS 得到距离场，之后的校验都复用这些结果，
+每条路径只需要按一维位置逐步查一次表。
+
+编码之间存在前缀关系时 (例如 "w" 和 "ww")，同一条路径可能有多种切分，
+只有结合迷宫才能判断哪种切分可以走通，因此校验时同时切分和行走:
+对 (字符位置, 格子) 状态做动态规划，只要存在一种走到终点的切分路径就合法，
+多种切分都能走到终点时取步数最少的一种。
+
+使用方法:
+    report = verify_path(maze, "DDRR", code=Code("U", "D", "L", "R"))
+    reports = verify_many(maze, submissions, code=Code("w", "s", "a", "d"))
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .encoding import code_pattern
+from .grid import DIRECTION_NAMES, CompiledMaze
+from .paths import UNREACHED, distance_field
+from .structs import Code, Symbols
+
+_DIRECTION_TEXT = ("上", "下", "左", "右")
+
+
+def _code_trie(direction_codes: List[str]) -> Dict:
+    """
+    构造方向编码的字典树，键 None 存放在该节点结束的编码的方向编号
+    """
+    root: Dict = {}
+    for move, code in enumerate(direction_codes):
+        node = root
+        for char in code:
+            node = node.setdefault(char, {})
+        node[None] = move
+    return root
+
+
+def _trie_decode(trie: Dict, text: str) -> Tuple[bytes, Optional[int]]:
+    """
+    用字典树切分编码路径
+
+    从左到右标记所有能由完整编码切分到达的位置，并记录到达每个位置的最后一个编码；
+    能到达末尾时返回完整切分，否则回溯到能到达的最远位置。
+
+    返回:
+    Tuple[bytes, Optional[int]]: (方向编号序列, 无法解析的字符位置或 None)
+    """
+    length = len(text)
+    reached = bytearray(length + 1)
+    reached[0] = 1
+    # 到达每个位置的 (上一个位置, 方向编号)
+    previous: List[Tuple[int, int]] = [(0, 0)] * (length + 1)
+    for position in range(length):
+        if not reached[position]:
+            continue
+        node = trie
+        index = position
+        while index < length:
+            node = node.get(text[index])
+            if node is None:
+                break
+            index += 1
+            if None in node and not reached[index]:
+                reached[index] = 1
+                previous[index] = (position, node[None])
+
+    end = reached.rfind(1)
+    moves = bytearray()
+    position = end
+    while position:
+        position, move = previous[position]
+        moves.append(move)
+    moves.reverse()
+    return bytes(moves), None if end == length else end
+
+
+class PathVerifier:
+    """
+    编码路径校验器
+
+    同一个迷宫和方向编码的所有校验共享预处理结果，适合批量评分。
+    """
+
+    def __init__(self, compiled: CompiledMaze, codes: Dict[str, str]):
+        """
+        预处理迷宫和方向编码
+
+        参数:
+        compiled (CompiledMaze): 编译后的迷宫
+        codes (Dict[str, str]): 方向编码字典 (键为 up/down/left/right)
+        """
+        self.compiled = compiled
+        self.codes = dict(codes)
+        direction_codes = [codes[name] for name in DIRECTION_NAMES]
+        self._ids = {code: move for move, code in enumerate(direction_codes)}
+        self._single = all(len(code) == 1 for code in direction_codes)
+        self._prefixed = any(
+            other != code and other.startswith(code)
+            for code in direction_codes
+            for other in direction_codes
+        )
+        if self._single:
+            # 单字符编码: 先找第一个非法字符，再把前缀整体翻译为方向编号
+            self._table = str.maketrans(
+                {code: chr(move) for move, code in enumerate(direction_codes)}
+            )
+            self._invalid = re.compile(
+                "[^" + "".join(re.escape(code) for code in direction_codes) + "]"
+            )
+        elif not self._prefixed:
+            # 多字符编码的快速路径: 先把每个编码替换为方向编号字符 (长的在前)
+            markers = [(code, chr(move)) for move, code in enumerate(direction_codes)]
+            if any(marker in code for code in direction_codes for _, marker in markers):
+                markers = []
+            self._markers = sorted(markers, key=lambda item: len(item[0]), reverse=True)
+        if self._prefixed:
+            self._trie = _code_trie(direction_codes)
+        elif not self._single:
+            self._pattern = code_pattern(codes)
+        # 补墙后的行宽: 每行末尾一列墙同时充当下一行左侧的墙，上下各补一行墙
+        self._width = compiled.cols + 1
+        self._grid = self._padded_grid()
+        self._offsets = (-self._width, self._width, -1, 1)
+        self._origin = self._padded(compiled.start)
+        self._distance: Optional[array] = None
+
+    def _padded_grid(self) -> bytes:
+        """
+        构造四周补墙的一维可通行表
+        """
+        compiled = self.compiled
+        rows, cols, width = compiled.rows, compiled.cols, self._width
+        source = bytes(compiled.passable)
+        grid = bytearray((rows + 2) * width)
+        for row in range(rows):
+            first = (row + 1) * width
+            grid[first : first + cols] = source[row * cols : (row + 1) * cols]
+        return bytes(grid)
+
+    def _padded(self, cell: int) -> int:
+        """
+        格子编号 -> 补墙表中的位置
+        """
+        row, col = divmod(cell, self.compiled.cols)
+        return (row + 1) * self._width + col
+
+    def _cell(self, position: int) -> int:
+        """
+        补墙表中的位置 -> 格子编号
+        """
+        row, col = divmod(position, self._width)
+        return (row - 1) * self.compiled.cols + col
+
+    @property
+    def distance(self) -> array:
+        """
+        每个格子到终点的最少步数 (array('i')，无法到达为 -1)，第一次访问时计算
+        """
+        if self._distance is None:
+            self._distance = distance_field(self.compiled, self.compiled.end)
+        return self._distance
+
+    @property
+    def shortest_steps(self) -> Optional[int]:
+        """
+        最短路径步数，无法到达终点时为 None
+        """
+        steps = self.distance[self.compiled.start]
+        return None if steps == UNREACHED else steps
+
+    def decode(self, encoded_path: str) -> Tuple[bytes, Optional[int]]:
+        """
+        将编码路径解码为方向编号
+
+        参数:
+        encoded_path (str): 编码路径
+
+        返回:
+        Tuple[bytes, Optional[int]]: (方向编号序列, 无法解析的字符位置或 None)；
+            无法解析时方向编号序列为位置之前的部分。编码之间存在前缀关系时，
+            只要整条路径存在切分就能解码 (有多种切分时取其中一种，不考虑迷宫；
+            verify 会结合迷宫选择切分)，否则解码到能切分到的最远位置
+        """
+        if self._single:
+            match = self._invalid.search(encoded_path)
+            if match is None:
+                return encoded_path.translate(self._table).encode("latin-1"), None
+            prefix = encoded_path[: match.start()]
+            return prefix.translate(self._table).encode("latin-1"), match.start()
+        if self._prefixed:
+            return _trie_decode(self._trie, encoded_path)
+
+        # 替换后只剩方向编号字符时，它就是唯一的完整切分 (编码不含这些字符)
+        markers = self._markers
+        if markers and not any(marker in encoded_path for _, marker in markers):
+            text = encoded_path
+            for code, marker in markers:
+                text = text.replace(code, marker)
+            moves = text.encode("latin-1", "replace")
+            if not moves or max(moves) < len(markers):
+                return moves, None
+
+        # 互不为前缀的编码只有唯一切分，正则表达式的结果与字典树相同
+        tokens = self._pattern.findall(encoded_path)
+        if sum(map(len, tokens)) == len(encoded_path):
+            return bytes(map(self._ids.__getitem__, tokens)), None
+        # 存在无法解析的片段：找到第一个间隙
+        moves = bytearray()
+        position = 0
+        for match in self._pattern.finditer(encoded_path):
+            if match.start() != position:
+                break
+            moves.append(self._ids[match.group()])
+            position = match.end()
+        return bytes(moves), position
+
+    def _walk_decode(self, encoded_path: str) -> Tuple[bytes, Optional[int]]:
+        """
+        编码之间存在前缀关系时，结合迷宫切分编码路径
+
+        对 (字符位置, 补墙表位置) 状态按字符位置从小到大做动态规划，每个状态记录
+        到达它的最少步数。能在末尾到达终点时返回该切分；否则返回走得最远的切分，
+        如果该处还有编码可以匹配 (只会撞墙或越界)，再追加一步让行走在这里失败，
+        没有编码可以匹配时返回无法解析的位置。
+
+        返回:
+        Tuple[bytes, Optional[int]]: (方向编号序列, 无法解析的字符位置或 None)
+        """
+        length = len(encoded_path)
+        grid, offsets = self._grid, self._offsets
+        # 每个字符位置可以到达的位置 -> (步数, 上一个字符位置, 上一个位置, 方向编号)
+        states: List[Optional[Dict[int, Tuple[int, int, int, int]]]] = [None] * (
+            length + 1
+        )
+        states[0] = {self._origin: (0, 0, 0, 0)}
+        furthest = 0
+        blocked: Optional[int] = None
+        for offset in range(length + 1):
+            current = states[offset]
+            if not current:
+                continue
+            furthest = offset
+            blocked = None
+            if offset == length:
+                break
+            node = self._trie
+            index = offset
+            while index < length:
+                node = node.get(encoded_path[index])
+                if node is None:
+                    break
+                index += 1
+                move = node.get(None)
+                if move is None:
+                    continue
+                if blocked is None:
+                    blocked = move
+                following = states[index]
+                if following is None:
+                    following = states[index] = {}
+                for position, (steps, *_) in current.items():
+                    target = position + offsets[move]
+                    if grid[target]:
+                        known = following.get(target)
+                        if known is None or known[0] > steps + 1:
+                            following[target] = (steps + 1, offset, position, move)
+
+        reached = states[furthest]
+        goal = self._padded(self.compiled.end)
+        position = (
+            goal if furthest == length and goal in reached else next(iter(reached))
+        )
+        moves = bytearray()
+        offset = furthest
+        while offset:
+            _, offset, position, move = reached[position]
+            moves.append(move)
+            reached = states[offset]
+        moves.reverse()
+        if furthest == length:
+            return bytes(moves), None
+        if blocked is not None:
+            moves.append(blocked)
+            return bytes(moves), None
+        return bytes(moves), furthest
+
+    def verify(self, encoded_path: str) -> Dict:
+        """
+        校验一条编码路径
+
+        参数:
+        encoded_path (str): 编码路径
+
+        返回:
+        Dict: 包含以下键值的字典
+            - 'valid': bool, 是否每一步都合法且停在终点
+            - 'steps': int, 解码得到的步数
+            - 'failed_step': Optional[int], 第一个失败的步 (从 0 开始)；
+              所有步都合法但没有停在终点时等于 steps；合法路径为 None
+            - 'error': Optional[str], 失败原因
+            - 'position': Tuple[int, int], 停止时所在的坐标
+            - 'remaining': int, 停止位置到终点的最少步数 (无法到达为 -1)
+            - 'shortest': bool, 是否为最短路径 (按步数)
+            - 'shortest_steps': Optional[int], 最短路径步数
+        """
+        compiled = self.compiled
+        if self._prefixed:
+            moves, bad_char = self._walk_decode(encoded_path)
+        else:
+            moves, bad_char = self.decode(encoded_path)
+        grid = self._grid
+        offsets = self._offsets
+
+        current = self._origin
+        failed: Optional[int] = None
+        for step, move in enumerate(moves):
+            target = current + offsets[move]
+            if not grid[target]:
+                failed = step
+                break
+            current = target
+        current = self._cell(current)
+
+        steps = len(moves)
+        error: Optional[str] = None
+        if failed is not None:
+            error = self._move_error(current, moves[failed], failed)
+        elif bad_char is not None:
+            failed = steps
+            fragment = encoded_path[bad_char : bad_char + 10]
+            error = f"第 {steps} 步无法解析，位置 {bad_char}: {fragment!r}"
+        elif current != compiled.end:
+            failed = steps
+            error = "路径没有停在终点"
+
+        shortest_steps = self.shortest_steps
+        return {
+            "valid": failed is None,
+            "steps": steps,
+            "failed_step": failed,
+            "error": error,
+            "position": compiled.position(current),
+            "remaining": self.distance[current],
+            "shortest": failed is None and steps == shortest_steps,
+            "shortest_steps": shortest_steps,
+        }
+
+    def _move_error(self, current: int, move: int, step: int) -> str:
+        """
+        说明一步移动失败的原因
+        """
+        compiled = self.compiled
+        cols, size = compiled.cols, compiled.size
+        row, col = compiled.position(current)
+        target = current + (-cols, cols, -1, 1)[move]
+        if (
+            (move == 0 and row == 0)
+            or (move == 1 and target >= size)
+            or (move == 2 and col == 0)
+            or (move == 3 and col == cols - 1)
+        ):
+            return f"第 {step} 步从 {(row, col)} 向{_DIRECTION_TEXT[move]}移出迷宫边界"
+        return f"第 {step} 步从 {(row, col)} 向{_DIRECTION_TEXT[move]}撞墙"
+
+    def verify_many(self, encoded_paths: Iterable[str]) -> List[Dict]:
+        """
+        依次校验多条编码路径
+
+        参数:
+        encoded_paths (Iterable[str]): 编码路径序列
+
+        返回:
+        List[Dict]: 每条路径的校验结果 (见 verify)
+        """
+        verify = self.verify
+        return [verify(encoded_path) for encoded_path in encoded_paths]
+
+
+def _verifier(
+    maze: Union[List[List[str]], CompiledMaze],
+    code: Optional[Union[Code, Tuple[str, str, str, str]]],
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]],
+) -> PathVerifier:
+    # 延迟导入，避免与 core 模块循环依赖
+    from .core import MazeSolver
+
+    solver = MazeSolver()
+    if isinstance(symbols, Symbols):
+        solver.set_symbols(symbols)
+    elif symbols is not None:
+        solver.set_symbols(*symbols)
+    if code is not None:
+        solver.set_code(*code)
+    return PathVerifier(solver.compile(maze), solver.codes)
+
+
+def verify_path(
+    maze: Union[List[List[str]], CompiledMaze],
+    encoded_path: str,
+    code: Optional[Union[Code, Tuple[str, str, str, str]]] = None,
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]] = None,
+) -> Dict:
+    """
+    校验一条编码路径
+
+    每次调用都会编译迷宫并计算距离场；反复校验同一个迷宫时请使用
+    verify_many 或直接复用 PathVerifier。
+
+    参数:
+    maze (Union[List[List[str]], CompiledMaze]): 二维迷宫数组或编译后的迷宫
+    encoded_path (str): 编码路径
+    code (Optional[Union[Code, Tuple[str, str, str, str]]]): 方向编码，默认 U/D/L/R
+    symbols (Optional[Union[Symbols, Tuple[str, str, str, str]]]): 迷宫符号，
+        默认 ("0", "1", "*", "#")；maze 已编译时忽略
+
+    返回:
+    Dict: 校验结果 (见 PathVerifier.verify)
+
+    异常:
+    ValueError: 如果迷宫无效或缺少起点/终点
+    """
+    return _verifier(maze, code, symbols).verify(encoded_path)
+
+
+def verify_many(
+    maze: Union[List[List[str]], CompiledMaze],
+    encoded_paths: Iterable[str],
+    code: Optional[Union[Code, Tuple[str, str, str, str]]] = None,
+    symbols: Optional[Union[Symbols, Tuple[str, str, str, str]]] = None,
+) -> List[Dict]:
+    """
+    在同一个迷宫上批量校验编码路径，迷宫只编译一次
+
+    参数:
+    maze (Union[List[List[str]], CompiledMaze]): 二维迷宫数组或编译后的迷宫
+    encoded_paths (Iterable[str]): 编码路径序列
+    code (Optional[Union[Code, Tuple[str, str, str, str]]]): 方向编码，默认 U/D/L/R
+    symbols (Optional[Union[Symbols, Tuple[str, str, str, str]]]): 迷宫符号
+
+    返回:
+    List[Dict]: 每条路径的校验结果 (见 PathVerifier.verify)
+
+    异常:
+    ValueError: 如果迷宫无效或缺少起点/终点
+    """
+    return _verifier(maze, code, symbols).verify_many(encoded_paths)
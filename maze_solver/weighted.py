@@ -0,0 +1,221 @@
+"""
+带权搜索引擎模块
+
+地形代价表示进入格子的代价 (见 Symbols 的 costs)。
+"dijkstra" 使用二叉堆，支持任意非负整数代价；
+"zero_one" 使用双端队列实现 0-1 BFS，只支持代价为 0 或 1 的格子。
+两个引擎都复用广度优先搜索的方向标记数组回溯路径。
+"""
+
+import heapq
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from .budget import SearchBudget
+from .grid import START_MARK, CompiledMaze, trace_back
+from .instrument import ExpandHook
+
+# 未到达格子的距离
+_UNREACHED = 0xFFFFFFFF
+
+# 堆中每个 (距离, 编号) 元组的估计内存
+_HEAP_ITEM_BYTES = 120
+
+
+def _cost_array(compiled: CompiledMaze) -> Sequence[int]:
+    """
+    返回逐格代价数组，未带代价的迷宫视为所有格子代价为 1
+    """
+    if compiled.costs is not None:
+        return compiled.costs
+    return array("I", [1]) * compiled.size
+
+
+def dijkstra_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    Dijkstra 搜索引擎
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、
+        peak_frontier (最大堆大小) 和 peak_memory_estimate (字节)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算，每扩展一批格子检查一次
+
+    返回:
+    Optional[List[int]]: 代价最小的格子编号路径，无法到达时返回None
+
+    异常:
+    BudgetExceeded: 如果超出搜索预算
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    costs = _cost_array(compiled)
+    start, end = compiled.start, compiled.end
+    last_col = cols - 1
+
+    dist = array("I", [_UNREACHED]) * size
+    dist[start] = 0
+    came = bytearray(size)
+    came[start] = START_MARK
+    heap = [(0, start)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    discovered = 1
+    expanded = 0
+    peak = 1
+    found = False
+    # 下一次检查预算时的扩展数，未设置预算时永远不会到达
+    check_at = 0 if budget is not None else size + 1
+
+    while heap:
+        if len(heap) > peak:
+            peak = len(heap)
+        d, current = heappop(heap)
+        if d != dist[current]:
+            continue  # 过期的堆项
+        if current == end:
+            found = True
+            break
+        if expanded >= check_at:
+            check_at = expanded + budget.allowance(expanded, discovered)
+        if on_expand is not None:
+            on_expand(current, d)
+        expanded += 1
+
+        col = current % cols
+        for neighbor, mark, ok in (
+            (current - cols, 1, current >= cols),
+            (current + cols, 2, current + cols < size),
+            (current - 1, 3, col != 0),
+            (current + 1, 4, col != last_col),
+        ):
+            if ok and passable[neighbor]:
+                candidate = d + costs[neighbor]
+                known = dist[neighbor]
+                if candidate < known:
+                    if known == _UNREACHED:
+                        discovered += 1
+                    dist[neighbor] = candidate
+                    came[neighbor] = mark
+                    heappush(heap, (candidate, neighbor))
+
+    stats.update(
+        {
+            "visited_cells": discovered,
+            "nodes_expanded": expanded,
+            "peak_frontier": peak,
+            # 可通行数组 + 方向标记 + 距离数组 + 代价数组 + 堆
+            "peak_memory_estimate": 2 * size + 8 * size + peak * _HEAP_ITEM_BYTES,
+        }
+    )
+    if not found:
+        return None
+    return trace_back(came, end, cols)
+
+
+def zero_one_search(
+    compiled: CompiledMaze,
+    stats: Dict,
+    on_expand: Optional[ExpandHook] = None,
+    budget: Optional[SearchBudget] = None,
+    **options,
+) -> Optional[List[int]]:
+    """
+    0-1 BFS 搜索引擎
+
+    代价为 0 的邻居放到队首，代价为 1 的放到队尾，
+    每个格子最多扩展一次，总耗时与格子数成线性关系。
+
+    参数:
+    compiled (CompiledMaze): 编译后的迷宫，格子代价只能为 0 或 1
+    stats (Dict): 统计信息字典，写入 visited_cells、nodes_expanded、
+        peak_frontier (最大队列长度) 和 peak_memory_estimate (字节)
+    on_expand (Optional[ExpandHook]): 每个格子被扩展前的回调 (格子编号, 累计代价)
+    budget (Optional[SearchBudget]): 搜索预算，每扩展一批格子检查一次
+
+    返回:
+    Optional[List[int]]: 代价最小的格子编号路径，无法到达时返回None
+
+    异常:
+    ValueError: 如果存在代价不是 0 或 1 的可通行格子
+    BudgetExceeded: 如果超出搜索预算
+    """
+    cols, size = compiled.cols, compiled.size
+    passable = compiled.passable
+    costs = _cost_array(compiled)
+    if compiled.costs is not None and max(costs) > 1:
+        raise ValueError("zero_one 引擎只支持代价为 0 或 1 的地形，请使用 dijkstra")
+    start, end = compiled.start, compiled.end
+    last_col = cols - 1
+
+    dist = array("I", [_UNREACHED]) * size
+    dist[start] = 0
+    came = bytearray(size)
+    came[start] = START_MARK
+    done = bytearray(size)
+    queue = deque([start])
+    popleft, appendleft, append = queue.popleft, queue.appendleft, queue.append
+    discovered = 1
+    expanded = 0
+    peak = 1
+    found = False
+    # 下一次检查预算时的扩展数，未设置预算时永远不会到达
+    check_at = 0 if budget is not None else size + 1
+
+    while queue:
+        if len(queue) > peak:
+            peak = len(queue)
+        current = popleft()
+        if done[current]:
+            continue
+        done[current] = 1
+        if current == end:
+            found = True
+            break
+        d = dist[current]
+        if expanded >= check_at:
+            check_at = expanded + budget.allowance(expanded, discovered)
+        if on_expand is not None:
+            on_expand(current, d)
+        expanded += 1
+
+        col = current % cols
+        for neighbor, mark, ok in (
+            (current - cols, 1, current >= cols),
+            (current + cols, 2, current + cols < size),
+            (current - 1, 3, col != 0),
+            (current + 1, 4, col != last_col),
+        ):
+            if ok and passable[neighbor]:
+                cost = costs[neighbor]
+                candidate = d + cost
+                known = dist[neighbor]
+                if candidate < known:
+                    if known == _UNREACHED:
+                        discovered += 1
+                    dist[neighbor] = candidate
+                    came[neighbor] = mark
+                    if cost:
+                        append(neighbor)
+                    else:
+                        appendleft(neighbor)
+
+    stats.update(
+        {
+            "visited_cells": discovered,
+            "nodes_expanded": expanded,
+            "peak_frontier": peak,
+            # 可通行、方向标记、完成标记 + 距离数组 + 代价数组 + 队列
+            "peak_memory_estimate": 3 * size + 8 * size + peak * 8,
+        }
+    )
+    if not found:
+        return None
+    return trace_back(came, end, cols)
@@ -111,6 +111,9 @@ setup(
     entry_points={
         "console_scripts": [
             "maze-solver-demo=maze_solver:demo",
+            "maze-solver-bench=maze_solver.bench:main",
+            "maze-solver-tune=maze_solver.tune:main",
+            "maze-solver=maze_solver.cli:main",
         ],
     },
     # Metadata
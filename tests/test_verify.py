@@ -0,0 +1,25 @@
+from maze_solver import Code, MazeSolver, verify_path
+
+
+def test_prefix_related_codes_follow_the_maze():
+    maze = [list("*00"), list("110"), list("#00")]
+    solver = MazeSolver()
+    solver.set_code("w", "ww", "www", "s")
+    encoded_path = solver.bfs_solve(maze)["encoded_path"]
+
+    report = solver.verifier(maze).verify(encoded_path)
+
+    assert report["valid"]
+    assert report["shortest"]
+    assert report["steps"] == 6
+
+
+def test_prefix_related_codes_report_first_failure():
+    maze = [list("*00"), list("110"), list("#00")]
+    code = Code("w", "ww", "www", "s")
+
+    report = verify_path(maze, "sss", code=code)
+
+    assert not report["valid"]
+    assert report["failed_step"] == 2
+    assert "移出迷宫边界" in report["error"]